@@ -174,9 +174,47 @@
  * different Arduino digital output pin from SSR3 (D9 instead of
  * D7). Note that the "SSR" constant and variable names have not been
  * changed to reflect that they now actually mean "SSR or FET".
- * 
+ *
+ * Binary transfer support:
+ *
+ * By default, the results are sent to the host as text, one line per
+ * point ("<n> CH0:<val> CH1:<val>"). If the host sends the config
+ * message "Config: BINARY_XFER 1", the ADC pairs are instead sent as a
+ * single "Binary ADC pairs: " line (and a "Binary unfiltered ADC pairs:
+ * " line, if unfiltered points were captured).  The rest of the line is
+ * a base64-encoded block:
+ *
+ *     bytes 0-1:  number of pairs (N), little-endian
+ *     byte 2:     block format (1)
+ *     3 bytes per pair (N pairs): 12-bit CH0 and 12-bit CH1 values
+ *                 packed as CH0[7:0], CH1[3:0]:CH0[11:8], CH1[11:4]
+ *     bytes 0-1:  CRC-16/CCITT (initial value 0xFFFF) of the preceding
+ *                 bytes, little-endian
+ *     byte 2:     0 (padding)
+ *
+ * Every part of the block is a multiple of three bytes, so each one is
+ * encoded to exactly four base64 characters and no buffering is
+ * required. The base64 encoding keeps the block on a single line so
+ * the host can read it with the same line-oriented code that it uses
+ * for the other messages. The block is about 1/5 the size of the text
+ * output.
+ *
+ * Baud rate change support:
+ *
+ * The sketch always starts at SERIAL_BAUD. The host may then propose a
+ * higher rate with the config message "Config: BAUD <rate>". The
+ * sketch replies "Changing baud rate" at the current rate and switches
+ * to the new rate. The host must then send "Config: ECHO <rate>" at
+ * the new rate. If that message is received intact, the new rate is
+ * kept and the reply is "Config processed". Otherwise (no message or a
+ * garbled one), the sketch goes back to the previous rate and the reply
+ * is "Config not processed". The rate is not saved, so the sketch is
+ * back to SERIAL_BAUD after a reset. The ECHO config message may also
+ * be sent at any other time to check the link; it has no effect other
+ * than the "Config processed" reply.
+ *
  */
-#define VERSION "1.4.6"         // Version of this Arduino sketch
+#define VERSION "1.5.1"         // Version of this Arduino sketch
 
 // Uncomment one or more of the following to enable the associated
 // feature. Note, however, that enabling these features uses more of the
@@ -277,6 +315,9 @@
 #define SSR_CAL_RD_USECS 100000 // Microseconds to read/average current
 #define CMD_BDGP_READ_ITER 1000 // Bandgap iterations (on READ_BANDGAP command)
 #define GO_BDGP_READ_ITER 1000  // Bandgap iterations (on every Go command)
+#define BINARY_XFER_FORMAT 1    // Format of binary transfer block
+#define CRC16_INIT 0xFFFF       // CRC-16/CCITT initial value
+#define CRC16_POLY 0x1021       // CRC-16/CCITT polynomial
 
 // Compile-time assertion macros (from Stack Overflow)
 #define COMPILER_ASSERT(predicate) _impl_CASSERT_LINE(predicate,__LINE__)
@@ -302,6 +343,9 @@ int isc_stable_adc = ISC_STABLE_ADC;
 int max_discards = MAX_DISCARDS;
 int aspect_height = ASPECT_HEIGHT;
 int aspect_width = ASPECT_WIDTH;
+bool binary_xfer = false;
+long serial_baud = SERIAL_BAUD;
+uint16_t binary_xfer_crc;
 const static char ready_str[] PROGMEM = "Ready";
 const static char config_str[] PROGMEM = "Config";
 const static char go_str[] PROGMEM = "Go";
@@ -320,6 +364,12 @@ const static char second_relay_state_str[] PROGMEM = "SECOND_RELAY_STATE";
 const static char do_ssr_curr_cal_str[] PROGMEM = "DO_SSR_CURR_CAL";
 const static char read_bandgap_str[] PROGMEM = "READ_BANDGAP";
 const static char read_adc_str[] PROGMEM = "READ_ADC";
+const static char binary_xfer_str[] PROGMEM = "BINARY_XFER";
+const static char baud_str[] PROGMEM = "BAUD";
+const static char echo_str[] PROGMEM = "ECHO";
+const static char echo_msg_prefix_str[] PROGMEM = "Config: ECHO ";
+const static char base64_chars[] PROGMEM =
+  "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/";
 
 #ifdef DS18B20_SUPPORTED
 // Global setup for DS18B20 temperature sensor
@@ -358,7 +408,7 @@ void setup()
   digitalWrite(SSR4_PIN, SSR4_ACTIVE);
   pinMode(SSR6_PIN, OUTPUT);
   digitalWrite(SSR6_PIN, SSR6_ACTIVE);
-  Serial.begin(SERIAL_BAUD);
+  Serial.begin(serial_baud);
   SPI.begin();
   SPI.setClockDivider(clk_div);
   set_up_bandgap();
@@ -948,32 +998,55 @@ void loop()
     Serial.print(F(","));
     Serial.println(isc_stable_adc_i_val);
   }
-  // Isc point
-  Serial.print(F("Isc CH0:0"));
-  Serial.print(F(" CH1:"));
-  Serial.println(isc_adc);
-  // Middle points
-  for (ii = 0; ii < pt_num; ii++) {
-    Serial.print(ii);
-    Serial.print(F(" CH0:"));
-    Serial.print(adc_v_vals[ii]);
+  if (binary_xfer) {
+    // Isc point, middle points and Voc point in one binary block
+    Serial.print(F("Binary ADC pairs: "));
+    send_binary_xfer_header(pt_num + 2);
+    send_binary_xfer_pair(0, isc_adc);
+    for (ii = 0; ii < pt_num; ii++) {
+      send_binary_xfer_pair(adc_v_vals[ii], adc_i_vals[ii]);
+    }
+    send_binary_xfer_pair(voc_adc, adc_noise_floor);
+    send_binary_xfer_trailer();
+#ifdef CAPTURE_UNFILTERED
+    if (unfiltered_index) {
+      Serial.print(F("Binary unfiltered ADC pairs: "));
+      send_binary_xfer_header(unfiltered_index);
+      for (ii = 0; ii < unfiltered_index; ii++) {
+        send_binary_xfer_pair(unfiltered_adc_v_vals[ii],
+                              unfiltered_adc_i_vals[ii]);
+      }
+      send_binary_xfer_trailer();
+    }
+#endif
+  } else {
+    // Isc point
+    Serial.print(F("Isc CH0:0"));
     Serial.print(F(" CH1:"));
-    Serial.println(adc_i_vals[ii]);
-  }
-  // Voc point
-  Serial.print(F("Voc CH0:"));
-  Serial.print(voc_adc);
-  Serial.print(F(" CH1:"));
-  Serial.println(adc_noise_floor);
+    Serial.println(isc_adc);
+    // Middle points
+    for (ii = 0; ii < pt_num; ii++) {
+      Serial.print(ii);
+      Serial.print(F(" CH0:"));
+      Serial.print(adc_v_vals[ii]);
+      Serial.print(F(" CH1:"));
+      Serial.println(adc_i_vals[ii]);
+    }
+    // Voc point
+    Serial.print(F("Voc CH0:"));
+    Serial.print(voc_adc);
+    Serial.print(F(" CH1:"));
+    Serial.println(adc_noise_floor);
 #ifdef CAPTURE_UNFILTERED
-  for (ii = 0; ii < unfiltered_index; ii++) {
-    Serial.print(ii);
-    Serial.print(F(" Unfiltered CH0:"));
-    Serial.print(unfiltered_adc_v_vals[ii]);
-    Serial.print(F(" Unfiltered CH1:"));
-    Serial.println(unfiltered_adc_i_vals[ii]);
-  }
+    for (ii = 0; ii < unfiltered_index; ii++) {
+      Serial.print(ii);
+      Serial.print(F(" Unfiltered CH0:"));
+      Serial.print(unfiltered_adc_v_vals[ii]);
+      Serial.print(F(" Unfiltered CH1:"));
+      Serial.println(unfiltered_adc_i_vals[ii]);
+    }
 #endif
+  }
   Serial.print(F("Isc poll loops: "));
   Serial.println(isc_poll_loops);
   Serial.print(F("Number of measurements: "));
@@ -1175,6 +1248,29 @@ void process_config_msg(char * msg) {
     } else {
       wrong_arg_cnt = true;
     }
+  } else if (strcmp_P(config_type, binary_xfer_str) == 0) {
+    exp_args = 1;
+    if (num_args == exp_args) {
+      binary_xfer = (bool)atoi(config_val);
+    } else {
+      wrong_arg_cnt = true;
+    }
+  } else if (strcmp_P(config_type, baud_str) == 0) {
+    exp_args = 1;
+    if (num_args == exp_args) {
+      // The message buffer is reused for the echo message
+      if (!change_baud(atol(config_val), msg)) {
+        Serial.println(F("Config not processed"));
+        return;
+      }
+    } else {
+      wrong_arg_cnt = true;
+    }
+  } else if (strcmp_P(config_type, echo_str) == 0) {
+    exp_args = 1;
+    if (num_args != exp_args) {
+      wrong_arg_cnt = true;
+    }
   } else if (strcmp_P(config_type, read_adc_str) == 0) {
     exp_args = 1;
     if (num_args == exp_args) {
@@ -1211,6 +1307,76 @@ void process_config_msg(char * msg) {
   return;
 }
 
+bool change_baud(long new_baud, char * msg) {
+  const char CARRIAGE_RETURN = 0xd;
+  int prefix_len = strlen_P(echo_msg_prefix_str);
+  char *endptr = NULL;
+  // Acknowledge at the current rate, then switch to the new rate
+  Serial.println(F("Changing baud rate"));
+  Serial.flush();
+  Serial.end();
+  Serial.begin(new_baud);
+  // Keep the new rate only if the host's echo message ("Config: ECHO
+  // <new_baud>") is received intact at the new rate. Otherwise go back
+  // to the old rate. The message may end with a carriage return
+  // (Windows phenomenon).
+  if (get_host_msg(msg) &&
+      strncmp_P(msg, echo_msg_prefix_str, prefix_len) == 0 &&
+      isdigit(msg[prefix_len]) &&
+      strtol(msg + prefix_len, &endptr, 10) == new_baud &&
+      (*endptr == '\0' || (*endptr == CARRIAGE_RETURN &&
+                            *(endptr + 1) == '\0'))) {
+    serial_baud = new_baud;
+    return true;
+  }
+  Serial.end();
+  Serial.begin(serial_baud);
+  Serial.println(F("ERROR: Baud rate change failed"));
+  return false;
+}
+
+void send_binary_xfer_bytes(byte b0, byte b1, byte b2, bool update_crc) {
+  // Send three bytes as four base64 characters, optionally adding them
+  // to the running CRC first
+  byte bytes[3] = {b0, b1, b2};
+  int ii, jj;
+  if (update_crc) {
+    for (ii = 0; ii < 3; ii++) {
+      binary_xfer_crc ^= (uint16_t) bytes[ii] << 8;
+      for (jj = 0; jj < 8; jj++) {
+        if (binary_xfer_crc & 0x8000) {
+          binary_xfer_crc = (binary_xfer_crc << 1) ^ CRC16_POLY;
+        } else {
+          binary_xfer_crc <<= 1;
+        }
+      }
+    }
+  }
+  Serial.write(pgm_read_byte(&base64_chars[b0 >> 2]));
+  Serial.write(pgm_read_byte(&base64_chars[((b0 & 0x03) << 4) | (b1 >> 4)]));
+  Serial.write(pgm_read_byte(&base64_chars[((b1 & 0x0f) << 2) | (b2 >> 6)]));
+  Serial.write(pgm_read_byte(&base64_chars[b2 & 0x3f]));
+}
+
+void send_binary_xfer_header(int num_pairs) {
+  binary_xfer_crc = CRC16_INIT;
+  send_binary_xfer_bytes(num_pairs & 0xff, num_pairs >> 8,
+                         BINARY_XFER_FORMAT, true);
+}
+
+void send_binary_xfer_pair(int adc_v_val, int adc_i_val) {
+  // Pack the two 12-bit values into three bytes
+  send_binary_xfer_bytes(adc_v_val & 0xff,
+                         ((adc_v_val >> 8) & 0x0f) | ((adc_i_val & 0x0f) << 4),
+                         (adc_i_val >> 4) & 0xff, true);
+}
+
+void send_binary_xfer_trailer() {
+  send_binary_xfer_bytes(binary_xfer_crc & 0xff, binary_xfer_crc >> 8, 0,
+                         false);
+  Serial.println(F(""));
+}
+
 void dump_eeprom() {
   int eeprom_addr, eeprom_valid_count;
   float eeprom_value;
@@ -209,6 +209,7 @@ if not platform.machine().startswith("armv6"):
     import matplotlib.font_manager
     from matplotlib import __version__ as matplotlib_version
     from matplotlib import use
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
     use("pdf")
 
 #################
@@ -395,6 +396,7 @@ DEFAULT_MARKER_POINTSIZE = 6.0
 DEFAULT_LINEWIDTH = 2.5
 POWER_LINEWIDTH_MULT = 1.25
 DEFAULT_FONT = "Arial Unicode MS"
+PYPLOT_FIGURE_CACHE_MAX = 4  # Persistent figures (figure reuse mode)
 
 # ADC
 ADS1115 = 0x01  # 16-bit ADC
@@ -528,20 +530,61 @@ def write_plt_data_points_to_file(filename, data_points,
             prev_vals = curr_vals
 
 
+def get_plt_data_point_lists(data_points):
+    """Global function to return lists of the volts, amps and watts of the
+       plotter data points. The values are the same as those read back
+       by read_measured_and_interp_points() from a file written by
+       write_plt_data_points_to_file(), i.e. they are rounded to six
+       decimal places and consecutive duplicates are skipped. The data
+       points may be a list of (I, V, R, P) tuples or an interpolated
+       curve array with (I, V, R, P) rows.
+    """
+    if isinstance(data_points, numpy.ndarray):
+        vals = data_points[:, [VOLTS_INDEX, AMPS_INDEX, WATTS_INDEX]]
+        # numpy.round() can differ from round() for values that are
+        # (nearly) halfway between two roundings, so round() is used
+        # for those
+        scaled_vals = vals * 1e6
+        near_half = abs(scaled_vals - numpy.floor(scaled_vals) - 0.5) < 1e-4
+        near_half_vals = [round(val, 6) for val in vals[near_half].tolist()]
+        vals = numpy.round(vals, 6)
+        vals[near_half] = near_half_vals
+        new_vals = numpy.ones(len(vals), dtype=bool)
+        new_vals[1:] = (vals[1:] != vals[:-1]).any(axis=1)
+        (volts, amps, watts) = vals[new_vals].T.tolist()
+        return (volts, amps, watts)
+
+    volts = []
+    amps = []
+    watts = []
+    prev_vals = None
+    for data_point in data_points:
+        curr_vals = (round(data_point[VOLTS_INDEX], 6),
+                     round(data_point[AMPS_INDEX], 6),
+                     round(data_point[WATTS_INDEX], 6))
+        if curr_vals != prev_vals:
+            volts.append(curr_vals[0])
+            amps.append(curr_vals[1])
+            watts.append(curr_vals[2])
+        prev_vals = curr_vals
+
+    return (volts, amps, watts)
+
+
 def pyplot_annotate_point(label_str, x, y, xtext, ytext, fontsize,
                           bbox, arrowprops, textcoords="offset points"):
     """Global function to add a label (Isc, Voc, MPP) to the plot
     """
     # pylint: disable=too-many-arguments
-    plt.annotate(label_str,
-                 xy=(x, y),
-                 xytext=(xtext, ytext),
-                 textcoords=textcoords,
-                 fontsize=fontsize,
-                 horizontalalignment="left",
-                 verticalalignment="bottom",
-                 bbox=bbox,
-                 arrowprops=arrowprops)
+    return plt.annotate(label_str,
+                        xy=(x, y),
+                        xytext=(xtext, ytext),
+                        textcoords=textcoords,
+                        fontsize=fontsize,
+                        horizontalalignment="left",
+                        verticalalignment="bottom",
+                        bbox=bbox,
+                        arrowprops=arrowprops)
 
 
 def read_measured_and_interp_points(f):
@@ -697,6 +740,18 @@ class PrintAndLog():
         with open(self.log_file_name, "a", encoding="utf-8") as f:
             f.write(f"\n{date_time_str}: {print_str}")
 
+    def log_lines(self, print_strs):
+        """Print multiple lines to the log file only, with a single write
+           (all lines get the same timestamp)
+        """
+
+        # Print to log file with timestamp
+        date_time_str = DateTimeStr.get_date_time_str()
+        log_str = "".join(f"\n{date_time_str}: {print_str}"
+                          for print_str in print_strs)
+        with open(self.log_file_name, "a", encoding="utf-8") as f:
+            f.write(log_str)
+
     def print_and_log(self, print_str):
         """Print to the screen (if there is one) and also to a log file
         """
@@ -1012,6 +1067,128 @@ class SoundWarning(StoppableThread):  # IVS1
 
 #  Interpolator class
 #
+def get_ratio_array(dividends, divisors):
+    """Global function to divide two arrays element by element. The
+       result is INFINITE_VAL wherever the divisor is zero.
+    """
+    return numpy.divide(dividends, divisors,
+                        out=numpy.full(len(dividends), float(INFINITE_VAL)),
+                        where=divisors != 0)
+
+
+def get_polys_roots(polys):
+    """Global function to find the roots of a number of polynomials at
+       once. The polys parameter is an array of numpy.polyval()
+       coefficients with one row per polynomial. The roots are the
+       eigenvalues of the companion matrices, like in numpy.roots(), but
+       the eigenvalues of all of the matrices are calculated with a
+       single call. The returned complex array has one row per
+       polynomial; rows with fewer roots (or none) are padded with NaN.
+    """
+    (num_polys, num_coeffs) = polys.shape
+    degree = num_coeffs - 1
+    roots = numpy.full((num_polys, degree), numpy.nan, dtype=complex)
+    finite = numpy.isfinite(polys).all(axis=1)
+    full_degree = finite & (polys[:, 0] != 0)
+    if degree == 1:
+        roots[full_degree, 0] = (-polys[full_degree, 1] /
+                                 polys[full_degree, 0])
+    elif degree and full_degree.any():
+        companions = numpy.zeros((numpy.count_nonzero(full_degree),
+                                  degree, degree))
+        companions[:, 0, :] = (-polys[full_degree, 1:] /
+                               polys[full_degree, :1])
+        companions[:, 1:, :-1] = numpy.eye(degree - 1)
+        roots[full_degree] = numpy.linalg.eigvals(companions)
+    # Let numpy.roots() strip the leading zeros of the others
+    for poly_num in numpy.flatnonzero(finite & ~full_degree):
+        poly_roots = numpy.roots(polys[poly_num])
+        roots[poly_num, :len(poly_roots)] = poly_roots
+
+    return roots
+
+
+def get_polys_mpp(volts_polys, amps_polys, mpp):
+    """Global function to find the maximum power point on a number of
+       curve segments where V and I are polynomials in a parameter that
+       goes from 0 to 1. The volts_polys and amps_polys parameters are
+       arrays of numpy.polyval() coefficients with one row per
+       segment. The ends of the segments are not checked. If a point on
+       one of the segments has more power than the provided (I, V, R, P)
+       mpp tuple, its tuple is returned. Otherwise, the provided tuple is
+       returned.
+    """
+    # pylint: disable=too-many-locals
+
+    # Power polynomials (products of the V and I polynomials) and their
+    # derivatives
+    (num_segments, num_coeffs) = volts_polys.shape
+    watts_polys = numpy.zeros((num_segments, 2 * num_coeffs - 1))
+    for ii in range(num_coeffs):
+        watts_polys[:, ii:ii + num_coeffs] += (volts_polys[:, ii:ii + 1] *
+                                               amps_polys)
+    deriv_polys = (watts_polys[:, :-1] *
+                   numpy.arange(2 * num_coeffs - 2, 0, -1))
+
+    # Real roots of the derivatives that are inside the segments
+    roots = get_polys_roots(deriv_polys)
+    valid = ((abs(roots.imag) <= 1e-9) &
+             (roots.real > 0.0) & (roots.real < 1.0))
+    if not valid.any():
+        return mpp
+    u = numpy.where(valid, roots.real, 0.0)
+
+    # Evaluate V, I and P at the roots (Horner's method)
+    volts = numpy.zeros(u.shape)
+    amps = numpy.zeros(u.shape)
+    for ii in range(num_coeffs):
+        volts = volts * u + volts_polys[:, ii:ii + 1]
+        amps = amps * u + amps_polys[:, ii:ii + 1]
+    watts = numpy.where(valid, volts * amps, -numpy.inf)
+    best = numpy.unravel_index(numpy.argmax(watts), watts.shape)
+    if watts[best] > mpp[WATTS_INDEX]:
+        (amps, volts) = (float(amps[best]), float(volts[best]))
+        ohms = volts / amps if amps else INFINITE_VAL
+        mpp = (amps, volts, ohms, volts * amps)
+
+    return mpp
+
+
+def get_lines_mpp(points1, points2, mpp):
+    """Global function to find the maximum power point on a number of
+       straight lines. The points1 and points2 parameters are Nx2 arrays
+       of the [V, I] points at the beginning and end of the lines. The
+       ends of the lines are not checked (see get_polys_mpp()).
+    """
+    if not points1.size:
+        return mpp
+    deltas = points2 - points1
+    return get_polys_mpp(numpy.stack([deltas[:, 0], points1[:, 0]], axis=1),
+                         numpy.stack([deltas[:, 1], points1[:, 1]], axis=1),
+                         mpp)
+
+
+def get_poly_max_watts_bound(polys):
+    """Global function to return an upper bound of the power on each of a
+       number of cubic curve segments. The polys parameter is an array
+       of numpy.polyval() coefficients with shape (number of segments,
+       4, 2), where the last axis is [V, I]. Each segment is contained
+       in the bounding box of its Bezier control points, so its power
+       cannot exceed the highest power of the corners of that box.
+    """
+    # Convert the polynomial coefficients to Bezier control points
+    poly_to_bezier = numpy.array([[0.0, 0.0, 0.0, 1.0],
+                                  [0.0, 0.0, 1/3, 1.0],
+                                  [0.0, 1/3, 2/3, 1.0],
+                                  [1.0, 1.0, 1.0, 1.0]])
+    ctrl_points = poly_to_bezier @ polys
+    (min_v, min_i) = ctrl_points.min(axis=1).T
+    (max_v, max_i) = ctrl_points.max(axis=1).T
+
+    return numpy.max([min_v * min_i, min_v * max_i,
+                      max_v * min_i, max_v * max_i], axis=0)
+
+
 class Interpolator():
     """Class to create an interpolated curve from an given set of data
        points, i.e. (I,V,R,P) tuples. Linear interpolation and
@@ -1032,6 +1209,10 @@ class Interpolator():
             tuples containing the initial set of points and all of the
             spline-interpolated points
 
+          - The linear_interpolated_curve_array and
+            spline_interpolated_curve_array properties return the same
+            curves as NumPy arrays with one (I,V,R,P) row per point
+
           - The linear_interpolated_mpp property returns the (I,V,R,P)
             tuple of the maximum power point on the
             linearly-interpolated curve
@@ -1040,7 +1221,14 @@ class Interpolator():
             tuple of the maximum power point on the spline-interpolated
             curve
 
+          - The linear_analytic_mpp and spline_analytic_mpp properties
+            return the (I,V,R,P) tuple of the exact maximum power point
+            on the linearly-interpolated and spline-interpolated curves
+            respectively, as they are plotted, without generating the
+            whole interpolated curve
+
        """
+    # pylint: disable=too-many-instance-attributes
 
     # Initializer
     def __init__(self, given_points):
@@ -1048,84 +1236,105 @@ class Interpolator():
         # Property variables
         self._linear_interpolated_curve = None
         self._spline_interpolated_curve = None
+        self._linear_interpolated_curve_array = None
+        self._spline_interpolated_curve_array = None
         self._linear_interpolated_mpp = None
         self._spline_interpolated_mpp = None
+        self._linear_analytic_mpp = None
+        self._spline_analytic_mpp = None
 
     # Properties
     @property
     def linear_interpolated_curve(self):
         """List of tuples that contains all of the given points plus
            points that are interpolated between the given points using
-           linear interpolation. Since the only purpose of linear
-           interpolation is to more accurately locate the MPP, the
-           interpolation is only performed for the segments before and
-           after the measured point with the highest power.
+           linear interpolation (see linear_interpolated_curve_array)
         """
         if self._linear_interpolated_curve is None:
-            self._linear_interpolated_curve = []
+            self._linear_interpolated_curve = [
+                tuple(point)
+                for point in self.linear_interpolated_curve_array.tolist()]
 
-            # Identify which of the given points has the highest power
-            mwp_num = IV_Swinger.get_max_watt_point_number(self.given_points)
-
-            # Loop through all but the last point
-            for point_num, given_point in enumerate(self.given_points[:-1]):
-                next_point = self.given_points[point_num + 1]
-                # Set the number of interpolated points to zero unless
-                # one end of the segment is the given point with the
-                # highest power in which case it is set to 100
-                if mwp_num not in (point_num, point_num + 1):
-                    num_interp_points = 0
-                else:
-                    num_interp_points = 100
-                # Get a list of all the interpolated I values
-                new_i_vals = numpy.linspace(given_point[AMPS_INDEX],
-                                            next_point[AMPS_INDEX],
-                                            num_interp_points + 1,
-                                            endpoint=False).tolist()
-                # Get a list of all the interpolated V values
-                new_v_vals = numpy.linspace(given_point[VOLTS_INDEX],
-                                            next_point[VOLTS_INDEX],
-                                            num_interp_points + 1,
-                                            endpoint=False).tolist()
-                # Create new tuples from these I and V values
-                new_points = []
-                for new_point_num, new_i_val in enumerate(new_i_vals):
-                    new_v_val = new_v_vals[new_point_num]
-                    if new_v_val:
-                        new_r_val = new_i_val / new_v_val
-                    else:
-                        new_r_val = INFINITE_VAL
-                    new_p_val = new_i_val * new_v_val
-                    new_point = (new_i_val, new_v_val, new_r_val, new_p_val)
-                    new_points.append(new_point)
+        return self._linear_interpolated_curve
 
-                # Add these new (and one old) points to the interpolated
-                # curve list
-                self._linear_interpolated_curve.extend(new_points)
+    @property
+    def linear_interpolated_curve_array(self):
+        """NumPy array with an (I, V, R, P) row for each of the given
+           points plus points that are interpolated between the given
+           points using linear interpolation. Since the only purpose of
+           linear interpolation is to more accurately locate the MPP,
+           the interpolation is only performed for the segments before
+           and after the measured point with the highest power.
+        """
+        if self._linear_interpolated_curve_array is None:
+            iv_points = numpy.array([[point[AMPS_INDEX], point[VOLTS_INDEX]]
+                                     for point in self.given_points],
+                                    dtype=float).reshape(-1, 2)
 
-            # Tack on the last point
-            self._linear_interpolated_curve.append(self.given_points[-1])
+            # Identify which of the given points has the highest power
+            mwp_num = IV_Swinger.get_max_watt_point_number(self.given_points)
 
-        return self._linear_interpolated_curve
+            # Interpolate 100 points in each segment that has the given
+            # point with the highest power at one end. The other
+            # segments only contribute their first point.
+            iv_pieces = []
+            first_point_num = 0
+            for point_num in (mwp_num - 1, mwp_num):
+                if 0 <= point_num < len(iv_points) - 1:
+                    iv_pieces.append(iv_points[first_point_num:point_num])
+                    iv_pieces.append(numpy.linspace(iv_points[point_num],
+                                                    iv_points[point_num + 1],
+                                                    101, endpoint=False))
+                    first_point_num = point_num + 1
+            iv_pieces.append(iv_points[first_point_num:-1])
+            iv_curve = numpy.concatenate(iv_pieces)
+            amps = iv_curve[:, 0]
+            volts = iv_curve[:, 1]
+
+            # Compute the R and P values (note that R is I/V here), and
+            # tack on the last point
+            curve = numpy.empty((len(iv_curve) + 1, 4))
+            curve[:-1, AMPS_INDEX] = amps
+            curve[:-1, VOLTS_INDEX] = volts
+            curve[:-1, OHMS_INDEX] = get_ratio_array(amps, volts)
+            curve[:-1, WATTS_INDEX] = amps * volts
+            curve[-1] = self.given_points[-1]
+            self._linear_interpolated_curve_array = curve
+
+        return self._linear_interpolated_curve_array
 
     @property
     def spline_interpolated_curve(self):
         """List of tuples that contain all of the given points plus all
            of the points that are interpolated between each of the given
-           points using centripetal Catmull-Rom spline interpolation
+           points using centripetal Catmull-Rom spline interpolation (see
+           spline_interpolated_curve_array)
         """
         if self._spline_interpolated_curve is None:
-            self._spline_interpolated_curve = []
+            self._spline_interpolated_curve = [
+                tuple(point)
+                for point in self.spline_interpolated_curve_array.tolist()]
+
+        return self._spline_interpolated_curve
 
+    @property
+    def spline_interpolated_curve_array(self):
+        """NumPy array with an (I, V, R, P) row for each of the given
+           points plus all of the points that are interpolated between
+           each of the given points using centripetal Catmull-Rom spline
+           interpolation
+        """
+        if self._spline_interpolated_curve_array is None:
             # Generate list of [V, I] pairs
             vi_points_list = []
             for point in self.given_points:
                 vi_points_list.append([point[VOLTS_INDEX],
                                        point[AMPS_INDEX]])
 
-            # Call the interpolation method and put the results in a
-            # temporary list
-            temp_points = self.catmull_rom_chain(vi_points_list)
+            # Call the interpolation method
+            vi_curve = self.catmull_rom_chain_array(vi_points_list)
+            volts = vi_curve[:, 0]
+            amps = vi_curve[:, 1]
 
             # At this point the curve is only [V, I] pairs and is
             # missing the first and last points. So we add the missing
@@ -1138,20 +1347,16 @@ class Interpolator():
             # nearly all cases to curved segments. It does assume that
             # the MPP will never be in one of these segments, but that
             # is a very good assumption.
-            self._spline_interpolated_curve.append(self.given_points[0])
-            for temp_point in temp_points:
-                volts = temp_point[0]
-                amps = temp_point[1]
-                if amps:
-                    ohms = volts / amps
-                else:
-                    ohms = INFINITE_VAL
-                watts = volts * amps
-                new_point = (amps, volts, ohms, watts)
-                self._spline_interpolated_curve.append(new_point)
-            self._spline_interpolated_curve.append(self.given_points[-1])
+            curve = numpy.empty((len(vi_curve) + 2, 4))
+            curve[0] = self.given_points[0]
+            curve[1:-1, AMPS_INDEX] = amps
+            curve[1:-1, VOLTS_INDEX] = volts
+            curve[1:-1, OHMS_INDEX] = get_ratio_array(volts, amps)
+            curve[1:-1, WATTS_INDEX] = volts * amps
+            curve[-1] = self.given_points[-1]
+            self._spline_interpolated_curve_array = curve
 
-        return self._spline_interpolated_curve
+        return self._spline_interpolated_curve_array
 
     @property
     def linear_interpolated_mpp(self):
@@ -1159,14 +1364,8 @@ class Interpolator():
            linearly-interpolated curve
         """
         if self._linear_interpolated_mpp is None:
-            mpp_power = 0
-            points = self.linear_interpolated_curve
-            for point in points:
-                if point[WATTS_INDEX] >= mpp_power:
-                    mpp_power = point[WATTS_INDEX]
-                    mpp = point
-
-            self._linear_interpolated_mpp = mpp
+            self._linear_interpolated_mpp = self.get_curve_array_mpp(
+                self.linear_interpolated_curve_array)
 
         return self._linear_interpolated_mpp
 
@@ -1176,17 +1375,33 @@ class Interpolator():
            spline-interpolated curve
         """
         if self._spline_interpolated_mpp is None:
-            mpp_power = 0
-            points = self.spline_interpolated_curve
-            for point in points:
-                if point[WATTS_INDEX] >= mpp_power:
-                    mpp_power = point[WATTS_INDEX]
-                    mpp = point
-
-            self._spline_interpolated_mpp = mpp
+            self._spline_interpolated_mpp = self.get_curve_array_mpp(
+                self.spline_interpolated_curve_array)
 
         return self._spline_interpolated_mpp
 
+    @property
+    def linear_analytic_mpp(self):
+        """(I, V, R, P) tuple of the maximum power point on the
+           linearly-interpolated curve, calculated analytically (see
+           get_analytic_mpp())
+        """
+        if self._linear_analytic_mpp is None:
+            self._linear_analytic_mpp = self.get_analytic_mpp(spline=False)
+
+        return self._linear_analytic_mpp
+
+    @property
+    def spline_analytic_mpp(self):
+        """(I, V, R, P) tuple of the maximum power point on the
+           spline-interpolated curve, calculated analytically (see
+           get_analytic_mpp())
+        """
+        if self._spline_analytic_mpp is None:
+            self._spline_analytic_mpp = self.get_analytic_mpp(spline=True)
+
+        return self._spline_analytic_mpp
+
     # Methods
     def catmull_rom_spline(self, four_points, num_interp_points,
                            rerun_with_low_alpha=False):
@@ -1325,21 +1540,296 @@ class Interpolator():
            of [V, I] lists. Note that the curve begins with the second
            point in the input list and ends with the second-to-last point.
         """
-        interpolated_curve = []
-        for first_point_num in range(len(vi_points_list) - 3):
-            four_points = [vi_points_list[first_point_num],
-                           vi_points_list[first_point_num + 1],
-                           vi_points_list[first_point_num + 2],
-                           vi_points_list[first_point_num + 3]]
-            point1 = vi_points_list[first_point_num + 1]
-            point2 = vi_points_list[first_point_num + 2]
-            num_interp_points = self.get_spline_num_interp_points(point1,
-                                                                  point2)
-            points = self.catmull_rom_spline(four_points,
-                                             num_interp_points)
-            interpolated_curve.extend(points)
-
-        return interpolated_curve
+        return self.catmull_rom_chain_array(vi_points_list).tolist()
+
+    def catmull_rom_chain_array(self, vi_points_list):
+        """Method to calculate the same curve as catmull_rom_chain(), but
+           return it as an Nx2 NumPy array of [V, I] points.
+
+           The result is the same as calling catmull_rom_spline() for
+           each group of four consecutive points and concatenating the
+           results, but all of the segments are interpolated at once
+           with NumPy. The per-point arrays are the concatenation of
+           the points of all segments; seg_nums holds the segment
+           number of each point and point_nums holds its index within
+           its segment.
+        """
+        vi_points = numpy.array(vi_points_list, dtype=float).reshape(-1, 2)
+        num_segments = len(vi_points) - 3
+        if num_segments < 1:
+            return numpy.empty((0, 2))
+
+        # Number of interpolated points for each segment (p1 to p2)
+        num_interp_points = self.get_spline_num_interp_points_array(
+            vi_points[1:-2], vi_points[2:-1])
+
+        # Segment number and index within segment of every point
+        seg_nums = numpy.repeat(numpy.arange(num_segments),
+                                num_interp_points)
+        first_point_nums = numpy.cumsum(num_interp_points) - num_interp_points
+        point_nums = numpy.arange(len(seg_nums)) - first_point_nums[seg_nums]
+
+        # Interpolate all segments with the normal alpha value
+        t_values = self.get_catmull_rom_t_values(vi_points, alpha=0.5)
+        curve = self.catmull_rom_chain_points(vi_points, t_values, seg_nums,
+                                              point_nums, num_interp_points)
+
+        # Re-run the segments that violate monotonicity with low alpha
+        # (see catmull_rom_spline())
+        bad_segs = self.get_non_monotonic_segments(vi_points, seg_nums,
+                                                   point_nums, curve)
+        if bad_segs.size:
+            rerun = numpy.isin(seg_nums, bad_segs)
+            t_values = self.get_catmull_rom_t_values(vi_points, alpha=0.1)
+            curve[rerun] = self.catmull_rom_chain_points(vi_points, t_values,
+                                                         seg_nums[rerun],
+                                                         point_nums[rerun],
+                                                         num_interp_points)
+
+        return curve
+
+    @staticmethod
+    def get_catmull_rom_t_values(vi_points, alpha):
+        """Method to calculate t_0 to t_3 (see catmull_rom_spline()) for
+           every segment of a Catmull-Rom chain. A 4xN array is
+           returned.
+        """
+        def t_j(t_i, dists):
+            """Local function to calculate t sub i+1 (aka t_j)"""
+            t_j = dists + t_i
+            # Prevent divide-by-zero
+            t_j[t_j == t_i] += (1.0 / INFINITE_VAL)
+            return t_j
+
+        # The distances are calculated with math.hypot() and the Python
+        # power operator (one per given point) for identical results
+        deltas = numpy.diff(vi_points, axis=0).tolist()
+        dists = numpy.array([math.hypot(delta_v, delta_i) ** alpha
+                             for (delta_v, delta_i) in deltas])
+        t_0 = numpy.zeros(len(vi_points) - 3)
+        t_1 = t_j(t_0, dists[:-2])
+        t_2 = t_j(t_1, dists[1:-1])
+        t_3 = t_j(t_2, dists[2:])
+
+        return numpy.array([t_0, t_1, t_2, t_3])
+
+    @staticmethod
+    def catmull_rom_chain_points(vi_points, t_values, seg_nums, point_nums,
+                                 num_interp_points):
+        """Method to calculate the interpolated points for the specified
+           segments of a Catmull-Rom chain. The calculation is the same
+           as in catmull_rom_spline(), with the t values calculated the
+           same way as numpy.linspace() does, but it is done for any
+           number of points in any number of segments at once. The
+           vi_points, t_values (from get_catmull_rom_t_values()) and
+           num_interp_points arrays are for the whole chain and the
+           seg_nums and point_nums arrays are per interpolated
+           point. An Nx2 array of [V, I] points is returned.
+        """
+        # pylint: disable=too-many-locals
+        (t_0, t_1, t_2, t_3) = t_values
+
+        # Values of t between t_1 and t_2 (inclusive) for every point
+        divs = numpy.maximum(num_interp_points - 1, 1)[seg_nums]
+        t_deltas = (t_2 - t_1)[seg_nums]
+        steps = t_deltas / divs
+        t = numpy.where(steps == 0,
+                        point_nums / divs * t_deltas,
+                        point_nums * steps) + t_1[seg_nums]
+        last = ((point_nums == num_interp_points[seg_nums] - 1) &
+                (point_nums > 0))
+        t[last] = t_2[seg_nums[last]]
+
+        # Reshape so that we can multiply by the points p_0 to p_3
+        # and get a point for each value of t.
+        t = t.reshape(len(t), 1)
+        t_0, t_1, t_2, t_3 = [t_k[seg_nums].reshape(len(t), 1)
+                              for t_k in (t_0, t_1, t_2, t_3)]
+        p_0, p_1, p_2, p_3 = [vi_points[seg_nums + k] for k in range(4)]
+
+        # A equations
+        a_1 = (t_1 - t) / (t_1 - t_0) * p_0 + (t - t_0) / (t_1 - t_0) * p_1
+        a_2 = (t_2 - t) / (t_2 - t_1) * p_1 + (t - t_1) / (t_2 - t_1) * p_2
+        a_3 = (t_3 - t) / (t_3 - t_2) * p_2 + (t - t_2) / (t_3 - t_2) * p_3
+
+        # B equations
+        b_1 = (t_2 - t) / (t_2 - t_0) * a_1 + (t - t_0) / (t_2 - t_0) * a_2
+        b_2 = (t_3 - t) / (t_3 - t_1) * a_2 + (t - t_1) / (t_3 - t_1) * a_3
+
+        # C equation
+        return (t_2 - t) / (t_2 - t_1) * b_1 + (t - t_1) / (t_2 - t_1) * b_2
+
+    @staticmethod
+    def get_non_monotonic_segments(vi_points, seg_nums, point_nums, curve):
+        """Method to find the segments of a Catmull-Rom chain where the
+           voltage or current of the interpolated points heads in a
+           different direction than it does from p1 to p2 (see
+           catmull_rom_spline()). An array of the segment numbers is
+           returned.
+        """
+        # Direction of voltage and current from p1 to p2 of each
+        # segment. Normal case is v_p2_gt_v_p1 and i_p2_lte_i_p1.
+        v_p2_gt_v_p1 = ~(vi_points[2:-1, 0] <= vi_points[1:-2, 0])
+        i_p2_gt_i_p1 = ~(vi_points[2:-1, 1] <= vi_points[1:-2, 1])
+
+        # Compare each point with the previous point in the same segment
+        seg_nums_b = seg_nums[1:]
+        v_a, v_b = curve[:-1, 0], curve[1:, 0]
+        i_a, i_b = curve[:-1, 1], curve[1:, 1]
+        v_diff_dir = numpy.where(v_p2_gt_v_p1[seg_nums_b],
+                                 v_b <= v_a, v_b > v_a)
+        i_diff_dir = numpy.where(i_p2_gt_i_p1[seg_nums_b],
+                                 i_b <= i_a, i_b > i_a)
+        diff_dir = (point_nums[1:] > 0) & (v_diff_dir | i_diff_dir)
+
+        return numpy.unique(seg_nums_b[diff_dir])
+
+    def get_spline_num_interp_points_array(self, points1, points2):
+        """Method to calculate the number of interpolated points for many
+           segments at once. The points1 and points2 parameters are Nx2
+           arrays of the [V, I] points at the beginning and end of the
+           segments. The calculation is the same as in
+           get_spline_num_interp_points().
+        """
+        max_v = self.given_points[-1][VOLTS_INDEX]
+        scaled_v_dist = (points2[:, 0] - points1[:, 0]) / max_v
+        max_i = self.given_points[0][AMPS_INDEX]
+        scaled_i_dist = (points1[:, 1] - points2[:, 1]) / max_i
+        manhattan_dist = scaled_i_dist + scaled_v_dist
+        num_interp_points = (manhattan_dist * 1000).astype(int)
+
+        return numpy.clip(num_interp_points, 1, 100)
+
+    @staticmethod
+    def get_curve_array_mpp(curve):
+        """Method to return the (I, V, R, P) tuple of the point with the
+           highest power in an interpolated curve array. If several
+           points have the highest power, the last one is returned.
+        """
+        watts = curve[:, WATTS_INDEX]
+        point_num = len(watts) - 1 - int(numpy.argmax(watts[::-1]))
+        return tuple(curve[point_num].tolist())
+
+    def get_analytic_mpp(self, spline):
+        """Method to find the maximum power point without generating the
+           whole interpolated curve. The result is the exact MPP on the
+           curve as it is plotted, i.e. with straight lines between the
+           interpolated points.
+
+           For linear interpolation, the V and I values on each segment
+           are linear in the segment's parameter u (0 to 1), so the
+           power is a quadratic and the MPP of a segment is either at
+           one of its ends (a given point) or at the root of the
+           derivative of its power polynomial. Only the two segments
+           adjacent to the given point with the highest power are
+           searched, like in linear_interpolated_curve.
+
+           For spline interpolation, the first and last segments are
+           not searched, since spline_interpolated_curve draws them as
+           straight lines on the assumption that the MPP is never in
+           them. The Catmull-Rom spline segments are only searched if
+           the bounding box of their Bezier control points allows a
+           power higher than the best found so far. For those, the
+           interpolated points are generated, and the lines between
+           them are searched like the linear segments. The (I, V, R, P)
+           tuple of the MPP is returned.
+        """
+        # pylint: disable=too-many-locals
+        vi_points = numpy.array([[point[VOLTS_INDEX], point[AMPS_INDEX]]
+                                 for point in self.given_points])
+        mwp_num = IV_Swinger.get_max_watt_point_number(self.given_points)
+        mpp = self.given_points[mwp_num]
+
+        # Linear segments
+        if not spline:
+            seg_nums = numpy.array([seg_num
+                                    for seg_num in (mwp_num - 1, mwp_num)
+                                    if 0 <= seg_num < len(vi_points) - 1],
+                                   dtype=int)
+            return get_lines_mpp(vi_points[seg_nums], vi_points[seg_nums + 1],
+                                 mpp)
+        if len(vi_points) < 4:
+            return mpp
+
+        # Spline segments. Only the segments whose bound allows a higher
+        # power than the best so far are candidates.
+        max_watts = numpy.maximum(
+            *[get_poly_max_watts_bound(
+                self.get_spline_polys(
+                    vi_points, self.get_catmull_rom_t_values(vi_points,
+                                                             alpha)))
+              for alpha in (0.5, 0.1)])
+        chain_seg_nums = numpy.flatnonzero(max_watts > mpp[WATTS_INDEX])
+        if chain_seg_nums.size:
+            (seg_nums,
+             curve) = self.get_chain_segments_array(vi_points, chain_seg_nums)
+            watts = curve[:, 0] * curve[:, 1]
+            best = int(numpy.argmax(watts))
+            if watts[best] > mpp[WATTS_INDEX]:
+                (volts, amps) = curve[best].tolist()
+                ohms = volts / amps if amps else INFINITE_VAL
+                mpp = (amps, volts, ohms, volts * amps)
+            # Lines between the interpolated points of each segment. A
+            # segment with only one interpolated point (p1) is drawn as
+            # a line from p1 to p2.
+            same_seg = seg_nums[:-1] == seg_nums[1:]
+            single_point_segs = numpy.setdiff1d(chain_seg_nums,
+                                                seg_nums[1:][same_seg])
+            mpp = get_lines_mpp(
+                numpy.concatenate([curve[:-1][same_seg],
+                                   vi_points[single_point_segs + 1]]),
+                numpy.concatenate([curve[1:][same_seg],
+                                   vi_points[single_point_segs + 2]]),
+                mpp)
+
+        return mpp
+
+    def get_spline_polys(self, vi_points, t_values):
+        """Method to return the cubic polynomials (numpy.polyval()
+           coefficients) of V and I on every segment of the Catmull-Rom
+           chain as a function of u, which goes from 0 at p1 to 1 at
+           p2. The coefficients are found from four interpolated points
+           on each segment (u = 0, 1/3, 2/3, 1). The returned array has
+           shape (number of segments, 4, 2), where the last axis is
+           [V, I].
+        """
+        num_segments = len(vi_points) - 3
+        seg_nums = numpy.repeat(numpy.arange(num_segments), 4)
+        point_nums = numpy.tile(numpy.arange(4), num_segments)
+        curve = self.catmull_rom_chain_points(vi_points, t_values, seg_nums,
+                                              point_nums,
+                                              numpy.full(num_segments, 4))
+        inv_vander = numpy.linalg.inv(numpy.vander(numpy.arange(4) / 3.0))
+        return inv_vander @ curve.reshape(num_segments, 4, 2)
+
+    def get_chain_segments_array(self, vi_points, chain_seg_nums):
+        """Method to interpolate the specified segments of the Catmull-Rom
+           chain exactly like catmull_rom_chain_array() does, including
+           the re-run with the low alpha value of the segments that
+           violate monotonicity. The segment number of each point and an
+           Nx2 array of the [V, I] points are returned.
+        """
+        num_interp_points = numpy.zeros(len(vi_points) - 3, dtype=int)
+        num_interp_points[chain_seg_nums] = (
+            self.get_spline_num_interp_points_array(
+                vi_points[chain_seg_nums + 1], vi_points[chain_seg_nums + 2]))
+        seg_nums = numpy.repeat(chain_seg_nums,
+                                num_interp_points[chain_seg_nums])
+        first_point_nums = numpy.cumsum(num_interp_points) - num_interp_points
+        point_nums = numpy.arange(len(seg_nums)) - first_point_nums[seg_nums]
+        t_values = self.get_catmull_rom_t_values(vi_points, alpha=0.5)
+        curve = self.catmull_rom_chain_points(vi_points, t_values, seg_nums,
+                                              point_nums, num_interp_points)
+        bad_segs = self.get_non_monotonic_segments(vi_points, seg_nums,
+                                                   point_nums, curve)
+        if bad_segs.size:
+            rerun = numpy.isin(seg_nums, bad_segs)
+            t_values = self.get_catmull_rom_t_values(vi_points, alpha=0.1)
+            curve[rerun] = self.catmull_rom_chain_points(vi_points, t_values,
+                                                         seg_nums[rerun],
+                                                         point_nums[rerun],
+                                                         num_interp_points)
+        return (seg_nums, curve)
 
     def get_spline_num_interp_points(self, point1, point2):
         """Method to calculate the desired number of interpolated points
@@ -1365,6 +1855,10 @@ class Interpolator():
 
 #  Main IV Swinger class
 #
+# Persistent pyplot figures used in figure reuse mode, keyed by layout
+PYPLOT_FIGURE_CACHE = {}
+
+
 class IV_Swinger():
     """Main IV Swinger class"""
     # pylint: disable=too-many-instance-attributes
@@ -1446,6 +1940,10 @@ class IV_Swinger():
         self._i_sat = None
         self._ax1 = None
         self._ax2 = None
+        self._reuse_figure = False
+        self._render_to_memory = False
+        self._extra_img_outputs = []
+        self._plt_data_sets = {}
         self._gp_font_scale = 1.6
         self._gp_isc_voc_mpp_pointtype = 7
         self._gp_measured_point_color = "red"
@@ -1457,6 +1955,9 @@ class IV_Swinger():
         self._filehandle = None
         self._output_line = None
         self.mp_kwargs = None
+        self.pyplot_artists = None
+        self.rgba_img_size = None
+        self.rgba_img_data = None
         self.logger = None
         self.beeper = None
         self.lock = None
@@ -2260,6 +2761,60 @@ class IV_Swinger():
     def i_sat(self, value):
         self._i_sat = value
 
+    @property
+    def reuse_figure(self):
+        """Property to enable figure reuse mode for pyplot. In this mode, a
+           persistent figure is kept for each layout (fonts, scales,
+           options, etc.) and each plot of a single curve only updates
+           the line data, labels, axis ranges and title of that figure
+           rather than building a new figure from scratch.
+        """
+        return self._reuse_figure
+
+    @reuse_figure.setter
+    def reuse_figure(self, value):
+        self._reuse_figure = value
+
+    @property
+    def render_to_memory(self):
+        """Property to render pyplot graphs to an in-memory RGBA buffer
+           (the rgba_img_size and rgba_img_data attributes) rather than
+           writing them to the image file
+        """
+        return self._render_to_memory
+
+    @render_to_memory.setter
+    def render_to_memory(self, value):
+        self._render_to_memory = value
+
+    @property
+    def extra_img_outputs(self):
+        """Property to specify additional image files to print from the same
+           pyplot figure as the main image file. This is a list of
+           (suffix, dpi) tuples. The file names are the same as the
+           main image file name except for the suffix.
+        """
+        return self._extra_img_outputs
+
+    @extra_img_outputs.setter
+    def extra_img_outputs(self, value):
+        self._extra_img_outputs = value
+
+    @property
+    def plt_data_sets(self):
+        """Property to provide the plotter data points in memory. This is a
+           dict whose keys are data point file names and whose values
+           are the (measured_volts, measured_amps, measured_watts,
+           interp_volts, interp_amps, interp_watts) tuples that would
+           otherwise be read from those files. Pyplot uses these rather
+           than reading the files (which need not exist).
+        """
+        return self._plt_data_sets
+
+    @plt_data_sets.setter
+    def plt_data_sets(self, value):
+        self._plt_data_sets = value
+
     @property
     def ax1(self):
         """Primary pyplot axes object
@@ -3341,6 +3896,37 @@ class IV_Swinger():
         """
         # pylint: disable=too-many-arguments
 
+        # In figure reuse mode, use a persistent figure (if possible)
+        if (self.reuse_figure and
+                self.pyplot_figure_reusable(sd_data_point_filenames)):
+            self.plot_with_pyplot_reusing_figure(sd_data_point_filenames,
+                                                 sd_img_filename, isc_amps,
+                                                 voc_volts, mpp_amps,
+                                                 mpp_volts)
+            return
+
+        # Draw the figure
+        self.draw_pyplot_figure(sd_data_point_filenames, isc_amps, voc_volts,
+                                mpp_amps, mpp_volts)
+
+        # Print to the image file
+        self.print_to_img_file(sd_img_filename)
+
+        # If not in headless mode, open interactive display
+        if not self.headless_mode:
+            self.open_interactive_display()
+
+        # Clear the figure in preparation for the next plot
+        plt.clf()
+
+    # -------------------------------------------------------------------------
+    def draw_pyplot_figure(self, sd_data_point_filenames, isc_amps, voc_volts,
+                           mpp_amps, mpp_volts):
+        """Method to draw the complete graph in the current pyplot
+           figure. The parameters are the same as for plot_with_pyplot().
+        """
+        # pylint: disable=too-many-arguments
+
         # Set the font
         self.set_pyplot_font_name()
 
@@ -3384,15 +3970,178 @@ class IV_Swinger():
         # Adjust margins
         self.adjust_margins()
 
-        # Print to the image file
-        self.print_to_img_file(sd_img_filename)
+    # -------------------------------------------------------------------------
+    def pyplot_figure_reusable(self, sd_data_point_filenames):
+        """Method to determine whether the graph can be plotted in figure
+           reuse mode. Only the common case of a single curve with no
+           reference curve and no saturation shading is supported.
+        """
+        return (len(sd_data_point_filenames) == 1 and not self.plot_ref and
+                self.v_sat is None and self.i_sat is None)
 
-        # If not in headless mode, open interactive display
-        if not self.headless_mode:
-            self.open_interactive_display()
+    # -------------------------------------------------------------------------
+    def get_pyplot_layout_key(self):
+        """Method to return a tuple of everything that determines the layout
+           of a reusable figure. A persistent figure may only be reused
+           for a plot with the same layout key.
+        """
+        return (self.font_name, self.font_scale, self.point_scale,
+                self.line_scale, self.plot_x_inches * self.plot_x_scale,
+                self.plot_y_inches * self.plot_y_scale, self.fancy_labels,
+                self.plot_power, self.mpp_watts_only,
+                None if self.names is None else tuple(self.names),
+                self.plot_colors[0], self.title_fontsize,
+                self.axislabel_fontsize, self.ticklabel_fontsize,
+                self.isclabel_fontsize, self.voclabel_fontsize,
+                self.mpplabel_fontsize, self.legend_fontsize,
+                self.plot_max_x is None, self.plot_max_y is None)
 
-        # Clear the figure in preparation for the next plot
-        plt.clf()
+    # -------------------------------------------------------------------------
+    def plot_with_pyplot_reusing_figure(self, sd_data_point_filenames,
+                                        sd_img_filename, isc_amps, voc_volts,
+                                        mpp_amps, mpp_volts):
+        """Method to generate the graph with pyplot in figure reuse mode. If
+           there is a persistent figure with the same layout, it is
+           updated. Otherwise, a new figure is drawn and kept for next
+           time. The parameters are the same as for plot_with_pyplot().
+        """
+        # pylint: disable=too-many-arguments
+
+        layout_key = self.get_pyplot_layout_key()
+        fig_entry = PYPLOT_FIGURE_CACHE.get(layout_key)
+        if (fig_entry is not None and
+                not plt.fignum_exists(fig_entry["fig"].number)):
+            # Closed externally (e.g. by close_plots())
+            del PYPLOT_FIGURE_CACHE[layout_key]
+            fig_entry = None
+
+        # The persistent figures must not be used by other plots, so
+        # the figure that is current on entry is made current again on
+        # exit
+        base_fig = plt.gcf()
+        try:
+            if fig_entry is None:
+                fig_entry = self.draw_persistent_pyplot_figure(
+                    layout_key, sd_data_point_filenames, isc_amps, voc_volts,
+                    mpp_amps, mpp_volts)
+            else:
+                self.update_persistent_pyplot_figure(
+                    fig_entry, sd_data_point_filenames, isc_amps, voc_volts,
+                    mpp_amps, mpp_volts)
+
+            # Print to the image file
+            self.print_to_img_file(sd_img_filename)
+
+            # If not in headless mode, open interactive display
+            if not self.headless_mode:
+                self.open_interactive_display()
+        finally:
+            plt.figure(base_fig.number)
+
+    # -------------------------------------------------------------------------
+    def draw_persistent_pyplot_figure(self, layout_key,
+                                      sd_data_point_filenames, isc_amps,
+                                      voc_volts, mpp_amps, mpp_volts):
+        """Method to draw the graph in a new figure and add the figure to
+           the persistent figure cache, along with the artists that are
+           updated when it is reused. The cache entry is returned.
+        """
+        # pylint: disable=too-many-arguments
+
+        fig = plt.figure()
+        self.ax2 = None
+        self.pyplot_artists = {"interp": [], "measured": [], "power": [],
+                               "points": [], "labels": []}
+        try:
+            self.draw_pyplot_figure(sd_data_point_filenames, isc_amps,
+                                    voc_volts, mpp_amps, mpp_volts)
+        except Exception:
+            plt.close(fig)
+            raise
+        finally:
+            artists = self.pyplot_artists
+            self.pyplot_artists = None
+        fig_entry = {"fig": fig, "ax1": self.ax1, "ax2": self.ax2,
+                     "artists": artists}
+        if len(PYPLOT_FIGURE_CACHE) >= PYPLOT_FIGURE_CACHE_MAX:
+            # Discard the oldest
+            oldest_key = next(iter(PYPLOT_FIGURE_CACHE))
+            plt.close(PYPLOT_FIGURE_CACHE.pop(oldest_key)["fig"])
+        PYPLOT_FIGURE_CACHE[layout_key] = fig_entry
+
+        return fig_entry
+
+    # -------------------------------------------------------------------------
+    def update_persistent_pyplot_figure(self, fig_entry,
+                                        sd_data_point_filenames, isc_amps,
+                                        voc_volts, mpp_amps, mpp_volts):
+        """Method to update a persistent figure for a new curve. Only the
+           title, axis ranges and ticks, margins, line data, and the
+           Isc, MPP and Voc points and labels are changed.
+        """
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-locals
+
+        plt.figure(fig_entry["fig"].number)
+        self.ax1 = fig_entry["ax1"]
+        self.ax2 = fig_entry["ax2"]
+        plt.sca(self.ax1)
+        artists = fig_entry["artists"]
+
+        # Title, ranges and ticks
+        self.set_pyplot_font_name()
+        self.set_figure_title(sd_data_point_filenames)
+        max_x = self.set_x_range(voc_volts)
+        max_y = self.set_y_range(isc_amps, mpp_amps)
+        self.set_x_ticks(max_x)
+        self.set_y_ticks(max_y)
+
+        # Measured points and interpolated curve
+        (measured_volts,
+         measured_amps,
+         _,
+         interp_volts,
+         interp_amps,
+         interp_watts) = self.get_plt_data_set(sd_data_point_filenames[0])
+        for line in artists["interp"]:
+            line.set_data(interp_volts, interp_amps)
+        for line in artists["measured"]:
+            line.set_data(measured_volts, measured_amps)
+
+        # Power curve (see plot_power_curve())
+        if self.ax2 is not None:
+            self.ax2.set_xlim(self.ax1.get_xlim())
+            max_y2 = self.ax1.get_ylim()[1] * mpp_volts[0]
+            self.ax2.set_ylim(0, max_y2)
+            fontsize = self.ticklabel_fontsize * self.font_scale
+            for yticklabel in self.ax2.get_yticklabels():
+                yticklabel.set_fontsize(fontsize)
+            for line in artists["power"]:
+                line.set_data(interp_volts, interp_watts)
+
+        # Isc, MPP and Voc points and labels
+        (isc_point, mpp_point, voc_point) = artists["points"]
+        (isc_label, mpp_label, voc_label) = artists["labels"]
+        isc_point.set_data([0], [isc_amps[0]])
+        isc_label.set_text(self.get_isc_label_str(isc_amps[0]))
+        isc_label.xy = (0, isc_amps[0])
+        mpp_point.set_data([mpp_volts[0]], [mpp_amps[0]])
+        mpp_label.set_text(self.get_mpp_label_str(mpp_amps[0], mpp_volts[0]))
+        mpp_label.xy = (mpp_volts[0], mpp_amps[0])
+        voc_point.set_data([voc_volts[0]], [0])
+        voc_label.set_text(self.get_voc_label_str(voc_volts[0]))
+        voc_label.xy = (voc_volts[0], 0)
+
+        # Adjust margins (they depend on the Y range)
+        self.adjust_margins()
+
+    # -------------------------------------------------------------------------
+    def save_pyplot_artist(self, artist_type, artist):
+        """Method to save an artist that is updated when a persistent figure
+           is reused (figure reuse mode only)
+        """
+        if self.pyplot_artists is not None:
+            self.pyplot_artists[artist_type].append(artist)
 
     # -------------------------------------------------------------------------
     def plot_with_pyplot_with_retry(self, sd_data_point_filenames,
@@ -3517,8 +4266,10 @@ class IV_Swinger():
         if len(sd_data_point_filenames) > 1 and not self.plot_ref:
             run_str = f"{len(sd_data_point_filenames)} Runs"
         else:
-            run_str = (sd_data_point_filenames[0] if not self.plot_ref else
-                       sd_data_point_filenames[1])
+            # The data point file names may include a directory
+            run_str = os.path.basename(sd_data_point_filenames[0]
+                                       if not self.plot_ref else
+                                       sd_data_point_filenames[1])
             date_time_str = DateTimeStr.extract_date_time_str(run_str)
             if date_time_str == "No match":
                 run_str += " Run"
@@ -3680,8 +4431,7 @@ class IV_Swinger():
         fontsize = self.isclabel_fontsize * self.font_scale
         prev_isc_str_width = 0
         for ii, isc_amp in enumerate(isc_amps):
-            # Round isc_amp to 3 significant figures
-            isc_str = f"Isc = {sigfigs(isc_amp, 3)} A"
+            isc_str = self.get_isc_label_str(isc_amp)
             if self.use_gnuplot:
                 gp_isc_str = ' ""'
                 if not ii or self.label_all_iscs or self.plot_ref:
@@ -3697,9 +4447,10 @@ class IV_Swinger():
                                     int(6.25 * prev_isc_str_width) *
                                     self.font_scale)
                     ytext_offset = xytext_offset + 5
-                    pyplot_annotate_point(isc_str, 0, isc_amp,
-                                          xtext_offset, ytext_offset,
-                                          fontsize, bbox, arrowprops)
+                    label = pyplot_annotate_point(isc_str, 0, isc_amp,
+                                                  xtext_offset, ytext_offset,
+                                                  fontsize, bbox, arrowprops)
+                    self.save_pyplot_artist("labels", label)
             prev_isc_str_width = len(isc_str)
 
     # -------------------------------------------------------------------------
@@ -3714,18 +4465,7 @@ class IV_Swinger():
         fontsize = self.mpplabel_fontsize * self.font_scale
         max_mpp_volts = max(mpp_volts)
         for ii, mpp_amp in enumerate(mpp_amps):
-            # Round mpp_volts to 3 significant figures
-            mppv_str = f"{sigfigs(mpp_volts[ii], 3)}"
-            # Round mpp_amp to 3 significant figures
-            mppa_str = f"{sigfigs(mpp_amp, 3)}"
-            # Create (V * A) string from those
-            mpp_volts_x_amps_str = f" ({mppv_str} * {mppa_str})"
-            if self.mpp_watts_only:
-                mpp_volts_x_amps_str = ""
-            mpp_watts = mpp_volts[ii] * mpp_amp
-            # Round mpp_watts to 3 significant figures
-            mppw_str = f"{sigfigs(mpp_watts, 3)}"
-            mpp_str = f"MPP = {mppw_str} W{mpp_volts_x_amps_str}"
+            mpp_str = self.get_mpp_label_str(mpp_amp, mpp_volts[ii])
             if self.use_gnuplot:
                 gp_mpp_str = ' ""'
                 if not ii or self.label_all_mpps or self.plot_ref:
@@ -3766,9 +4506,10 @@ class IV_Swinger():
                                           textcoords="axes fraction")
                 elif ii == 0:
                     x_off, y_off = xytext_offset + 5, xytext_offset + 5
-                    pyplot_annotate_point(mpp_str, mpp_volts[ii], mpp_amp,
-                                          x_off, y_off,
-                                          fontsize, bbox, arrowprops)
+                    label = pyplot_annotate_point(mpp_str, mpp_volts[ii],
+                                                  mpp_amp, x_off, y_off,
+                                                  fontsize, bbox, arrowprops)
+                    self.save_pyplot_artist("labels", label)
 
     # -------------------------------------------------------------------------
     def plot_and_label_voc(self, voc_volts, xytext_offset, bbox, arrowprops):
@@ -3778,8 +4519,7 @@ class IV_Swinger():
         if self.label_all_vocs:
             nn = len(voc_volts) - 1
         for ii, voc_volt in enumerate(voc_volts):
-            # Round voc_volt to 3 significant figures
-            voc_str = f"Voc = {sigfigs(voc_volt, 3)} V"
+            voc_str = self.get_voc_label_str(voc_volt)
             if self.use_gnuplot:
                 gp_voc_str = ' ""'
                 if not ii or self.label_all_vocs or self.plot_ref:
@@ -3791,12 +4531,43 @@ class IV_Swinger():
             else:
                 self.pyplot_add_point(voc_volt, 0)
                 if not ii or self.label_all_vocs or self.plot_ref:
-                    pyplot_annotate_point(voc_str, voc_volt, 0,
-                                          xytext_offset + 5,
-                                          (xytext_offset + 5 +
-                                           ((nn - ii) * 20 *
-                                            self.font_scale)),
-                                          fontsize, bbox, arrowprops)
+                    label = pyplot_annotate_point(voc_str, voc_volt, 0,
+                                                  xytext_offset + 5,
+                                                  (xytext_offset + 5 +
+                                                   ((nn - ii) * 20 *
+                                                    self.font_scale)),
+                                                  fontsize, bbox, arrowprops)
+                    self.save_pyplot_artist("labels", label)
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def get_isc_label_str(isc_amp):
+        """Method to return the label string for an Isc point"""
+        # Round isc_amp to 3 significant figures
+        return f"Isc = {sigfigs(isc_amp, 3)} A"
+
+    # -------------------------------------------------------------------------
+    def get_mpp_label_str(self, mpp_amp, mpp_volt):
+        """Method to return the label string for an MPP"""
+        # Round mpp_volt to 3 significant figures
+        mppv_str = f"{sigfigs(mpp_volt, 3)}"
+        # Round mpp_amp to 3 significant figures
+        mppa_str = f"{sigfigs(mpp_amp, 3)}"
+        # Create (V * A) string from those
+        mpp_volts_x_amps_str = f" ({mppv_str} * {mppa_str})"
+        if self.mpp_watts_only:
+            mpp_volts_x_amps_str = ""
+        mpp_watts = mpp_volt * mpp_amp
+        # Round mpp_watts to 3 significant figures
+        mppw_str = f"{sigfigs(mpp_watts, 3)}"
+        return f"MPP = {mppw_str} W{mpp_volts_x_amps_str}"
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def get_voc_label_str(voc_volt):
+        """Method to return the label string for a Voc point"""
+        # Round voc_volt to 3 significant figures
+        return f"Voc = {sigfigs(voc_volt, 3)} V"
 
     # -------------------------------------------------------------------------
     def pyplot_add_point(self, x, y):
@@ -3805,13 +4576,14 @@ class IV_Swinger():
         markersize = DEFAULT_MARKER_POINTSIZE * self.point_scale
         if self.point_scale < 1.0:
             markersize = DEFAULT_MARKER_POINTSIZE
-        plt.plot([x], [y],
-                 marker="o",
-                 color="black",
-                 linestyle="none",
-                 markersize=markersize,
-                 markeredgewidth=1,
-                 clip_on=False)
+        (point,) = plt.plot([x], [y],
+                            marker="o",
+                            color="black",
+                            linestyle="none",
+                            markersize=markersize,
+                            markeredgewidth=1,
+                            clip_on=False)
+        self.save_pyplot_artist("points", point)
 
     # -------------------------------------------------------------------------
     def gnuplot_label_point(self, label_str, x, y, xtext, ytext, fontsize):
@@ -3840,14 +4612,12 @@ class IV_Swinger():
             self.output_line = "plot "
         for curve_num, df in enumerate(sd_data_point_filenames):
             if not self.use_gnuplot:
-                with open(df, "r", encoding="utf-8") as f:
-                    # Read points from the file
-                    (measured_volts,
-                     measured_amps,
-                     _,
-                     interp_volts,
-                     interp_amps,
-                     interp_watts) = read_measured_and_interp_points(f)
+                (measured_volts,
+                 measured_amps,
+                 _,
+                 interp_volts,
+                 interp_amps,
+                 interp_watts) = self.get_plt_data_set(df)
 
             # Put measured points label at top of legend
             if not self.use_gnuplot and not curve_num and self.point_scale:
@@ -3879,6 +4649,17 @@ class IV_Swinger():
             self.output_line += "\n"
             self.filehandle.write(self.output_line)
 
+    # -------------------------------------------------------------------------
+    def get_plt_data_set(self, df):
+        """Method to get the measured and interpolated points for a data point
+           file, either from memory (plt_data_sets) or from the file
+        """
+        if df in self.plt_data_sets:
+            return self.plt_data_sets[df]
+        with open(df, "r", encoding="utf-8") as f:
+            # Read points from the file
+            return read_measured_and_interp_points(f)
+
     # -------------------------------------------------------------------------
     def get_measured_points_kwargs(self):
         """Method to fill the kwargs dict shared by the plt.plot calls for both
@@ -3934,7 +4715,9 @@ class IV_Swinger():
         else:
             # Plot without label, which was added by
             # add_measured_points_label()
-            plt.plot(measured_volts, measured_amps, **self.mp_kwargs)
+            (line,) = plt.plot(measured_volts, measured_amps,
+                               **self.mp_kwargs)
+            self.save_pyplot_artist("measured", line)
 
     # -------------------------------------------------------------------------
     def plot_interp_points(self, curve_num, df, sd_data_point_filenames,
@@ -3980,11 +4763,12 @@ class IV_Swinger():
                 f'linewidth {self.gp_interp_linewidth * self.line_scale} '
                 f'linetype {self.gp_interp_linetype},')
         else:
-            plt.plot(interp_volts, interp_amps,
-                     color=color,
-                     linewidth=DEFAULT_LINEWIDTH * self.line_scale,
-                     linestyle=linestyle,
-                     label=interp_label)
+            (line,) = plt.plot(interp_volts, interp_amps,
+                               color=color,
+                               linewidth=DEFAULT_LINEWIDTH * self.line_scale,
+                               linestyle=linestyle,
+                               label=interp_label)
+            self.save_pyplot_artist("interp", line)
 
     # -------------------------------------------------------------------------
     def plot_power_curve(self, curve_num, interp_volts, interp_watts,
@@ -4028,12 +4812,14 @@ class IV_Swinger():
                 yticklabel.set_fontsize(fontsize)
             name = "Power Curve"
         # Plot the power curve on ax2
-        self.ax2.plot(interp_volts, interp_watts,
-                      color="red",
-                      linewidth=(DEFAULT_LINEWIDTH * POWER_LINEWIDTH_MULT *
-                                 self.line_scale),
-                      linestyle="dashed",
-                      label=name)
+        (line,) = self.ax2.plot(interp_volts, interp_watts,
+                                color="red",
+                                linewidth=(DEFAULT_LINEWIDTH *
+                                           POWER_LINEWIDTH_MULT *
+                                           self.line_scale),
+                                linestyle="dashed",
+                                label=name)
+        self.save_pyplot_artist("power", line)
         # Set the current axes object back to ax1
         plt.sca(self.ax1)
 
@@ -4089,8 +4875,41 @@ class IV_Swinger():
 
     # -------------------------------------------------------------------------
     def print_to_img_file(self, sd_img_filename):
-        """Method to print the plot to the image file"""
-        plt.savefig(sd_img_filename, dpi=self.plot_dpi)
+        """Method to print the plot to the image file (and to the extra image
+           files, if any)
+        """
+        # Figure.savefig() is used rather than plt.savefig() because the
+        # latter redraws the whole figure after saving it
+        fig = plt.gcf()
+        if self.render_to_memory:
+            self.print_to_rgba_buffer()
+        else:
+            fig.savefig(sd_img_filename, dpi=self.plot_dpi)
+        (fn_wo_suffix, _) = os.path.splitext(sd_img_filename)
+        for (suffix, dpi) in self.extra_img_outputs:
+            fig.savefig(f"{fn_wo_suffix}{suffix}", dpi=dpi)
+
+    # -------------------------------------------------------------------------
+    def print_to_rgba_buffer(self):
+        """Method to render the plot with Agg to an in-memory buffer of raw
+           RGBA pixels. The (width, height) of the image in pixels is
+           saved in the rgba_img_size attribute and the pixel data is
+           saved in the rgba_img_data attribute.
+        """
+        # The figure's own canvas is a PDF canvas, so an Agg canvas is
+        # attached to it for the rendering. The size is taken from the
+        # Agg renderer, so it always matches the pixel data.
+        fig = plt.gcf()
+        orig_canvas = fig.canvas
+        orig_dpi = fig.dpi
+        agg_canvas = FigureCanvasAgg(fig)
+        try:
+            fig.dpi = self.plot_dpi
+            (self.rgba_img_data,
+             self.rgba_img_size) = agg_canvas.print_to_buffer()
+        finally:
+            fig.dpi = orig_dpi
+            fig.set_canvas(orig_canvas)
 
     # -------------------------------------------------------------------------
     def open_interactive_display(self):
@@ -4112,6 +4931,7 @@ class IV_Swinger():
            else it throws some strange errors and hangs on exit.
         """
         plt.close("all")
+        PYPLOT_FIGURE_CACHE.clear()
 
     # -------------------------------------------------------------------------
     def shut_down(self, lock_held=True):  # IVS1
@@ -72,20 +72,32 @@
 # shade a step and swinging an IV curve on each iteration.
 #
 import argparse
+import base64
+import binascii
+import collections
+import concurrent.futures
 import configparser
+import copy
 import datetime as dt
 import difflib
 import glob
 import io
+import json
 import math
 import os
 from pathlib import Path
+import queue
 import re
 import shutil
+import sqlite3
 import subprocess
 import sys
+import threading
 import time
+import traceback
+import weakref
 from inspect import currentframe, getframeinfo
+import numpy as np
 from PIL import Image
 from PIL import __version__ as pillow_version
 import serial
@@ -93,7 +105,10 @@ import serial.tools.list_ports
 import IV_Swinger
 import IV_Swinger_plotter
 from IV_Swinger2_PV_model import (IV_Swinger2_PV_model,
-                                  PV_MODEL_CURVE_NUM_POINTS)
+                                  PV_MODEL_CURVE_NUM_POINTS,
+                                  PARMS_CACHE as PV_MODEL_PARMS_CACHE,
+                                  PARMS_CACHE_FILENAME as
+                                  PV_MODEL_PARMS_CACHE_FILENAME)
 from IV_Swinger_PV_model import scipy_version
 
 #################
@@ -133,9 +148,10 @@ SKETCH_VER_LT = -1
 SKETCH_VER_EQ = 0
 SKETCH_VER_GT = 1
 SKETCH_VER_ERR = -2
-LATEST_SKETCH_VER = "1.4.6"
+LATEST_SKETCH_VER = "1.5.1"
 MIN_PT1_TO_VOC_RATIO_FOR_ISC = 0.20
 BATTERY_FOLDER_NAME = "Battery"
+RESULTS_INDEX_FILENAME = "results_index.sqlite"
 
 # From IV_Swinger
 PLOT_COLORS = IV_Swinger.PLOT_COLORS
@@ -175,15 +191,43 @@ SECOND_RELAY_STATE_DEFAULT = SECOND_RELAY_OFF
 MIN_BIAS_CH1_ADC = 50
 MIN_BIAS_CH1_ADC_PCT = 7
 RELAY_ACTIVE_HIGH_DEFAULT = False
+BINARY_XFER_DEFAULT = True
+USB_MAX_BAUD_DEFAULT = 1000000
+USB_READER_THREAD_DEFAULT = False
 # Default PV model config
 ESTIMATE_IRRAD_DEFAULT = False
 ESTIMATE_TEMP_DEFAULT = False
 USE_AVG_SENSOR_TEMP_DEFAULT = False
 CELL_TEMP_ADJUST_DEFAULT = 3.0
+USE_PARMS_CACHE_DEFAULT = False
+# Default ADC correction config
+VECTORIZED_NR_DEFAULT = True
+# Data point log levels
+DATA_POINT_LOG_NONE = 0    # Data points are not logged
+DATA_POINT_LOG_ALL = 1     # All data points are logged (single write)
+DATA_POINT_LOG_LEVEL_DEFAULT = DATA_POINT_LOG_ALL
+# Default logging config
+LOG_BUFFERED_DEFAULT = True
+LOG_FLUSH_INTERVAL_DEFAULT = 1.0    # seconds
+LOG_MAX_BUFFER_LINES_DEFAULT = 500
+# Default pipeline config
+PIPELINED_DEFAULT = False
+PIPELINE_WORKERS_DEFAULT = 2
+# Default plotting config
+REUSE_FIGURE_DEFAULT = True
+RENDER_IN_MEMORY_DEFAULT = True
+DRAW_ONCE_DEFAULT = True
+PDF_DPI = 100.0
 # Other Arduino constants
 ARDUINO_MAX_INT = (1 << 15) - 1
 MAX_IV_POINTS_MAX = 275
 ADC_MAX = 4095
+BINARY_XFER_FORMAT = 1
+CRC16_INIT = 0xFFFF
+BAUD_RATES = (115200, 230400, 500000, 1000000)  # Proposed in order
+BAUD_CHANGE_DELAY = 0.05  # seconds
+BAUD_RESTORE_DELAY = 1.5  # seconds (> Arduino MSG_TIMER_TIMEOUT)
+SERIAL_READER_MAX_MSGS = 1024
 MAX_ASPECT = 8
 ADS1115_UNITY_GAIN_MAX_MILLIVOLTS = 4096
 ADS1115_NON_SIGN_BITS = 15
@@ -232,6 +276,8 @@ EEPROM_VALID_VALUE = "123456.7890"
 EEPROM_VALID_COUNT = 13  # increment if any added (starts at addr 8)
 # Debug constants
 DEBUG_CONFIG = False
+# Global lock serializing pyplot use (which is not thread-safe)
+PYPLOT_LOCK = threading.Lock()
 
 
 ########################
@@ -283,6 +329,73 @@ def get_default_app_data_dir():
     return os.path.expanduser(os.path.join("~", f".{APP_NAME}"))
 
 
+def add_app_data_dir_arg(parser):
+    """Global function to add the --app-data-dir option to the argparse
+       parser of a command line tool. Its value is converted with
+       get_abs_app_data_dir().
+    """
+    parser.add_argument("--app-data-dir",
+                        help="App data directory (default: standard place)")
+
+
+def get_abs_app_data_dir(app_data_dir=None):
+    """Global function to return the absolute path of the specified
+       application data directory, or of the default one if it is None
+    """
+    if app_data_dir is None:
+        app_data_dir = get_default_app_data_dir()
+    return os.path.abspath(app_data_dir)
+
+
+def run_in_worker_pool(worker_class, worker_args, items, num_jobs, logger,
+                       get_name_and_status):
+    """Global function to process a list of items (e.g. run directories)
+       in a pool of worker processes for a command line tool. One
+       object of worker_class (a PoolWorker subclass) is created with
+       worker_args in each worker process. This is a generator that
+       yields an (item number, result) tuple as each item is completed,
+       after logging the progress. The get_name_and_status function
+       returns the item's name and status for the progress message,
+       given its result.
+    """
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-locals
+    num_items = len(items)
+    start_time = time.time()
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max(1, min(num_jobs, num_items)),
+            initializer=init_pool_worker,
+            initargs=(worker_class, worker_args)) as executor:
+        futures = {executor.submit(process_item_in_pool_worker,
+                                   worker_class, item): item_num
+                   for item_num, item in enumerate(items)}
+        for num_done, future in enumerate(
+                concurrent.futures.as_completed(futures), start=1):
+            result = future.result()
+            (name, status) = get_name_and_status(result)
+            elapsed = time.time() - start_time
+            remaining = elapsed / num_done * (num_items - num_done)
+            msg_str = (f"[{num_done}/{num_items}] {name}: {status} "
+                       f"(elapsed {elapsed:.0f} s, remaining "
+                       f"{remaining:.0f} s)")
+            logger.print_and_log(msg_str)
+            yield (futures[future], result)
+
+
+def init_pool_worker(worker_class, worker_args):
+    """Global function to create the PoolWorker object for a worker
+       process of run_in_worker_pool()
+    """
+    worker_class.worker = worker_class(*worker_args)
+
+
+def process_item_in_pool_worker(worker_class, item):
+    """Global function to process one item in a worker process of
+       run_in_worker_pool()
+    """
+    return worker_class.worker.process(item)
+
+
 def close_plots():
     """Global function to close all plots using the static method of the
        same name from the IV_Swinger class of the IV_Swinger module.
@@ -347,38 +460,31 @@ def get_saved_title(cfg_file):
 def combine_dup_voltages(adc_pairs):
     """Global function to combine consecutive points with duplicate voltages
        (CH0 values) to a single point with the average of their current
-       (CH1) values
+       (CH1) values. The ADC pairs may be an AdcCurve or a list of
+       tuples; an AdcCurve is returned.
     """
-    non_dup_adc_pairs = []
-    ch1_sum = 0
-    ch0_count = 0
-    last_pair_num = len(adc_pairs) - 1
-    for pair_num, adc_pair in enumerate(adc_pairs):
-        ch0_adc = adc_pair[0]
-        ch1_adc = adc_pair[1]
-        # If the CH0 value is the same as that of the next point,
-        # don't add the point to the new list; just accumulate the
-        # CH1 value and increment the count to calculate the
-        # average later.
-        if (pair_num < last_pair_num and
-                ch0_adc == adc_pairs[pair_num+1][0]):
-            # Add CH1 value to the CH1 sum and increment the
-            # CH0 count for the average calculation.
+    curve = AdcCurve(adc_pairs)
+    if not curve:
+        return AdcCurve()
+    # Each run of consecutive points with the same CH0 value is replaced
+    # by its last point
+    new_run = np.ones(len(curve), dtype=bool)
+    new_run[1:] = curve.ch0[1:] != curve.ch0[:-1]
+    run_starts = np.flatnonzero(new_run)
+    run_ends = np.append(run_starts[1:], len(curve))
+    non_dup_curve = AdcCurve(curve.array[run_ends - 1])
+    # Calculate the average CH1 value of each run with duplicate CH0
+    # values. The sum is accumulated in order, exactly as the values
+    # were originally summed.
+    for run_num in np.flatnonzero(run_ends - run_starts > 1).tolist():
+        if non_dup_curve.array.dtype.kind != "f":
+            non_dup_curve = non_dup_curve.copy()
+        ch1_sum = 0
+        run_ch1 = curve.ch1[run_starts[run_num]:run_ends[run_num]]
+        for ch1_adc in run_ch1.tolist():
             ch1_sum += ch1_adc
-            ch0_count += 1
-        else:
-            if ch0_count > 0:
-                # This is the last point in a sequence with
-                # duplicate CH0 values, so calculate the average CH1
-                # value and append the single point to the list
-                avg_ch1_adc = float(ch1_sum + ch1_adc) / (ch0_count + 1)
-                non_dup_adc_pairs.append((ch0_adc, avg_ch1_adc))
-                # Reset the sum and count variables
-                ch1_sum = 0
-                ch0_count = 0
-            else:
-                non_dup_adc_pairs.append((ch0_adc, ch1_adc))
-    return non_dup_adc_pairs
+        non_dup_curve.ch1[run_num] = float(ch1_sum) / len(run_ch1)
+    return non_dup_curve
 
 
 def calc_v_adj(adc_pairs):
@@ -587,6 +693,189 @@ def noise_reduction(adc_pairs, starting_rot_thresh=5.0,
     return adc_pairs_nr
 
 
+def rotations_at_points(volts, amps, points, i_scale, distance=1):
+    """Global function that is the vectorized equivalent of
+       rotation_at_point(). The CH0 and CH1 values are passed in as two
+       NumPy arrays, and the rotation angles are calculated for all of
+       the point numbers in the points array at once. The i_scale value
+       (Voc/Isc) is passed in since it does not change when points are
+       corrected. A NumPy array of the rotation angles is returned.
+    """
+    # pylint: disable=too-many-locals
+    num_points = len(volts)
+    points = np.asarray(points, dtype=int)
+    pt1 = np.where(distance < points, points - distance, 0)
+    pt3 = np.where(points + distance < num_points, points + distance,
+                   num_points - 1)
+    i1 = amps[pt1]
+    v1 = volts[pt1]
+    i2 = amps[points]
+    v2 = volts[points]
+    i3 = amps[pt3]
+    v3 = volts[pt3]
+    # Vertical segments get an "infinite" slope, signed the same way as
+    # in rotation_at_point() (which uses i2 > i1 for both segments)
+    inf_slope = np.where(i2 > i1, INFINITE_VAL, -(INFINITE_VAL))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m12 = np.where(v2 == v1, inf_slope, i_scale * (i2 - i1) / (v2 - v1))
+        m23 = np.where(v3 == v2, inf_slope, i_scale * (i3 - i2) / (v3 - v2))
+    # The arctangents are taken with math.atan() rather than np.arctan()
+    # because the latter may differ in the last bit, and the results
+    # must be identical to those of rotation_at_point()
+    atans = np.fromiter(map(math.atan, np.concatenate((m12, m23)).tolist()),
+                        dtype=float, count=2 * len(points))
+    rot_degrees = (np.degrees(atans[:len(points)]) -
+                   np.degrees(atans[len(points):]))
+    rot_degrees[points == 0] = 0.0
+    return rot_degrees
+
+
+def noise_reduction_vectorized(adc_pairs, starting_rot_thresh=5.0,
+                               max_iterations=1, thresh_divisor=2.0,
+                               ppm_thresh=100):
+    """Global function that implements the same algorithm as
+       noise_reduction(), but using NumPy arrays for the rotation angle
+       calculations. The short-distance and long-distance rotation
+       angles are calculated for all points in a single pass at the
+       start of each iteration. When a point is corrected, only the
+       rotation angles of the neighbor points whose calculations depend
+       on it are marked for recalculation (which happens when they are
+       visited), rather than recalculating the rotation at every point
+       that is visited. The parameters are the same as for
+       noise_reduction(). If adc_pairs is an AdcCurve, an AdcCurve is
+       returned; otherwise a list of (CH0, CH1) tuples is returned, the
+       same as noise_reduction().
+    """
+    # pylint: disable=too-many-branches
+    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-statements
+    curve = AdcCurve(adc_pairs)
+    adc_array = curve.array.astype(float)
+    adc_pairs_nr = curve.to_list()
+    num_points = len(curve)
+    # The first and last points are never corrected, so the scaling
+    # factor is the same for all iterations
+    i_scale = curve.i_scale
+    points = np.arange(num_points - 1)
+    rot_thresh = starting_rot_thresh
+    for _ in range(max_iterations):
+        # Distance (in points) of the "far" points for the inflection
+        # comparison (see noise_reduction())
+        dist = int(num_points / 20.0)
+        dist = max(dist, 2)
+        # Calculate the short- and long-distance rotation at each point
+        # and sort the point numbers by the absolute value of the
+        # short-distance rotation (stable, like sorted()).
+        volts = adc_array[:, 0]
+        amps = adc_array[:, 1]
+        rots = rotations_at_points(volts, amps, points, i_scale)
+        long_rots = rotations_at_points(volts, amps, points, i_scale, dist)
+        sorted_points = np.argsort(-np.abs(rots), kind="stable").tolist()
+        rots = rots.tolist()
+        long_rots = long_rots.tolist()
+        # Iterate through the sorted points
+        max_corr_ppm = -1.0
+        stale_rots = set()
+        stale_long_rots = set()
+        for point in sorted_points:
+            if point in stale_rots:
+                rots[point] = rotation_at_point(adc_pairs_nr, point)
+            rot_degrees = rots[point]
+            if abs(rot_degrees) > rot_thresh:
+                deviation = True
+                if dist <= point < (num_points - dist):
+                    if point in stale_long_rots:
+                        long_rots[point] = rotation_at_point(adc_pairs_nr,
+                                                             point, dist)
+                    long_rot_degrees = long_rots[point]
+                    if (long_rot_degrees > rot_degrees > 0 or
+                            long_rot_degrees < rot_degrees < 0):
+                        deviation = False
+                if deviation:
+                    curr_point = adc_pairs_nr[point]
+                    prev_point = adc_pairs_nr[point-1]
+                    next_point = adc_pairs_nr[point+1]
+                    if point > 1:
+                        ch0_adc_corrected = (prev_point[0] +
+                                             next_point[0]) / 2.0
+                    else:
+                        # Don't correct voltage of point 1 (see
+                        # noise_reduction())
+                        ch0_adc_corrected = curr_point[0]
+                    ch1_adc_corrected = (prev_point[1] +
+                                         next_point[1]) / 2.0
+                    adc_pairs_nr[point] = (ch0_adc_corrected,
+                                           ch1_adc_corrected)
+                    adc_array[point] = adc_pairs_nr[point]
+
+                    # The rotation at the neighbor points whose
+                    # calculations use this point must be recalculated
+                    stale_rots.update((point - 1, point + 1))
+                    stale_long_rots.update((point - dist, point + dist))
+
+                    # Calculate the PPM of the corrections so we
+                    # stop iterating early if the corrections have
+                    # become sufficiently small
+                    ch0_corr_ppm = 1000000.0 * abs(1.0 - curr_point[0] /
+                                                   ch0_adc_corrected)
+                    ch1_corr_ppm = 1000000.0 * abs(1.0 - curr_point[1] /
+                                                   ch1_adc_corrected)
+                    max_corr_ppm = max(max_corr_ppm, ch0_corr_ppm,
+                                       ch1_corr_ppm)
+
+        # Stop iterating if the PPM of the maximum correction
+        # performed is less than the ppm_thresh parameter
+        if 0 < max_corr_ppm < ppm_thresh:
+            break
+
+        rot_thresh /= thresh_divisor
+
+    if isinstance(adc_pairs, AdcCurve):
+        return AdcCurve(adc_array)
+    return adc_pairs_nr
+
+
+def unpack_binary_adc_pairs(binary_str):
+    """Global function to decode the base64-encoded block of ADC pairs sent
+       by the Arduino in binary transfer mode. See the Arduino sketch
+       for the block format. An AdcCurve is returned, or None if the
+       block is malformed or its CRC does not match.
+    """
+    try:
+        block = base64.b64decode(binary_str.strip(), validate=True)
+    except binascii.Error:
+        return None
+    if len(block) < 6 or block[2] != BINARY_XFER_FORMAT:
+        return None
+    num_pairs = int.from_bytes(block[0:2], "little")
+    if len(block) != (num_pairs + 2) * 3:
+        return None
+    crc = int.from_bytes(block[-3:-1], "little")
+    if binascii.crc_hqx(block[:-3], CRC16_INIT) != crc:
+        return None
+    packed = np.frombuffer(block, dtype=np.uint8, count=num_pairs * 3,
+                           offset=3).reshape(-1, 3).astype(int)
+    ch0 = packed[:, 0] | ((packed[:, 1] & 0x0f) << 8)
+    ch1 = (packed[:, 1] >> 4) | (packed[:, 2] << 4)
+    return AdcCurve.from_columns(ch0, ch1)
+
+
+def append_adc_pairs(adc_array, num_pairs, new_pairs):
+    """Global function to append ADC pairs to the first num_pairs rows of a
+       preallocated Nx2 array. The array is doubled in size if it is
+       not big enough. A tuple is returned containing the (possibly
+       reallocated) array and the updated number of pairs.
+    """
+    new_num_pairs = num_pairs + len(new_pairs)
+    if new_num_pairs > len(adc_array):
+        new_len = max(new_num_pairs, 2 * len(adc_array))
+        grown_array = np.empty((new_len, 2), dtype=adc_array.dtype)
+        grown_array[:num_pairs] = adc_array[:num_pairs]
+        adc_array = grown_array
+    adc_array[num_pairs:new_num_pairs] = new_pairs
+    return (adc_array, new_num_pairs)
+
+
 def get_run_info_filename(run_dir):
     """Global function to get the run_info file name, given the run
        directory.
@@ -639,6 +928,235 @@ def get_sensor_values_from_file(run_info_filename):
 #################
 
 
+# AdcCurve class
+#
+class AdcCurve():
+    """Compact container for the (CH0, CH1) ADC value pairs of one IV
+       curve. The pairs are held in a single Nx2 NumPy array, with the
+       CH0 (voltage) values in column 0 and the CH1 (current) values in
+       column 1. The values are float64, with the exception that integer
+       values (e.g. the raw values received from the Arduino) are kept
+       as integers so they are written to the CSV file unchanged.
+
+       An AdcCurve may be constructed from a list of (CH0, CH1) tuples,
+       from an Nx2 array, or from another AdcCurve. In the last two
+       cases the array is shared, not copied. Slicing an AdcCurve
+       returns another AdcCurve that is a view of the same array (e.g.
+       curve[:-1] to exclude the Voc point), so modifying the values of
+       a slice modifies the original. Indexing with an integer returns a
+       (CH0, CH1) tuple and iterating yields (CH0, CH1) tuples, so an
+       AdcCurve may be used anywhere a list of tuples is expected.
+    """
+
+    # Initializer
+    def __init__(self, adc_pairs=None):
+        if adc_pairs is None:
+            adc_array = np.empty((0, 2))
+        elif isinstance(adc_pairs, AdcCurve):
+            adc_array = adc_pairs.array
+        else:
+            adc_array = np.asarray(adc_pairs).reshape(-1, 2)
+            if adc_array.dtype.kind not in "iu":
+                adc_array = adc_array.astype(float, copy=False)
+        self._array = adc_array
+
+    def __len__(self):
+        return len(self._array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return AdcCurve(self._array[index])
+        return tuple(self._array[index].tolist())
+
+    def __iter__(self):
+        return map(tuple, self._array.tolist())
+
+    # Properties
+    # ---------------------------------
+    @property
+    def array(self):
+        """Nx2 array of ADC values"""
+        return self._array
+
+    # ---------------------------------
+    @property
+    def ch0(self):
+        """Array of CH0 (voltage) ADC values (view)"""
+        return self._array[:, 0]
+
+    # ---------------------------------
+    @property
+    def ch1(self):
+        """Array of CH1 (current) ADC values (view)"""
+        return self._array[:, 1]
+
+    # ---------------------------------
+    @property
+    def i_scale(self):
+        """Scaling factor (Voc/Isc) used for the rotation angle
+           calculations
+        """
+        if not self:
+            return INFINITE_VAL
+        return float(self._array[-1, 0]) / float(self._array[0, 1])
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def from_columns(ch0, ch1):
+        """Method to create an AdcCurve from arrays of CH0 and CH1 values"""
+        return AdcCurve(np.column_stack((ch0, ch1)))
+
+    # -------------------------------------------------------------------------
+    def copy(self):
+        """Method to return a float64 copy of the curve that may be
+           modified without affecting the original
+        """
+        return AdcCurve(self._array.astype(float))
+
+    # -------------------------------------------------------------------------
+    def to_list(self):
+        """Method to return the curve as a list of (CH0, CH1) tuples"""
+        return list(self)
+
+    # -------------------------------------------------------------------------
+    def rotations(self, points, distance=1):
+        """Method to calculate the rotation angle at each of the specified
+           points using rotations_at_points()
+        """
+        return rotations_at_points(self.ch0, self.ch1, points,
+                                   self.i_scale, distance)
+
+
+# SerialReader class
+#
+class SerialReader():
+    """Background reader for the serial link to the Arduino. A daemon
+       thread reads from the serial port, splits the input into
+       newline-terminated messages and appends them to a bounded ring
+       buffer. If the buffer is full, the oldest message is dropped
+       (and counted in dropped_msgs, see pop_dropped_msgs()). Messages
+       are retrieved with get(),
+       which blocks until a message is available or a wall-clock
+       timeout expires, or with poll(), which never blocks. Exceptions
+       raised while reading or decoding are buffered in order with the
+       messages and are re-raised by get() or poll().
+
+       As with the TextIOWrapper used when there is no reader thread,
+       the carriage return/newline line endings sent by the Arduino are
+       translated to a single newline.
+    """
+
+    # Initializer
+    def __init__(self, ser, max_msgs=SERIAL_READER_MAX_MSGS):
+        self.ser = ser
+        self.dropped_msgs = 0
+        self._msgs = collections.deque(maxlen=max_msgs)
+        self._msgs_cond = threading.Condition()
+        self._stop_request = threading.Event()
+        self._thread = None
+
+    # ---------------------------------
+    @property
+    def running(self):
+        """True if the reader thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    # ---------------------------------
+    @property
+    def msgs_waiting(self):
+        """Number of messages (and exceptions) waiting to be retrieved"""
+        with self._msgs_cond:
+            return len(self._msgs)
+
+    # -------------------------------------------------------------------------
+    def start(self):
+        """Method to start the reader thread (if it isn't already running)
+        """
+        if self.running:
+            return
+        self._stop_request.clear()
+        self._thread = threading.Thread(target=self.read_loop,
+                                        name="SerialReader", daemon=True)
+        self._thread.start()
+
+    # -------------------------------------------------------------------------
+    def stop(self):
+        """Method to stop the reader thread and discard any unread messages.
+           Returns once the thread has exited, which is within one serial
+           timeout.
+        """
+        self._stop_request.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._msgs_cond:
+            self._msgs.clear()
+
+    # -------------------------------------------------------------------------
+    def read_loop(self):
+        """Method run by the reader thread"""
+        partial_msg = b""
+        while not self._stop_request.is_set():
+            try:
+                data = self.ser.read(max(1, self.ser.in_waiting))
+            except serial.SerialException as e:
+                self.put(e)
+                return
+            if not data:
+                continue
+            lines = (partial_msg + data).split(b"\n")
+            partial_msg = lines.pop()
+            for line in lines:
+                if line.endswith(b"\r"):
+                    line = line[:-1]
+                try:
+                    self.put(line.decode() + "\n")
+                except UnicodeDecodeError as e:
+                    self.put(e)
+
+    # -------------------------------------------------------------------------
+    def put(self, msg):
+        """Method to append a message (or exception) to the ring buffer and
+           wake up a waiting get()
+        """
+        with self._msgs_cond:
+            if len(self._msgs) == self._msgs.maxlen:
+                self.dropped_msgs += 1
+            self._msgs.append(msg)
+            self._msgs_cond.notify()
+
+    # -------------------------------------------------------------------------
+    def get(self, timeout=None):
+        """Method to return the oldest message, waiting up to timeout seconds
+           (forever if None) for one to arrive. None is returned if the
+           timeout expires.
+        """
+        with self._msgs_cond:
+            if not self._msgs_cond.wait_for(lambda: self._msgs, timeout):
+                return None
+            msg = self._msgs.popleft()
+        if isinstance(msg, Exception):
+            raise msg
+        return msg
+
+    # -------------------------------------------------------------------------
+    def pop_dropped_msgs(self):
+        """Method to return the number of messages that have been dropped
+           since the previous call (or since the reader was created)
+        """
+        with self._msgs_cond:
+            dropped_msgs = self.dropped_msgs
+            self.dropped_msgs = 0
+        return dropped_msgs
+
+    # -------------------------------------------------------------------------
+    def poll(self):
+        """Method to return the oldest message if there is one, or None if
+           not. Never blocks.
+        """
+        return self.get(timeout=0)
+
+
 # Configuration class
 #
 class Configuration():
@@ -851,6 +1369,7 @@ class Configuration():
         estimate_temp = self.cfg.get(section, "estimate temp")
         use_avg_sensor_temp = self.cfg.get(section, "use avg sensor temp")
         cell_temp_adjust = self.cfg.get(section, "cell temp adjust")
+        use_parms_cache = self.cfg.get(section, "parms cache")
 
         # Read the old result's saved config
         self.get_old_result(cfg_file)
@@ -883,6 +1402,7 @@ class Configuration():
         self.cfg_set(section, "estimate temp", estimate_temp)
         self.cfg.set(section, "use avg sensor temp", use_avg_sensor_temp)
         self.cfg.set(section, "cell temp adjust", cell_temp_adjust)
+        self.cfg.set(section, "parms cache", use_parms_cache)
 
         # Apply plotting options to properties
         self.apply_plotting()
@@ -970,6 +1490,17 @@ class Configuration():
         args = (section, "x pixels", CFG_INT, self.ivs2.x_pixels)
         self.ivs2.x_pixels = self.apply_one(*args)
 
+        # Data point log level
+        option = "data point log level"
+        args = (section, option, CFG_INT, self.ivs2.data_point_log_level)
+        new_val = self.apply_one(*args)
+        if new_val not in set([DATA_POINT_LOG_NONE, DATA_POINT_LOG_ALL]):
+            err_str = f"{section} {option} invalid in cfg file"
+            self.ivs2.logger.print_and_log(err_str)
+            new_val = self.ivs2.data_point_log_level
+            self.cfg_set(section, option, new_val)
+        self.ivs2.data_point_log_level = new_val
+
     # -------------------------------------------------------------------------
     def apply_usb(self):
         """Method to apply the USB section options read from the .cfg
@@ -1013,6 +1544,20 @@ class Configuration():
         args = (section, "baud", CFG_INT, self.ivs2.usb_baud)
         self.ivs2.usb_baud = self.apply_one(*args)
 
+        # Max baud
+        args = (section, "max baud", CFG_INT, self.ivs2.usb_max_baud)
+        self.ivs2.usb_max_baud = self.apply_one(*args)
+
+        # Negotiated baud
+        args = (section, "negotiated baud", CFG_INT,
+                self.ivs2.usb_negotiated_baud)
+        self.ivs2.usb_negotiated_baud = self.apply_one(*args)
+
+        # Reader thread
+        args = (section, "reader thread", CFG_BOOLEAN,
+                self.ivs2.usb_reader_thread)
+        self.ivs2.usb_reader_thread = self.apply_one(*args)
+
     # -------------------------------------------------------------------------
     def apply_calibration(self):
         """Method to apply the Calibration section options read from the
@@ -1316,6 +1861,14 @@ class Configuration():
         if new_val != curr_val:
             self.ivs2.cell_temp_adjust = new_val
 
+        # Keep the PV model parameter cache in a file and use it to
+        # warm start the model
+        curr_val = self.ivs2.use_parms_cache
+        args = (section, "parms cache", CFG_BOOLEAN, curr_val)
+        new_val = self.apply_one(*args)
+        if new_val != curr_val:
+            self.ivs2.use_parms_cache = new_val
+
     # -------------------------------------------------------------------------
     def save(self, copy_dir=None):
         """Method to save preferences and other configuration to the
@@ -1395,12 +1948,18 @@ class Configuration():
         section = "General"
         self.cfg.add_section(section)
         self.cfg_set(section, "x pixels", self.ivs2.x_pixels)
+        self.cfg_set(section, "data point log level",
+                     self.ivs2.data_point_log_level)
 
         # USB port config
         section = "USB"
         self.cfg.add_section(section)
         self.cfg_set(section, "port", self.ivs2.usb_port)
         self.cfg_set(section, "baud", self.ivs2.usb_baud)
+        self.cfg_set(section, "max baud", self.ivs2.usb_max_baud)
+        self.cfg_set(section, "negotiated baud",
+                     self.ivs2.usb_negotiated_baud)
+        self.cfg_set(section, "reader thread", self.ivs2.usb_reader_thread)
 
         # Calibration
         section = "Calibration"
@@ -1476,6 +2035,7 @@ class Configuration():
         self.cfg_set(section, "use avg sensor temp",
                      self.ivs2.use_avg_sensor_temp)
         self.cfg_set(section, "cell temp adjust", self.ivs2.cell_temp_adjust)
+        self.cfg_set(section, "parms cache", self.ivs2.use_parms_cache)
 
     # -------------------------------------------------------------------------
     def add_axes_and_title(self):
@@ -1512,17 +2072,407 @@ class Configuration():
 # The (extended) PrintAndLog class
 #
 class PrintAndLog(IV_Swinger.PrintAndLog):
-    """Provides printing and logging methods (extended from IV_Swinger)"""
+    """Provides printing and logging methods (extended from IV_Swinger)
+
+       If buffered is True, the log lines are queued and written to the
+       log file by a background thread, either every flush_interval
+       seconds or as soon as max_buffer_lines lines are waiting. The
+       file format is the same as for the unbuffered logger. The queue
+       is flushed by terminate_log(), by flush() and at program exit
+       (including exit due to an uncaught exception).
+    """
+    # pylint: disable=too-many-instance-attributes
 
-    def __init__(self):
+    def __init__(self, buffered=LOG_BUFFERED_DEFAULT,
+                 flush_interval=LOG_FLUSH_INTERVAL_DEFAULT,
+                 max_buffer_lines=LOG_MAX_BUFFER_LINES_DEFAULT):
         super().__init__()
         # Set instance variable to class variable value
         self.log_file_name = self.log_file_name
+        self.buffered = buffered
+        self.flush_interval = flush_interval
+        self.max_buffer_lines = max_buffer_lines
+        self._log_queue = queue.Queue()
+        self._write_lock = threading.Lock()
+        self._flush_request = threading.Event()
+        self._writer_thread = None
+        # Flush the queue when this object is freed or at program exit,
+        # whichever comes first (without keeping the object alive)
+        weakref.finalize(self, self.flush_queue, self._log_queue,
+                         self._write_lock)
+
+    def log(self, print_str):
+        """Print to the log file only"""
+        if not self.buffered:
+            super().log(print_str)
+            return
+        date_time_str = IV_Swinger.DateTimeStr.get_date_time_str()
+        self.enqueue(f"\n{date_time_str}: {print_str}")
+
+    def log_lines(self, print_strs):
+        """Print multiple lines to the log file only (all lines get the same
+           timestamp)
+        """
+        if not self.buffered:
+            super().log_lines(print_strs)
+            return
+        date_time_str = IV_Swinger.DateTimeStr.get_date_time_str()
+        self.enqueue("".join(f"\n{date_time_str}: {print_str}"
+                             for print_str in print_strs))
+
+    def enqueue(self, log_str):
+        """Add a string to the queue to be written to the log file by the
+           background writer thread, starting the thread if necessary
+        """
+        self._log_queue.put((self.log_file_name, log_str))
+        if self._writer_thread is None:
+            self._writer_thread = threading.Thread(
+                target=self.writer,
+                args=(weakref.ref(self), self._flush_request,
+                      self.flush_interval),
+                name="log_writer", daemon=True)
+            self._writer_thread.start()
+        if self._log_queue.qsize() >= self.max_buffer_lines:
+            self._flush_request.set()
+
+    @staticmethod
+    def writer(logger_ref, flush_request, flush_interval):
+        """Background thread that flushes the queue periodically or when it
+           is requested. The thread only holds a weak reference to the
+           logger, and it exits when the logger is freed.
+        """
+        while True:
+            flush_request.wait(flush_interval)
+            flush_request.clear()
+            logger = logger_ref()
+            if logger is None:
+                return
+            logger.flush()
+            del logger
+
+    def flush(self):
+        """Write all queued strings to the log file(s)"""
+        self.flush_queue(self._log_queue, self._write_lock)
+
+    @staticmethod
+    def flush_queue(log_queue, write_lock):
+        """Write all strings in a logger's queue to the log file(s).
+           Consecutive strings for the same file are written with a
+           single write.
+        """
+        with write_lock:
+            log_file_name = None
+            log_strs = []
+            while True:
+                try:
+                    file_name, log_str = log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if file_name != log_file_name and log_strs:
+                    PrintAndLog.write_log_strs(log_file_name, log_strs)
+                    log_strs = []
+                log_file_name = file_name
+                log_strs.append(log_str)
+            if log_strs:
+                PrintAndLog.write_log_strs(log_file_name, log_strs)
+
+    @staticmethod
+    def write_log_strs(log_file_name, log_strs):
+        """Append the strings to the log file with a single write"""
+        try:
+            with open(log_file_name, "a", encoding="utf-8") as f:
+                f.write("".join(log_strs))
+        except OSError:
+            print(f"ERROR: could not write to {log_file_name}")
 
     def terminate_log(self):
         """Add newline to end of log file"""
-        with open(self.log_file_name, "a", encoding="utf-8") as f:
-            f.write("\n")
+        if not self.buffered:
+            with open(self.log_file_name, "a", encoding="utf-8") as f:
+                f.write("\n")
+            return
+        self.enqueue("\n")
+        self.flush()
+
+
+# Pool worker class
+#
+class PoolWorker():
+    """Base class for the objects that process the items of a command line
+       tool in the worker processes of run_in_worker_pool(). One object
+       is created per worker process, and its logger is shared by all
+       of the items processed by that worker. Subclasses implement the
+       process_item() and failure_result() methods.
+    """
+    # Class variable: the object for this worker process
+    worker = None
+
+    # Description of the processing, for error messages
+    action_str = "Processing"
+
+    # Initializer
+    def __init__(self, app_data_dir=None):
+        self.app_data_dir = app_data_dir
+        self.logger = IV_Swinger2(app_data_dir).logger
+
+    # -------------------------------------------------------------------------
+    def process(self, item):
+        """Method to process one item and return its result. An unexpected
+           exception is logged and the failure_result() is returned.
+        """
+        try:
+            result = self.process_item(item)
+        except Exception:  # pylint: disable=broad-exception-caught
+            err_str = (f"ERROR: {self.action_str} {item} failed with "
+                       f"exception:\n{traceback.format_exc()}")
+            self.logger.print_and_log(err_str)
+            result = self.failure_result(item)
+        self.logger.flush()
+
+        return result
+
+    # -------------------------------------------------------------------------
+    def process_item(self, item):
+        """Method to do the work of processing one item and return its
+           result
+        """
+        raise NotImplementedError
+
+    # -------------------------------------------------------------------------
+    def failure_result(self, item):
+        """Method to return the result for an item whose processing raised
+           an exception
+        """
+        raise NotImplementedError
+
+
+# Results index class
+#
+class ResultsIndex():
+    """Persistent index of the run directories in one or more results
+       folders. The index is an SQLite database that caches the
+       information about each run that is needed to populate the
+       Results Wizard tree (title and whether it has a saved config),
+       along with the Isc, Voc and MPP values from the data point CSV
+       file and the sensor values from the run_info file. This avoids
+       listing every run directory and parsing every run's .cfg file
+       each time the Results Wizard is opened.
+
+       The entries returned by get_runs() are Entry namedtuples. The
+       values that are not available for a run are None, and the
+       temps value is the JSON-encoded dict of temperature sensor
+       values.
+
+       Each entry is keyed by the results folder and the run's
+       date/time string, and it is invalidated when the modification
+       time of the run directory or of any of the files it is derived
+       from changes. Entries for run directories that no longer exist
+       are removed.
+
+       If the database cannot be opened (e.g. a read-only folder), an
+       in-memory database is used instead, so the index still works,
+       but nothing is cached between sessions.
+    """
+    # Columns of the runs table (other than the key columns)
+    ENTRY_FIELDS = ("dts", "title", "has_cfg", "isc_amps", "voc_volts",
+                    "mpp_amps", "mpp_volts", "irradiance", "temps")
+    Entry = collections.namedtuple("Entry", ENTRY_FIELDS)
+
+    # Initializer
+    def __init__(self, index_filename, file_prefix="iv_swinger2_",
+                 logger=None):
+        self.index_filename = index_filename
+        self.file_prefix = file_prefix
+        self.logger = logger
+        self._conn = None
+
+    # ---------------------------------
+    @property
+    def conn(self):
+        """SQLite connection to the index database. The database and its
+           table are created if they don't already exist.
+        """
+        if self._conn is None:
+            try:
+                self._conn = self.connect(self.index_filename)
+            except sqlite3.Error:
+                self._conn = self.connect(":memory:")
+        return self._conn
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def connect(index_filename):
+        """Method to open the index database and create the runs table if
+           it doesn't already exist
+        """
+        conn = sqlite3.connect(index_filename)
+        try:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS runs ("
+                             "results_dir TEXT NOT NULL, "
+                             "dts TEXT NOT NULL, "
+                             "mtime_ns INTEGER NOT NULL, "
+                             "is_empty INTEGER NOT NULL, "
+                             "title TEXT, "
+                             "has_cfg INTEGER NOT NULL, "
+                             "isc_amps REAL, "
+                             "voc_volts REAL, "
+                             "mpp_amps REAL, "
+                             "mpp_volts REAL, "
+                             "irradiance INTEGER, "
+                             "temps TEXT, "
+                             "PRIMARY KEY (results_dir, dts))")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    # -------------------------------------------------------------------------
+    def close(self):
+        """Method to close the index database"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # -------------------------------------------------------------------------
+    def get_run_files(self, run_dir, dts):
+        """Method to return a tuple with the names of the files in a run
+           directory that the index entry is derived from: the .cfg
+           file, the data point CSV file and the run_info file
+        """
+        cfg_file = os.path.join(run_dir, f"{APP_NAME}.cfg")
+        csv_file = os.path.join(run_dir, f"{self.file_prefix}{dts}.csv")
+        return (cfg_file, csv_file, get_run_info_filename(run_dir))
+
+    # -------------------------------------------------------------------------
+    def get_mtime_ns(self, run_dir, dts, dir_mtime_ns):
+        """Method to return the latest modification time of the run
+           directory and the files that the index entry is derived
+           from. Files that are rewritten in place (e.g. the .cfg file
+           when the title is changed) do not change the modification
+           time of the directory, so they are checked individually.
+        """
+        mtime_ns = dir_mtime_ns
+        for filename in self.get_run_files(run_dir, dts):
+            try:
+                mtime_ns = max(mtime_ns, os.stat(filename).st_mtime_ns)
+            except OSError:
+                pass
+        return mtime_ns
+
+    # -------------------------------------------------------------------------
+    def build_entry(self, run_dir, dts):
+        """Method to build the index entry for one run directory by reading
+           its files
+        """
+        (cfg_file, csv_file, run_info_file) = self.get_run_files(run_dir,
+                                                                 dts)
+        # Title from the saved config
+        title = None
+        has_cfg = Path(cfg_file).exists()
+        if has_cfg:
+            title = get_saved_title(cfg_file)
+
+        # Isc, Voc and MPP from the data point CSV
+        (isc_amps, voc_volts,
+         mpp_amps, mpp_volts) = self.get_csv_isc_voc_mpp(csv_file)
+
+        # Sensor values from the run_info file
+        irrad, temps_dict = get_sensor_values_from_file(run_info_file)
+        temps = json.dumps(temps_dict) if temps_dict else None
+
+        return self.Entry(dts, title, has_cfg, isc_amps, voc_volts,
+                          mpp_amps, mpp_volts, irrad, temps)
+
+    # -------------------------------------------------------------------------
+    def get_csv_isc_voc_mpp(self, csv_file):
+        """Method to return a tuple containing the Isc amps, Voc volts, MPP
+           amps and MPP volts of the (measured) data points in a data
+           point CSV file. The values are None if the file doesn't
+           exist or can't be parsed.
+        """
+        if Path(csv_file).exists():
+            csv_parser = IV_Swinger_plotter.CsvParser(csv_file, self.logger)
+            try:
+                data_points = csv_parser.data_points
+            except (ValueError, IndexError, OSError) as e:
+                err_str = f"ERROR: Cannot parse {csv_file}: ({e})"
+                if self.logger is not None:
+                    self.logger.log(err_str)
+                return (None, None, None, None)
+            if data_points:
+                mpp = max(data_points, key=lambda dp: dp[WATTS_INDEX])
+                return (data_points[0][AMPS_INDEX],
+                        data_points[-1][VOLTS_INDEX],
+                        mpp[AMPS_INDEX], mpp[VOLTS_INDEX])
+        return (None, None, None, None)
+
+    # -------------------------------------------------------------------------
+    def get_runs(self, results_dir):
+        """Method to return a list of the index entries for the (non-empty)
+           run directories in the specified results folder, newest
+           first. The index is brought up to date first: entries for new
+           or modified run directories are (re)built and entries for run
+           directories that have been removed are deleted.
+        """
+        # pylint: disable=too-many-locals
+        results_dir = os.path.abspath(results_dir)
+        fields = ", ".join(self.ENTRY_FIELDS)
+        cached = {}
+        for row in self.conn.execute(f"SELECT mtime_ns, is_empty, {fields} "
+                                     f"FROM runs WHERE results_dir = ?",
+                                     (results_dir,)):
+            cached[row[2]] = row
+
+        runs = []
+        new_rows = []
+        with os.scandir(results_dir) as dir_entries:
+            run_dir_entries = [entry for entry in dir_entries
+                               if is_date_time_str(entry.name)]
+        for dir_entry in sorted(run_dir_entries, key=lambda e: e.name,
+                                reverse=True):
+            dts = dir_entry.name
+            try:
+                if not dir_entry.is_dir():
+                    continue
+                dir_mtime_ns = dir_entry.stat().st_mtime_ns
+            except OSError:
+                continue
+            mtime_ns = self.get_mtime_ns(dir_entry.path, dts, dir_mtime_ns)
+            row = cached.pop(dts, None)
+            if row is not None and row[0] == mtime_ns:
+                if not row[1]:
+                    runs.append(self.Entry(*row[2:]))
+                continue
+
+            # New or modified run directory
+            try:
+                is_empty = not os.listdir(dir_entry.path)
+            except PermissionError:
+                is_empty = True
+            if is_empty:
+                entry = self.Entry(dts, None, False, None, None, None, None,
+                                   None, None)
+            else:
+                entry = self.build_entry(dir_entry.path, dts)
+                runs.append(entry)
+            new_rows.append((results_dir, mtime_ns, is_empty) + entry)
+
+        # Update the database. A failure (e.g. a read-only database) is
+        # not fatal; the entries are just rebuilt next time.
+        placeholders = ", ".join(["?"] * (len(self.ENTRY_FIELDS) + 3))
+        try:
+            with self.conn:
+                self.conn.executemany(f"INSERT OR REPLACE INTO runs "
+                                      f"(results_dir, mtime_ns, is_empty, "
+                                      f"{fields}) VALUES ({placeholders})",
+                                      new_rows)
+                self.conn.executemany("DELETE FROM runs "
+                                      "WHERE results_dir = ? AND dts = ?",
+                                      [(results_dir, dts) for dts in cached])
+        except sqlite3.Error:
+            pass
+        return runs
 
 
 # IV Swinger2 plotter class
@@ -1539,9 +2489,13 @@ class IV_Swinger2_plotter(IV_Swinger_plotter.IV_Swinger_plotter):
         self._plot_dir = None
         self._args = None
         self._current_img = None
+        self._current_img_data = None
         self._x_pixels = None
         self._generate_pdf = True
         self._generate_gif = True
+        self._save_gif = True
+        self._render_in_memory = RENDER_IN_MEMORY_DEFAULT
+        self._draw_once = DRAW_ONCE_DEFAULT
         self._curve_names = None
         self._title = None
         self._fancy_labels = True
@@ -1559,6 +2513,7 @@ class IV_Swinger2_plotter(IV_Swinger_plotter.IV_Swinger_plotter):
         self._point_scale = POINT_SCALE_DEFAULT
         self._v_sat = None
         self._i_sat = None
+        self._reuse_figure = REUSE_FIGURE_DEFAULT
         self._logger = None
         self._ivsp_ivse = None
 
@@ -1607,6 +2562,17 @@ class IV_Swinger2_plotter(IV_Swinger_plotter.IV_Swinger_plotter):
     def current_img(self, value):
         self._current_img = value
 
+    # ---------------------------------
+    @property
+    def current_img_data(self):
+        """Contents (bytes) of the current GIF
+        """
+        return self._current_img_data
+
+    @current_img_data.setter
+    def current_img_data(self, value):
+        self._current_img_data = value
+
     # ---------------------------------
     @property
     def x_pixels(self):
@@ -1644,6 +2610,51 @@ class IV_Swinger2_plotter(IV_Swinger_plotter.IV_Swinger_plotter):
             raise ValueError("generate_gif must be boolean")
         self._generate_gif = value
 
+    # ---------------------------------
+    @property
+    def save_gif(self):
+        """Value of the save GIF flag. If False, the GIF is only available
+           in memory (current_img_data) and current_img is None.
+        """
+        return self._save_gif
+
+    @save_gif.setter
+    def save_gif(self, value):
+        if value not in set([True, False]):
+            raise ValueError("save_gif must be boolean")
+        self._save_gif = value
+
+    # ---------------------------------
+    @property
+    def render_in_memory(self):
+        """Value of the render in memory flag. If True, the graph is
+           rendered to an in-memory RGBA buffer and converted to a GIF
+           in memory. Otherwise, it is rendered to a PNG file, which is
+           then converted to the GIF.
+        """
+        return self._render_in_memory
+
+    @render_in_memory.setter
+    def render_in_memory(self, value):
+        if value not in set([True, False]):
+            raise ValueError("render_in_memory must be boolean")
+        self._render_in_memory = value
+
+    # ---------------------------------
+    @property
+    def draw_once(self):
+        """Value of the draw once flag. If True and both the PDF and the
+           GIF are generated, the figure is drawn once and printed to
+           both, rather than being drawn separately for each.
+        """
+        return self._draw_once
+
+    @draw_once.setter
+    def draw_once(self, value):
+        if value not in set([True, False]):
+            raise ValueError("draw_once must be boolean")
+        self._draw_once = value
+
     # ---------------------------------
     @property
     def curve_names(self):
@@ -1672,6 +2683,22 @@ class IV_Swinger2_plotter(IV_Swinger_plotter.IV_Swinger_plotter):
     def title(self, value):
         self._title = value
 
+    # ---------------------------------
+    @property
+    def reuse_figure(self):
+        """Value of the reuse figure flag. If True, the pyplot figure is
+           kept between plots of single curves with the same layout and
+           only the data, labels and ranges are updated (see
+           IV_Swinger.plot_with_pyplot_reusing_figure()).
+        """
+        return self._reuse_figure
+
+    @reuse_figure.setter
+    def reuse_figure(self, value):
+        if value not in set([True, False]):
+            raise ValueError("reuse_figure must be boolean")
+        self._reuse_figure = value
+
     # ---------------------------------
     @property
     def fancy_labels(self):
@@ -1903,6 +2930,9 @@ class IV_Swinger2_plotter(IV_Swinger_plotter.IV_Swinger_plotter):
         self.args.plot_power = self.plot_power
         self.args.plot_ref = self.plot_ref
         self.args.recalc_isc = False
+        self.args.analytic_mpp = False
+        self.args.jobs = 1
+        self.args.output_dir = self.plot_dir
         self.args.use_gnuplot = False
         self.args.gif = False
         self.args.png = False
@@ -1927,11 +2957,16 @@ class IV_Swinger2_plotter(IV_Swinger_plotter.IV_Swinger_plotter):
         ivs.plot_graphs(self.args, csvp)
 
     # -------------------------------------------------------------------------
-    def plot_graphs_to_gif(self, ivs, csvp):
-        """Method to plot the graphs to a GIF"""
+    def plot_graphs_to_gif(self, ivs, csvp, with_pdf=False):
+        """Method to plot the graphs to a GIF. If with_pdf is True, the PDF
+           is printed from the same figure.
+        """
 
         # Pyplot cannot generate GIFs on Windows, so we generate a PNG
         # and then convert it to GIF with PIL (regardless of platform).
+        # If the render_in_memory property is True, the PNG is never
+        # written to a file. Instead, the graph is rendered to an RGBA
+        # buffer, which is converted to the GIF in memory.
         #
         # Before calling the plot_graphs() method, we have to adjust the
         # scale parameters and the DPI value based on the value of the
@@ -1942,13 +2977,31 @@ class IV_Swinger2_plotter(IV_Swinger_plotter.IV_Swinger_plotter):
         default_dpi = 100.0
         default_x_pixels = 1100.0
         ivs.plot_dpi = default_dpi * (self.x_pixels/default_x_pixels)
-        ivs.plot_graphs(self.args, csvp)
-        png_file = ivs.plt_img_filename
-        (filename, _) = os.path.splitext(png_file)
-        gif_file = f"{filename}.gif"
-        im = Image.open(png_file)
-        im.save(gif_file)
-        self.current_img = gif_file
+        ivs.render_to_memory = self.render_in_memory
+        if with_pdf:
+            ivs.extra_img_outputs = [(".pdf", PDF_DPI)]
+        try:
+            ivs.plot_graphs(self.args, csvp)
+        finally:
+            ivs.render_to_memory = False
+            ivs.extra_img_outputs = []
+        if self.render_in_memory:
+            im = Image.frombuffer("RGBA", ivs.rgba_img_size,
+                                  ivs.rgba_img_data, "raw", "RGBA", 0, 1)
+        else:
+            im = Image.open(ivs.plt_img_filename)
+        with io.BytesIO() as gif_buf:
+            im.save(gif_buf, format="GIF")
+            self.current_img_data = gif_buf.getvalue()
+
+        # Write the GIF file (unless it is only wanted in memory)
+        self.current_img = None
+        if self.save_gif:
+            (filename, _) = os.path.splitext(ivs.plt_img_filename)
+            gif_file = f"{filename}.gif"
+            with open(gif_file, "wb") as f:
+                f.write(self.current_img_data)
+            self.current_img = gif_file
 
     # -------------------------------------------------------------------------
     def add_sensor_info_to_curve_names(self):
@@ -2000,15 +3053,13 @@ class IV_Swinger2_plotter(IV_Swinger_plotter.IV_Swinger_plotter):
         self.args = argparse.Namespace()
         self.set_default_args()
 
-        # Change to plot directory so files will be created there
-        os.chdir(self.plot_dir)
-
         # Create IV Swinger object (as extended in IV_Swinger_plotter)
         self.ivsp_ivse = IV_Swinger_plotter.IV_Swinger_extended()
         IV_Swinger_plotter.set_ivs_properties(self.args, self.ivsp_ivse)
         self.ivsp_ivse.logger = self.logger
         self.ivsp_ivse.v_sat = self.v_sat
         self.ivsp_ivse.i_sat = self.i_sat
+        self.ivsp_ivse.reuse_figure = self.reuse_figure
 
         # Make sure CSV files exist
         for csv_file in self.csv_files:
@@ -2020,13 +3071,18 @@ class IV_Swinger2_plotter(IV_Swinger_plotter.IV_Swinger_plotter):
                                                             self.csv_files,
                                                             self.ivsp_ivse,
                                                             logger=self.logger)
-        # Plot graphs to PDF
-        if self.generate_pdf:
-            self.plot_graphs_to_pdf(self.ivsp_ivse, self.csv_proc)
+        if self.generate_pdf and self.generate_gif and self.draw_once:
+            # Plot graphs to GIF and PDF from the same figure
+            self.plot_graphs_to_gif(self.ivsp_ivse, self.csv_proc,
+                                    with_pdf=True)
+        else:
+            # Plot graphs to PDF
+            if self.generate_pdf:
+                self.plot_graphs_to_pdf(self.ivsp_ivse, self.csv_proc)
 
-        # Plot graphs to GIF
-        if self.generate_gif:
-            self.plot_graphs_to_gif(self.ivsp_ivse, self.csv_proc)
+            # Plot graphs to GIF
+            if self.generate_gif:
+                self.plot_graphs_to_gif(self.ivsp_ivse, self.csv_proc)
 
         # Capture max_x and max_y for locking feature
         self.max_x = self.ivsp_ivse.plot_max_x
@@ -2064,7 +3120,10 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self.pv_model = IV_Swinger2_PV_model()
         self.pv_model.debug = False
         self.prev_swing_time = time.time()
+        self.prev_est_cell_temp_c = None
+        self.warm_start_estimate = False
         self.eeprom_rewrite_needed = False
+        self.dropped_arduino_msgs = 0
         self.usb_ports_in_use = []
         if usb_ports_in_use is not None:
             self.usb_ports_in_use = usb_ports_in_use
@@ -2075,9 +3134,13 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self._serial_ports = []
         self._usb_port = None
         self._usb_baud = 57600
+        self._usb_max_baud = USB_MAX_BAUD_DEFAULT
+        self._usb_negotiated_baud = None
         self._serial_timeout = 0.1
         self._ser = None
         self._sio = None
+        self._usb_reader_thread = USB_READER_THREAD_DEFAULT
+        self._serial_reader = None
         self._arduino_ready = False
         self._data_points = []
         self._unfiltered_adc_pairs = []
@@ -2118,11 +3181,15 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self._photodiode_deg_c = None
         self._scaled_photodiode_millivolts = 0.0
         self._relay_active_high = RELAY_ACTIVE_HIGH_DEFAULT
+        self._binary_xfer = BINARY_XFER_DEFAULT
         self._plot_title = None
         self._current_img = None
+        self._current_img_data = None
         self._x_pixels = 770  # Default GIF width (770x595)
         self._plot_lock_axis_ranges = False
         self._generate_pdf = True
+        self._save_gif = True
+        self._render_in_memory = RENDER_IN_MEMORY_DEFAULT
         self._fancy_labels = True
         self._linear = True
         self._plot_power = False
@@ -2131,11 +3198,18 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self._font_scale = FONT_SCALE_DEFAULT
         self._line_scale = LINE_SCALE_DEFAULT
         self._point_scale = POINT_SCALE_DEFAULT
+        self._reuse_figure = REUSE_FIGURE_DEFAULT
         self._correct_adc = True
         self._fix_isc = True
         self._fix_voc = True
         self._comb_dupv_pts = True
         self._reduce_noise = True
+        self._vectorized_nr = VECTORIZED_NR_DEFAULT
+        self._data_point_log_level = DATA_POINT_LOG_LEVEL_DEFAULT
+        self._pipelined = PIPELINED_DEFAULT
+        self._pipeline_workers = PIPELINE_WORKERS_DEFAULT
+        self._pipeline_executor = None
+        self._pipeline_futures = collections.deque()
         self._fix_overshoot = True
         self._battery_bias = False
         self._series_res_comp = SERIES_RES_COMP_DEFAULT
@@ -2164,6 +3238,7 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self._estimate_temp = ESTIMATE_TEMP_DEFAULT
         self._use_avg_sensor_temp = USE_AVG_SENSOR_TEMP_DEFAULT
         self._cell_temp_adjust = CELL_TEMP_ADJUST_DEFAULT
+        self._use_parms_cache = USE_PARMS_CACHE_DEFAULT
         self._irrad_estimated = False
         self._cell_temp_estimated = False
         self._use_curr_pv_model_props = False
@@ -2472,6 +3547,23 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
             warn_str = "WARNING: Setting relay_active_high to True"
             self.logger.print_and_log(warn_str)
 
+    # ---------------------------------
+    @property
+    def binary_xfer(self):
+        """Property to get flag that indicates if the Arduino should send the
+           ADC pairs in a binary block rather than as text. This has no
+           effect with sketch versions that do not support it.
+        """
+        return self._binary_xfer
+
+    @binary_xfer.setter
+    def binary_xfer(self, value):
+        if value not in set([True, False]):
+            raise ValueError("binary_xfer must be boolean")
+        if self._binary_xfer != value:
+            self._binary_xfer = value
+            self.arduino_has_config["BINARY_XFER"] = False
+
     # ---------------------------------
     @property
     def dyn_bias_cal(self):
@@ -2587,6 +3679,59 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
     def usb_baud(self, value):
         self._usb_baud = value
 
+    # ---------------------------------
+    @property
+    def usb_max_baud(self):
+        """Property to get the maximum baud rate that will be proposed to
+           the Arduino when negotiating a higher rate. Negotiation is
+           disabled if this is not greater than usb_baud.
+        """
+        return self._usb_max_baud
+
+    @usb_max_baud.setter
+    def usb_max_baud(self, value):
+        self._usb_max_baud = value
+
+    # ---------------------------------
+    @property
+    def usb_negotiated_baud(self):
+        """Property to get the baud rate that was chosen by the last baud
+           rate negotiation (None if there has not been one). If this is
+           not greater than usb_baud, no higher rate worked, and no
+           negotiation is attempted (removing the "negotiated baud"
+           config option forces a new one).
+        """
+        return self._usb_negotiated_baud
+
+    @usb_negotiated_baud.setter
+    def usb_negotiated_baud(self, value):
+        self._usb_negotiated_baud = value
+
+    # ---------------------------------
+    @property
+    def usb_reader_thread(self):
+        """Property to get the flag that controls whether messages from the
+           Arduino are read by a background SerialReader thread rather
+           than by polling the serial port. Takes effect the next time
+           the Arduino is reset.
+        """
+        return self._usb_reader_thread
+
+    @usb_reader_thread.setter
+    def usb_reader_thread(self, value):
+        if value not in set([True, False]):
+            raise ValueError("usb_reader_thread must be boolean")
+        self._usb_reader_thread = value
+
+    # ---------------------------------
+    @property
+    def serial_reader(self):
+        """Property to get the SerialReader object (None if there is no
+           reader thread). Its poll() method may be used to check for a
+           message without blocking.
+        """
+        return self._serial_reader
+
     # ---------------------------------
     @property
     def serial_timeout(self):
@@ -2632,6 +3777,17 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
     def current_img(self, value):
         self._current_img = value
 
+    # ---------------------------------
+    @property
+    def current_img_data(self):
+        """Contents (bytes) of the current GIF
+        """
+        return self._current_img_data
+
+    @current_img_data.setter
+    def current_img_data(self, value):
+        self._current_img_data = value
+
     # ---------------------------------
     @property
     def x_pixels(self):
@@ -2669,6 +3825,52 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
             raise ValueError("generate_pdf must be boolean")
         self._generate_pdf = value
 
+    # ---------------------------------
+    @property
+    def save_gif(self):
+        """Value of the save GIF flag. If False, the GIF is only available
+           in memory (current_img_data) and current_img is None.
+        """
+        return self._save_gif
+
+    @save_gif.setter
+    def save_gif(self, value):
+        if value not in set([True, False]):
+            raise ValueError("save_gif must be boolean")
+        self._save_gif = value
+
+    # ---------------------------------
+    @property
+    def render_in_memory(self):
+        """Value of the render in memory flag. If True, the graph is
+           rendered to an in-memory RGBA buffer and converted to a GIF
+           in memory. Otherwise, it is rendered to a PNG file, which is
+           then converted to the GIF.
+        """
+        return self._render_in_memory
+
+    @render_in_memory.setter
+    def render_in_memory(self, value):
+        if value not in set([True, False]):
+            raise ValueError("render_in_memory must be boolean")
+        self._render_in_memory = value
+
+    # ---------------------------------
+    @property
+    def reuse_figure(self):
+        """Value of the reuse figure flag. If True, the pyplot figure is
+           kept between plots of single curves with the same layout and
+           only the data, labels and ranges are updated (see
+           IV_Swinger.plot_with_pyplot_reusing_figure()).
+        """
+        return self._reuse_figure
+
+    @reuse_figure.setter
+    def reuse_figure(self, value):
+        if value not in set([True, False]):
+            raise ValueError("reuse_figure must be boolean")
+        self._reuse_figure = value
+
     # ---------------------------------
     @property
     def fancy_labels(self):
@@ -2830,6 +4032,81 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
             raise ValueError("reduce_noise must be boolean")
         self._reduce_noise = value
 
+    # ---------------------------------
+    @property
+    def vectorized_nr(self):
+        """Value of the vectorized_nr flag. If True, the NumPy
+           implementation of the noise reduction algorithm
+           (noise_reduction_vectorized) is used. If False, the original
+           list-of-tuples implementation (noise_reduction) is used. The
+           results are the same.
+        """
+        return self._vectorized_nr
+
+    @vectorized_nr.setter
+    def vectorized_nr(self, value):
+        if value not in set([True, False]):
+            raise ValueError("vectorized_nr must be boolean")
+        self._vectorized_nr = value
+
+    # ---------------------------------
+    @property
+    def data_point_log_level(self):
+        """Level of logging of the data points by convert_adc_values(). If
+           DATA_POINT_LOG_ALL, the V, I, P and R values of every point
+           are written to the log file in a single block. If
+           DATA_POINT_LOG_NONE, they are not logged. It is saved in the
+           "data point log level" option of the General section of the
+           config.
+        """
+        return self._data_point_log_level
+
+    @data_point_log_level.setter
+    def data_point_log_level(self, value):
+        if value not in set([DATA_POINT_LOG_NONE, DATA_POINT_LOG_ALL]):
+            raise ValueError(f"data_point_log_level must be either "
+                             f"{DATA_POINT_LOG_NONE} or {DATA_POINT_LOG_ALL}")
+        self._data_point_log_level = value
+
+    # ---------------------------------
+    @property
+    def pipelined(self):
+        """Value of the pipelined flag. If True, swing_curve() returns as
+           soon as the ADC values have been received and written to the
+           CSV file(s). The processing and plotting are done by a
+           worker thread (see submit_to_pipeline()).
+        """
+        return self._pipelined
+
+    @pipelined.setter
+    def pipelined(self, value):
+        if value not in set([True, False]):
+            raise ValueError("pipelined must be boolean")
+        self._pipelined = value
+
+    # ---------------------------------
+    @property
+    def pipeline_workers(self):
+        """Number of worker threads used in pipelined mode. Takes effect
+           the next time the pipeline is started.
+        """
+        return self._pipeline_workers
+
+    @pipeline_workers.setter
+    def pipeline_workers(self, value):
+        if value < 1:
+            raise ValueError("pipeline_workers must be at least 1")
+        self._pipeline_workers = value
+
+    # ---------------------------------
+    @property
+    def pipeline_pending(self):
+        """Number of pipelined runs whose results have not been retrieved
+           yet (see get_pipeline_results()), whether they have finished
+           or not
+        """
+        return len(self._pipeline_futures)
+
     # ---------------------------------
     @property
     def fix_overshoot(self):
@@ -3012,6 +4289,23 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
     def cell_temp_adjust(self, value):
         self._cell_temp_adjust = value
 
+    # ---------------------------------
+    @property
+    def use_parms_cache(self):
+        """Value of the use_parms_cache flag. If True, the PV model's
+           parameter solutions are cached in a file in the app data
+           folder, and the cached solutions are used to warm start the
+           model. This is faster, but the results then depend (very
+           slightly) on the order in which the curves were processed.
+        """
+        return self._use_parms_cache
+
+    @use_parms_cache.setter
+    def use_parms_cache(self, value):
+        if value not in set([True, False]):
+            raise ValueError("use_parms_cache must be boolean")
+        self._use_parms_cache = value
+
     # ---------------------------------
     @property
     def irrad_estimated(self):
@@ -3311,6 +4605,22 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         """
         return self.arduino_sketch_ver_ge("1.4.2")
 
+    # ---------------------------------
+    @property
+    def arduino_sketch_supports_binary_xfer(self):
+        """True for Arduino sketch versions that have code to support
+           sending the ADC pairs in a binary block.
+        """
+        return self.arduino_sketch_ver_ge("1.5.0")
+
+    # ---------------------------------
+    @property
+    def arduino_sketch_supports_baud_change(self):
+        """True for Arduino sketch versions that have code to support
+           changing the baud rate.
+        """
+        return self.arduino_sketch_ver_ge("1.5.1")
+
     # ---------------------------------
     @property
     def pdf_filename(self):
@@ -3396,19 +4706,27 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         """Method to identify the serial port connected to the Arduino
         """
 
-        # If one of the serial ports has "uino" (Arduino, Genuino, etc.)
-        # in the description or manufacturer field, choose that
-        # one. Note that this will choose the first one if more than one
-        # Arduino is connected.
+        # Choose the first port that looks like an Arduino
         if self.usb_port is None:
-            for serial_port in self.serial_ports:
-                device = serial_port.device
-                description = serial_port.description
-                manufacturer = serial_port.manufacturer
-                if ((description is not None and "uino" in description) or
-                        (manufacturer is not None and "uino" in manufacturer)):
-                    self.usb_port = device
-                    break
+            arduino_ports = self.find_arduino_ports()
+            if arduino_ports:
+                self.usb_port = arduino_ports[0]
+
+    # -------------------------------------------------------------------------
+    def find_arduino_ports(self):
+        """Method to return a list of all of the serial ports that appear to
+           be connected to an Arduino
+        """
+        # Serial ports with "uino" (Arduino, Genuino, etc.) in the
+        # description or manufacturer field
+        arduino_ports = []
+        for serial_port in self.serial_ports:
+            description = serial_port.description
+            manufacturer = serial_port.manufacturer
+            if ((description is not None and "uino" in description) or
+                    (manufacturer is not None and "uino" in manufacturer)):
+                arduino_ports.append(serial_port.device)
+        return arduino_ports
 
     # -------------------------------------------------------------------------
     def usb_port_disconnected(self):
@@ -3436,15 +4754,24 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
                                    "MAX_DISCARDS": False,
                                    "ASPECT_HEIGHT": False,
                                    "ASPECT_WIDTH": False,
-                                   "SECOND_RELAY_STATE": True}
+                                   "SECOND_RELAY_STATE": True,
+                                   "BINARY_XFER": False}
 
     # -------------------------------------------------------------------------
     def close_usb(self):
         """Method to close the serial port if it is open
         """
+        self.stop_serial_reader()
         if self._ser is not None and self._ser.is_open:
             self._ser.close()
 
+    # -------------------------------------------------------------------------
+    def stop_serial_reader(self):
+        """Method to stop the reader thread (if there is one)"""
+        if self._serial_reader is not None:
+            self._serial_reader.stop()
+            self._serial_reader = None
+
     # -------------------------------------------------------------------------
     def reset_arduino(self):
         """Method to reset the Arduino and establish communication to it
@@ -3472,6 +4799,11 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self._sio = io.TextIOWrapper(io.BufferedRWPair(self._ser, self._ser),
                                      line_buffering=True)
 
+        # Start the reader thread, if enabled
+        if self.usb_reader_thread:
+            self._serial_reader = SerialReader(self._ser)
+            self._serial_reader.start()
+
         # Initialize arduino_has_config dict
         self.init_arduino_has_config()
 
@@ -3482,6 +4814,7 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         """Method to wait for the Arduino ready message, and send
            acknowledgement
         """
+        # pylint: disable=too-many-branches
         # pylint: disable=too-many-return-statements
 
         # Return immediately if ready flag is already set
@@ -3507,6 +4840,11 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
             self.logger.print_and_log(err_str)
             return RC_FAILURE
 
+        # Switch to a higher baud rate, if possible
+        rc = self.negotiate_baud()
+        if rc != RC_SUCCESS:
+            return rc
+
         # Send config message(s) to Arduino
         rc = self.send_config_msgs_to_arduino(write_eeprom)
         if rc != RC_SUCCESS:
@@ -3543,6 +4881,153 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
 
         return RC_SUCCESS
 
+    # -------------------------------------------------------------------------
+    def negotiate_baud(self):
+        """Method to switch the serial link to the highest baud rate in
+           BAUD_RATES (up to usb_max_baud) that the Arduino and the USB
+           link support. The rate that was chosen by the previous
+           negotiation (if any) is tried first. Otherwise each rate is
+           proposed in turn, and each one that fails is skipped. The
+           chosen rate is saved in the usb_negotiated_baud property so
+           it is persisted in the config. If the previous negotiation
+           found that no higher rate works, it is not repeated, since
+           each failed rate costs several seconds.
+        """
+        if not self.arduino_sketch_supports_baud_change:
+            return RC_SUCCESS
+        candidate_bauds = [baud for baud in BAUD_RATES
+                           if self.usb_baud < baud <= self.usb_max_baud]
+        if not candidate_bauds:
+            return RC_SUCCESS
+        if (self.usb_negotiated_baud is not None and
+                self.usb_negotiated_baud <= self.usb_baud):
+            self.logger.log(f"Using baud rate {self._ser.baudrate} "
+                            f"(no higher rate worked previously)")
+            return RC_SUCCESS
+        if self.usb_negotiated_baud in candidate_bauds:
+            rc = self.change_baud(self.usb_negotiated_baud)
+            if rc != RC_BAUD_MISMATCH:
+                # Success, or a failure other than the rate not working
+                return rc
+        for baud in candidate_bauds:
+            if baud <= self._ser.baudrate:
+                continue
+            rc = self.change_baud(baud)
+            if rc not in (RC_SUCCESS, RC_BAUD_MISMATCH):
+                return rc
+        self.usb_negotiated_baud = self._ser.baudrate
+        self.logger.log(f"Using baud rate {self._ser.baudrate}")
+
+        return RC_SUCCESS
+
+    # -------------------------------------------------------------------------
+    def change_baud(self, baud):
+        """Method to change the baud rate of both the Arduino and the host to
+           the specified rate and verify it with an echo test. If the
+           Arduino rejects the rate, or if the test fails, both stay at
+           (or go back to) the previous rate and RC_BAUD_MISMATCH is
+           returned. Any other failure (including a
+           failure to get back to the previous rate) is returned as
+           RC_FAILURE or the code of the serial error.
+        """
+        # pylint: disable=too-many-return-statements
+        prev_baud = self._ser.baudrate
+        self.logger.log(f"Proposing baud rate {baud} to Arduino")
+        rc = self.send_msg_to_arduino(f"Config: BAUD {baud}")
+        if rc != RC_SUCCESS:
+            return rc
+        self.msg_from_arduino = "None"
+        while self.msg_from_arduino != "Changing baud rate\n":
+            rc = self.receive_msg_from_arduino()
+            if rc != RC_SUCCESS:
+                return rc
+            if self.msg_from_arduino == "Config not processed\n":
+                # The Arduino rejected the rate, so it is still using
+                # the previous one
+                return RC_BAUD_MISMATCH
+
+        # Echo test at the new rate
+        rc = self.set_host_baud(baud)
+        if rc != RC_SUCCESS:
+            return rc
+        if self.baud_echo_test(baud):
+            return RC_SUCCESS
+
+        # Echo test failed. If the Arduino did not receive the echo
+        # message intact, it goes back to the previous rate (after a
+        # timeout, at most). Wait for that and check that the link
+        # works at the previous rate. If it doesn't, the Arduino may
+        # have received the echo message after all, so check the new
+        # rate too.
+        self.logger.log(f"Baud rate {baud} failed echo test")
+        time.sleep(BAUD_RESTORE_DELAY)
+        for restore_baud, restore_rc in ((prev_baud, RC_BAUD_MISMATCH),
+                                         (baud, RC_SUCCESS)):
+            rc = self.set_host_baud(restore_baud)
+            if rc != RC_SUCCESS:
+                return rc
+            if self.baud_echo_test(restore_baud):
+                return restore_rc
+        err_str = (f"ERROR: Could not restore baud rate {prev_baud} "
+                   f"after failed change to {baud}")
+        self.logger.print_and_log(err_str)
+
+        return RC_FAILURE
+
+    # -------------------------------------------------------------------------
+    def baud_echo_test(self, baud):
+        """Method to send an ECHO config message to the Arduino and check
+           that both the echoed message and the "Config processed"
+           reply are received intact. Returns True if so.
+        """
+        echo_msg = f"Config: ECHO {baud}"
+        echo_received = False
+        rc = self.send_msg_to_arduino(echo_msg)
+        while rc == RC_SUCCESS:
+            rc = self.receive_msg_from_arduino()
+            if rc != RC_SUCCESS:
+                break
+            echo_reply = f"Received host message: {echo_msg}"
+            if self.msg_from_arduino.rstrip() == echo_reply:
+                echo_received = True
+            elif self.msg_from_arduino == "Config processed\n":
+                return echo_received
+            elif self.msg_from_arduino == "Config not processed\n":
+                break
+
+        return False
+
+    # -------------------------------------------------------------------------
+    def set_host_baud(self, baud):
+        """Method to change the baud rate of the host side of the serial
+           link. Any unread input is discarded.
+        """
+        # The reader thread (if any) must not read while the rate is
+        # changed, and anything it has buffered is stale
+        if self._serial_reader is not None:
+            self._serial_reader.stop()
+        try:
+            self._sio.flush()
+            self._ser.baudrate = baud
+            self._ser.reset_input_buffer()
+        except serial.SerialException as e:
+            self.logger.print_and_log(f"ERROR: set_host_baud: ({e})")
+            if self._serial_reader is not None:
+                self._serial_reader.start()
+            return RC_SERIAL_EXCEPTION
+
+        # Wrap the buffered stream in a new text stream so that no text
+        # that was read ahead at the previous rate is kept
+        buffered_rw_pair = self._sio.detach()
+        self._sio = io.TextIOWrapper(buffered_rw_pair, line_buffering=True)
+        if self._serial_reader is not None:
+            self._serial_reader.start()
+
+        # Give the Arduino time to switch
+        time.sleep(BAUD_CHANGE_DELAY)
+
+        return RC_SUCCESS
+
     # -------------------------------------------------------------------------
     def send_config_msgs_to_arduino(self, write_eeprom=False):
         """Method to send config messages to the Arduino, waiting for each
@@ -3570,6 +5055,8 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
                        "ASPECT_HEIGHT": self.aspect_height,
                        "ASPECT_WIDTH": self.aspect_width,
                        "SECOND_RELAY_STATE": self.second_relay_state}
+        if self.arduino_sketch_supports_binary_xfer:
+            config_dict["BINARY_XFER"] = int(self.binary_xfer)
         for config_type, config_value in config_dict.items():
             if not self.arduino_has_config[config_type]:
                 rc = self.send_one_config_msg_to_arduino(config_type,
@@ -3656,12 +5143,26 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
 
     # -------------------------------------------------------------------------
     def receive_msg_from_arduino(self):
-        """Method to receive a single message from the Arduino"""
-
-        msg_timer = self.msg_timer_timeout
+        """Method to receive a single message from the Arduino. If there is
+           a reader thread, the timeout is a wall-clock deadline with the
+           same nominal length as msg_timer_timeout serial timeouts.
+           Otherwise the serial port is polled up to msg_timer_timeout
+           times.
+        """
+        serial_reader = self._serial_reader
+        if serial_reader is not None:
+            msg_timer = 1
+            timeout = self.msg_timer_timeout * self.serial_timeout
+        else:
+            msg_timer = self.msg_timer_timeout
+            timeout = None
         while msg_timer:
             try:
-                self.msg_from_arduino = self._sio.readline()
+                if serial_reader is not None:
+                    self.msg_from_arduino = serial_reader.get(timeout) or ""
+                    self.check_dropped_msgs(serial_reader)
+                else:
+                    self.msg_from_arduino = self._sio.readline()
             except serial.SerialException as e:
                 err_str = f"ERROR: receive_msg_from_arduino: ({e})"
                 self.logger.print_and_log(err_str)
@@ -3680,33 +5181,95 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self.logger.print_and_log(err_str)
         return RC_TIMEOUT
 
+    # -------------------------------------------------------------------------
+    def check_dropped_msgs(self, serial_reader):
+        """Method to check if the reader thread has dropped any messages
+           because its buffer was full. If so, an error is logged and
+           the count is added to the dropped_arduino_msgs attribute.
+        """
+        dropped_msgs = serial_reader.pop_dropped_msgs()
+        if dropped_msgs:
+            self.dropped_arduino_msgs += dropped_msgs
+            err_str = (f"ERROR: {dropped_msgs} messages from Arduino were "
+                       f"dropped because the serial reader buffer was full")
+            self.logger.print_and_log(err_str)
+
     # -------------------------------------------------------------------------
     def receive_data_from_arduino(self):
-        """Method to receive raw IV data from the Arduino"""
+        """Method to receive raw IV data from the Arduino. Each message is
+           processed as soon as it is received rather than after the
+           "Output complete" message, so parsing overlaps the serial
+           transfer. The CH0/CH1 pairs are stored in a preallocated array
+           sized from max_iv_points and handed off as AdcCurve objects
+           in the adc_pairs and unfiltered_adc_pairs properties. If any
+           messages are dropped by the reader thread, the curve is
+           incomplete and RC_FAILURE is returned.
+        """
         # pylint: disable=too-many-branches
-        received_msgs = []
+        # pylint: disable=too-many-statements
+        dropped_arduino_msgs = self.dropped_arduino_msgs
+        adc_array = np.empty((self.max_iv_points + 2, 2), dtype=int)
+        num_adc_pairs = 0
+        unfiltered_adc_array = np.empty((0, 2), dtype=int)
+        num_unfiltered_adc_pairs = 0
+        data_rc = RC_SUCCESS
         while True:
-            # Loop receiving messages and appending them to the
-            # received_msgs list until the "Output complete" message is
-            # received
             rc = self.receive_msg_from_arduino()
-            if rc == RC_SUCCESS:
-                received_msgs.append(self.msg_from_arduino)
-                if self.msg_from_arduino == "Output complete\n":
-                    break
-            else:
+            if rc != RC_SUCCESS:
                 return rc
-
-        # Loop through list, filling the adc_pairs list with the CH0/CH1
-        # pairs.  Also capture sensor messages.
-        self.adc_pairs = []
-        self.unfiltered_adc_pairs = []
-        adc_re = re.compile(r"CH0:(\d+)\s+CH1:(\d+)")
-        unfiltered_adc_re_str = r"Unfiltered CH0:(\d+)\s+Unfiltered CH1:(\d+)"
-        unfiltered_adc_re = re.compile(unfiltered_adc_re_str)
-        for msg in received_msgs:
-            if msg.startswith("Polling for stable Isc timed out"):
-                rc = RC_ISC_TIMEOUT
+            msg = self.msg_from_arduino
+            fields = msg.split()
+            if (len(fields) in (3, 5) and
+                    (fields[0].isdigit() or fields[0] in ("Isc", "Voc"))):
+                # Data point messages are:
+                #   "<n> CH0:<val> CH1:<val>"  (<n> is Isc or Voc for
+                #                               the first and last)
+                #   "<n> Unfiltered CH0:<val> Unfiltered CH1:<val>"
+                if (len(fields) == 3 and
+                        fields[1].startswith("CH0:") and
+                        fields[2].startswith("CH1:") and
+                        fields[1][4:].isdigit() and
+                        fields[2][4:].isdigit()):
+                    (adc_array,
+                     num_adc_pairs) = append_adc_pairs(adc_array,
+                                                       num_adc_pairs,
+                                                       [(int(fields[1][4:]),
+                                                         int(fields[2][4:]))])
+                elif (len(fields) == 5 and
+                      fields[2].startswith("CH0:") and
+                      fields[4].startswith("CH1:") and
+                      fields[2][4:].isdigit() and
+                      fields[4][4:].isdigit()):
+                    (unfiltered_adc_array,
+                     num_unfiltered_adc_pairs) = append_adc_pairs(
+                         unfiltered_adc_array, num_unfiltered_adc_pairs,
+                         [(int(fields[2][4:]), int(fields[4][4:]))])
+            elif msg == "Output complete\n":
+                break
+            elif msg.startswith("Binary ADC pairs: "):
+                adc_curve = unpack_binary_adc_pairs(msg.split(": ")[1])
+                if adc_curve is None:
+                    self.logger.print_and_log("ERROR: Bad binary ADC pairs")
+                    data_rc = RC_FAILURE
+                else:
+                    (adc_array,
+                     num_adc_pairs) = append_adc_pairs(adc_array,
+                                                       num_adc_pairs,
+                                                       adc_curve.array)
+            elif msg.startswith("Binary unfiltered ADC pairs: "):
+                adc_curve = unpack_binary_adc_pairs(msg.split(": ")[1])
+                if adc_curve is None:
+                    err_str = "ERROR: Bad binary unfiltered ADC pairs"
+                    self.logger.print_and_log(err_str)
+                    data_rc = RC_FAILURE
+                else:
+                    (unfiltered_adc_array,
+                     num_unfiltered_adc_pairs) = append_adc_pairs(
+                         unfiltered_adc_array, num_unfiltered_adc_pairs,
+                         adc_curve.array)
+            elif msg.startswith("Polling for stable Isc timed out"):
+                if data_rc == RC_SUCCESS:
+                    data_rc = RC_ISC_TIMEOUT
             elif msg.startswith("ROM code of DS18B20"):
                 # The DS18B20 ROM code messages are only sent once per
                 # Arduino reset so we need to capture them in a list
@@ -3724,18 +5287,17 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
             elif msg.startswith("Bandgap total ADC:"):
                 if self.parse_bandgap_msg(msg):
                     self.set_vref_from_bandgap()
-            match = adc_re.search(msg)
-            if match:
-                ch0_adc = int(match.group(1))
-                ch1_adc = int(match.group(2))
-                self.adc_pairs.append((ch0_adc, ch1_adc))
-            unfiltered_match = unfiltered_adc_re.search(msg)
-            if unfiltered_match:
-                ch0_adc = int(unfiltered_match.group(1))
-                ch1_adc = int(unfiltered_match.group(2))
-                self.unfiltered_adc_pairs.append((ch0_adc, ch1_adc))
 
-        return rc
+        # Bad binary blocks are not fatal until the "Output complete"
+        # message has been received, so the host and Arduino stay in
+        # step for the next run
+        self.adc_pairs = AdcCurve(adc_array[:num_adc_pairs])
+        self.unfiltered_adc_pairs = AdcCurve(
+            unfiltered_adc_array[:num_unfiltered_adc_pairs])
+        if self.dropped_arduino_msgs != dropped_arduino_msgs:
+            data_rc = RC_FAILURE
+
+        return data_rc
 
     # -------------------------------------------------------------------------
     def create_run_info_file(self):
@@ -4058,7 +5620,7 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
             return rc
 
         # Receive ADC data from Arduino and store in adc_pairs property
-        # (list of tuples)
+        # (AdcCurve)
         self.hdd_output_dir = None
         rc = self.receive_data_from_arduino()
         if rc != RC_SUCCESS:
@@ -4451,7 +6013,8 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
                Arduino code was capable of
              - Apply a noise reduction algorithm
              - Adjust ADC values voltages to compensate for Voc shift
-           Each of the above is configurable.
+           Each of the above is configurable. The corrected values are
+           returned in a new AdcCurve; the input is not modified.
         """
         # pylint: disable=too-many-arguments
         # pylint: disable=too-many-locals
@@ -4460,16 +6023,16 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
 
         # Combine points with the same voltage (use average current)
         if comb_dupv_pts:
-            adc_pairs_corrected = combine_dup_voltages(adc_pairs)
+            curve = combine_dup_voltages(adc_pairs).copy()
         else:
-            adc_pairs_corrected = adc_pairs[:]
+            curve = AdcCurve(adc_pairs).copy()
 
         # Fix Voc
         if fix_voc:
             # Zero out the CH1 value for the Voc point so it is in line
             # with the tail of the curve and so the curve will reach the
             # axis
-            adc_pairs_corrected[-1] = (adc_pairs_corrected[-1][0], 0.0)
+            curve.ch1[-1] = 0.0
 
         # Remove Isc point in some cases
         if fix_isc and not battery_bias:
@@ -4482,12 +6045,12 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
             # this has already been done, and we don't want to remove
             # any points other than the Isc point.
             suppress_isc_point = False
-            pt0_ch0 = float(adc_pairs_corrected[0][0])
-            pt1_ch0 = float(adc_pairs_corrected[1][0])
-            voc_ch0 = float(adc_pairs_corrected[-1][0])
+            pt0_ch0 = float(curve.ch0[0])
+            pt1_ch0 = float(curve.ch0[1])
+            voc_ch0 = float(curve.ch0[-1])
             if ((pt1_ch0 / voc_ch0) > MIN_PT1_TO_VOC_RATIO_FOR_ISC >
                     (pt0_ch0 / voc_ch0)):
-                del adc_pairs_corrected[0]
+                curve = curve[1:]
                 suppress_isc_point = True
 
         # Noise reduction
@@ -4496,40 +6059,46 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
                     not suppress_isc_point):
                 # Replace CH1 (current) value of Isc point with CH1
                 # value of first measured point
-                isc_ch1 = adc_pairs_corrected[1][1]
-                adc_pairs_corrected[0] = (0.0, isc_ch1)
-            adc_pairs_for_nr = adc_pairs_corrected[:-1]  # exclude Voc
-            adc_pairs_nr = noise_reduction(adc_pairs_for_nr,
-                                           starting_rot_thresh=10.0,
-                                           max_iterations=40,
-                                           thresh_divisor=2.0)
-            # Tack Voc point back on
-            adc_pairs_corrected = adc_pairs_nr + [adc_pairs_corrected[-1]]
+                curve.ch0[0] = 0.0
+                curve.ch1[0] = curve.ch1[1]
+            # Exclude Voc point from noise reduction and write the
+            # result back in place
+            curve_nr = self.noise_reduction(curve[:-1],
+                                            starting_rot_thresh=10.0,
+                                            max_iterations=40,
+                                            thresh_divisor=2.0)
+            curve.array[:-1] = curve_nr.array
 
         # Fix Isc
         if fix_isc and not battery_bias:
             # Replace Isc point (again) with a better extrapolation
             if not suppress_isc_point:
-                isc_ch1 = self.create_new_isc_point(adc_pairs_corrected)
-                adc_pairs_corrected[0] = (0.0, isc_ch1)
+                isc_ch1 = self.create_new_isc_point(curve)
+                curve.ch0[0] = 0.0
+                curve.ch1[0] = isc_ch1
 
-        # Adjust voltages to compensate for overshoot
+        # Adjust voltages to compensate for overshoot (all points except
+        # Voc)
         if fix_overshoot:
-            v_adj_val = calc_v_adj(adc_pairs_corrected)
+            v_adj_val = calc_v_adj(curve)
             log_msg = f"  v_adj = {v_adj_val}"
             self.logger.log(log_msg)
-            adc_pairs_wo_overshoot = []
-            voc_pair_num = len(adc_pairs_corrected) - 1  # last one is Voc
-            for pair_num, adc_pair in enumerate(adc_pairs_corrected):
-                if pair_num == voc_pair_num:
-                    v_adj_val = 1.0
-                ch0_adc_wo_overshoot = adc_pair[0] * v_adj_val
-                ch1_adc_wo_overshoot = adc_pair[1]
-                adc_pairs_wo_overshoot.append((ch0_adc_wo_overshoot,
-                                               ch1_adc_wo_overshoot))
-            adc_pairs_corrected = adc_pairs_wo_overshoot[:]
+            curve.ch0[:-1] *= v_adj_val
 
-        return adc_pairs_corrected
+        return curve
+
+    # -------------------------------------------------------------------------
+    def noise_reduction(self, adc_pairs, **kwargs):
+        """Method to run the noise reduction algorithm on the ADC values
+           using the implementation selected by the vectorized_nr
+           property. The keyword arguments are passed through to the
+           global function. The ADC pairs may be an AdcCurve or a list of
+           tuples; an AdcCurve is returned.
+        """
+        curve = AdcCurve(adc_pairs)
+        if self.vectorized_nr:
+            return noise_reduction_vectorized(curve, **kwargs)
+        return AdcCurve(noise_reduction(curve.to_list(), **kwargs))
 
     # -------------------------------------------------------------------------
     def create_new_isc_point(self, adc_pairs, replace=True):
@@ -4623,6 +6192,7 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         """Method to find the point where the curve starts to deflect downward
         """
         # pylint: disable=too-many-branches
+        # pylint: disable=too-many-locals
 
         # This borrows from the noise reduction algorithm, where the
         # angle of inflection is determined for a given point by
@@ -4630,7 +6200,8 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         # away on either side. The start of the downward deflection is
         # determined to be the first point whose inflection angle is
         # greater than or equal to 1/15 the maximum inflection angle.
-        num_points = len(adc_pairs)
+        curve = AdcCurve(adc_pairs)
+        num_points = len(curve)
         dist = int(num_points / 25.0)
         dist = max(dist, 2)
         retry = 20
@@ -4645,10 +6216,10 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
                 retry = -1
             for point in range(dist):
                 lrd_list.append(-999.0)
-            for point in range(dist, num_points - 1 - dist):
-                long_rot_degrees = rotation_at_point(adc_pairs,
-                                                     point,
-                                                     dist)
+            # Calculate the rotations for all points up front
+            points = np.arange(dist, num_points - 1 - dist)
+            long_rots = curve.rotations(points, dist).tolist()
+            for point, long_rot_degrees in zip(points.tolist(), long_rots):
                 if long_rot_degrees < prev_long_rot_degrees:
                     reduced_rotation_count += 1
                 else:
@@ -4694,28 +6265,32 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
            This method does not make the calibration-based adjustments -
            those are performed in the ADC domain before this method is
            called. It does, however, make the series resistance
-           compensation adjustment.
-        """
-        self.data_points = []
-        for _, adc_pair in enumerate(adc_pairs):
-            amps = adc_pair[1] * self.i_mult
-            if adc_pair[0] == 0:
-                # never shift Isc point
-                series_res_comp = 0
-            elif self.battery_bias:
-                series_res_comp = self.bias_series_res_comp
-            else:
-                series_res_comp = self.series_res_comp
-            volts = adc_pair[0] * self.v_mult + (amps * series_res_comp)
-            watts = volts * amps
-            if amps:
-                ohms = volts / amps
-            else:
-                ohms = INFINITE_VAL
-            self.data_points.append((amps, volts, ohms, watts))
-            output_line = (f"V={volts:.6f}, I={amps:.6f}, "
-                           f"P={watts:.6f}, R={ohms:.6f}")
-            self.logger.log(output_line)
+           compensation adjustment. All points are converted at once
+           using NumPy array operations.
+        """
+        curve = AdcCurve(adc_pairs)
+        ch0_adc = curve.ch0.astype(float)
+        ch1_adc = curve.ch1.astype(float)
+        if self.battery_bias:
+            series_res_comp = self.bias_series_res_comp
+        else:
+            series_res_comp = self.series_res_comp
+        amps = ch1_adc * self.i_mult
+        # Never shift Isc point
+        series_res_comps = np.where(ch0_adc == 0, 0.0, series_res_comp)
+        volts = ch0_adc * self.v_mult + (amps * series_res_comps)
+        watts = volts * amps
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ohms = np.where(amps != 0, volts / amps, INFINITE_VAL)
+        self.data_points = list(zip(amps.tolist(), volts.tolist(),
+                                    ohms.tolist(), watts.tolist()))
+
+        # Log the data points with a single write to the log file
+        if self.data_point_log_level == DATA_POINT_LOG_ALL:
+            self.logger.log_lines(f"V={dp_volts:.6f}, I={dp_amps:.6f}, "
+                                  f"P={dp_watts:.6f}, R={dp_ohms:.6f}"
+                                  for dp_amps, dp_volts, dp_ohms, dp_watts
+                                  in self.data_points)
 
     # -------------------------------------------------------------------------
     def gen_corrected_adc_csv(self, adc_pairs, calibrate, comb_dupv_pts,
@@ -4774,15 +6349,10 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         """Method to apply the voltage and current calibration to the ADC
            values.
         """
-        calibrated_adc_pairs = []
-        for adc_pair in adc_pairs:
-            ch0_adc = adc_pair[0]  # voltage value
-            ch1_adc = adc_pair[1]  # current value
-            calibrated_ch0_adc = ch0_adc * self.v_cal + self.v_cal_b_adc
-            calibrated_ch1_adc = ch1_adc * self.i_cal + self.i_cal_b_adc
-            calibrated_adc_pairs.append((calibrated_ch0_adc,
-                                         calibrated_ch1_adc))
-        return calibrated_adc_pairs
+        curve = AdcCurve(adc_pairs)
+        calibrated_ch0 = curve.ch0 * self.v_cal + self.v_cal_b_adc
+        calibrated_ch1 = curve.ch1 * self.i_cal + self.i_cal_b_adc
+        return AdcCurve.from_columns(calibrated_ch0, calibrated_ch1)
 
     # -------------------------------------------------------------------------
     def apply_battery_bias(self, adc_pairs):
@@ -4809,7 +6379,7 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         if bias_battery_csv is None:
             # If the CSV file is not found, just return the unbiased
             # ADC pairs
-            return adc_pairs
+            return AdcCurve(adc_pairs)
 
         # Parse the ADC pairs from the bias battery CSV file
         batt_adc_pairs = self.read_adc_pairs_from_csv_file(bias_battery_csv)
@@ -4818,74 +6388,65 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         batt_voc_adc = batt_adc_pairs[-1][0]
         self.bias_batt_voc_volts = batt_voc_adc * self.v_mult
 
-        # Process each ADC pair in the input list
-        biased_adc_pairs = []
-        last_negv_point = None
-        last_pair_num = len(adc_pairs) - 1
-        voc_pair = False
-        for pair_num, adc_pair in enumerate(adc_pairs):
-            if pair_num == last_pair_num:
-                voc_pair = True
-            ch0_adc = adc_pair[0]  # voltage value
-            ch1_adc = adc_pair[1]  # current value
-            prev_batt_ch0_adc = 0
-            prev_batt_ch1_adc = ADC_MAX
-
-            # Discard non-Voc points with CH1 (current) ADC values less
-            # than MIN_BIAS_CH1_ADC or MIN_BIAS_CH1_ADC_PCT % of point
-            # 0's CH1 value, whichever is greater
-            if not voc_pair and (ch1_adc < MIN_BIAS_CH1_ADC or
-                                 ch1_adc < (adc_pairs[0][1] *
-                                            MIN_BIAS_CH1_ADC_PCT/100.0)):
-                continue
-
-            # Search the bias battery ADC pairs
-            for batt_adc_pair in batt_adc_pairs:
-                batt_ch0_adc = batt_adc_pair[0]
-                batt_ch1_adc = batt_adc_pair[1]
-
-                # Stop when the battery ADC pair has a smaller current
-                # than the given point
-                if batt_ch1_adc < ch1_adc:
-                    # Use interpolation between this battery ADC pair
-                    # and its predecessor to find the voltage value on
-                    # the battery curve that corresponds to the
-                    # current of the given point; this is the bias
-                    interp_batt_ch1_adc = prev_batt_ch1_adc - ch1_adc
-                    if prev_batt_ch1_adc == batt_ch1_adc:
-                        interp_batt_ch0_adc = batt_ch0_adc
-                    else:
-                        interp_batt_ch0_adc = (interp_batt_ch1_adc *
-                                               (batt_ch0_adc -
-                                                prev_batt_ch0_adc) /
-                                               (prev_batt_ch1_adc -
-                                                batt_ch1_adc))
-                    ch0_bias = prev_batt_ch0_adc + interp_batt_ch0_adc
-                    break
-                prev_batt_ch0_adc = batt_ch0_adc
-                prev_batt_ch1_adc = batt_ch1_adc
-
-            # Special case: Voc point. No interpolation here - the
-            # bias is simply the battery Voc
-            if voc_pair:
-                ch0_bias = batt_voc_adc
-
-            # Scale the biased voltage and current to account for the
-            # Vref droop from the second relay being active
-            scaled_ch0_adc = ch0_adc * self.second_relay_cal
-            scaled_ch1_adc = ch1_adc * self.second_relay_cal
-
-            # Subtract bias amount from voltage (CH0)
-            biased_ch0_adc = scaled_ch0_adc - ch0_bias
-
-            # If biased value is negative, throw the point away.
-            # Otherwise, append it to the output list
-            if biased_ch0_adc < 0:
-                # Actually, keep track of the last negative voltage
-                # point so we can interpolate the Isc point
-                last_negv_point = (biased_ch0_adc, scaled_ch1_adc)
-                continue
-            biased_adc_pairs.append((biased_ch0_adc, scaled_ch1_adc))
+        # Discard non-Voc points with CH1 (current) ADC values less
+        # than MIN_BIAS_CH1_ADC or MIN_BIAS_CH1_ADC_PCT % of point 0's
+        # CH1 value, whichever is greater
+        curve = AdcCurve(adc_pairs)
+        keep = ~((curve.ch1 < MIN_BIAS_CH1_ADC) |
+                 (curve.ch1 < (curve.ch1[0] * MIN_BIAS_CH1_ADC_PCT/100.0)))
+        keep[-1] = True
+        kept_curve = AdcCurve(curve.array[keep])
+        ch0_adc = kept_curve.ch0.astype(float)  # voltage values
+        ch1_adc = kept_curve.ch1.astype(float)  # current values
+
+        # For each point, find the first bias battery ADC pair that has
+        # a smaller current than the point. Use interpolation between
+        # that battery ADC pair and its predecessor to find the voltage
+        # value on the battery curve that corresponds to the current of
+        # the point; this is the bias. The predecessor of the first
+        # battery ADC pair is (0, ADC_MAX).
+        batt_curve = AdcCurve(batt_adc_pairs)
+        batt_ch0 = batt_curve.ch0.astype(float)
+        batt_ch1 = batt_curve.ch1.astype(float)
+        prev_batt_ch0 = np.append(0.0, batt_ch0[:-1])
+        prev_batt_ch1 = np.append(float(ADC_MAX), batt_ch1[:-1])
+        smaller = batt_ch1[np.newaxis, :] < ch1_adc[:, np.newaxis]
+        found = smaller.any(axis=1)
+        batt_idx = smaller.argmax(axis=1)
+        b0 = batt_ch0[batt_idx]
+        b1 = batt_ch1[batt_idx]
+        p0 = prev_batt_ch0[batt_idx]
+        p1 = prev_batt_ch1[batt_idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            interp_batt_ch0_adc = np.where(p1 == b1, b0,
+                                           (p1 - ch1_adc) * (b0 - p0) /
+                                           (p1 - b1))
+        ch0_bias = p0 + interp_batt_ch0_adc
+
+        # If no battery ADC pair has a smaller current, the bias from
+        # the previous point is used
+        last_found = np.maximum.accumulate(np.where(found,
+                                                    np.arange(len(found)),
+                                                    -1))
+        ch0_bias = np.where(last_found < 0, batt_voc_adc,
+                            ch0_bias[np.maximum(last_found, 0)])
+
+        # Special case: Voc point. No interpolation here - the bias is
+        # simply the battery Voc
+        ch0_bias[-1] = batt_voc_adc
+
+        # Scale the biased voltage and current to account for the Vref
+        # droop from the second relay being active
+        scaled_ch0_adc = ch0_adc * self.second_relay_cal
+        scaled_ch1_adc = ch1_adc * self.second_relay_cal
+
+        # Subtract bias amount from voltage (CH0)
+        biased_ch0_adc = scaled_ch0_adc - ch0_bias
+
+        # If biased value is negative, throw the point away
+        negv = biased_ch0_adc < 0
+        biased_curve = AdcCurve.from_columns(biased_ch0_adc[~negv],
+                                             scaled_ch1_adc[~negv])
 
         # Some points of the biased curve were discarded because they
         # had a negative voltage.  The first non-discarded point has a
@@ -4893,16 +6454,18 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         # zero voltage.  This is done by interpolating between the last
         # discarded point (v0,i0) and the first non-discarded point
         # (v1,i1).
-        if len(biased_adc_pairs) > 1 and last_negv_point is not None:
-            v0 = last_negv_point[0]
-            i0 = last_negv_point[1]
-            v1 = biased_adc_pairs[0][0]
-            i1 = biased_adc_pairs[0][1]
+        if len(biased_curve) > 1 and negv.any():
+            last_negv_point = np.flatnonzero(negv)[-1]
+            v0 = float(biased_ch0_adc[last_negv_point])
+            i0 = float(scaled_ch1_adc[last_negv_point])
+            v1 = float(biased_curve.ch0[0])
+            i1 = float(biased_curve.ch1[0])
             isc_ch1 = i1 + ((v1 * (i0 - i1)) / (-v0 + v1))
             new_point = (0.0, isc_ch1)
-            biased_adc_pairs = [new_point] + biased_adc_pairs
+            biased_curve = AdcCurve(np.vstack((new_point,
+                                               biased_curve.array)))
 
-        return biased_adc_pairs
+        return biased_curve
 
     # -------------------------------------------------------------------------
     def get_bias_batt_csv(self):
@@ -5025,8 +6588,8 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
 
     # -------------------------------------------------------------------------
     def read_adc_pairs_from_csv_file(self, filename):
-        """Method to read a CSV file containing ADC pairs and return the list
-           of ADC pairs
+        """Method to read a CSV file containing ADC pairs and return them in
+           an AdcCurve (empty if the file cannot be read)
         """
         adc_pairs = []
         try:
@@ -5038,21 +6601,21 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
                             err_str = (f"ERROR: first line of ADC CSV is not "
                                        f"{expected_first_line}")
                             self.logger.print_and_log(err_str)
-                            return []
+                            return AdcCurve()
                     else:
                         adc_pair = list(map(float, line.split(",")))
                         if len(adc_pair) != 2:
                             err_str = (f"ERROR: CSV line {ii + 1} is not in "
                                        f"expected CH0, CH1 format")
                             self.logger.print_and_log(err_str)
-                            return []
+                            return AdcCurve()
                         adc_tuple = (adc_pair[0], adc_pair[1])
                         adc_pairs.append(adc_tuple)
         except IOError:
             self.logger.print_and_log(f"ERROR: Cannot open {filename}")
-            return []
+            return AdcCurve()
 
-        return adc_pairs
+        return AdcCurve(adc_pairs)
 
     # -------------------------------------------------------------------------
     def get_adc_offsets(self, adc_pairs):
@@ -5071,19 +6634,12 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         # to apply to both channels since we don't ever see the "zero"
         # value on CH0). However, occasionally a lower value shows up,
         # in which case we want to use that.
-        self._adc_ch0_offset = adc_pairs[-1][1]
-        self._adc_ch1_offset = adc_pairs[-1][1]
-        self._voltage_saturated = False
-        self._current_saturated = False
-        for adc_pair in adc_pairs:
-            if adc_pair[0] < self._adc_ch0_offset:
-                self._adc_ch0_offset = adc_pair[0]
-            if adc_pair[0] == ADC_MAX:
-                self._voltage_saturated = True
-            if adc_pair[1] < self._adc_ch1_offset:
-                self._adc_ch1_offset = adc_pair[1]
-            if adc_pair[1] == ADC_MAX:
-                self._current_saturated = True
+        curve = AdcCurve(adc_pairs)
+        voc_ch1 = curve.ch1[-1]
+        self._adc_ch0_offset = min(voc_ch1, curve.ch0.min()).item()
+        self._adc_ch1_offset = min(voc_ch1, curve.ch1.min()).item()
+        self._voltage_saturated = bool((curve.ch0 == ADC_MAX).any())
+        self._current_saturated = bool((curve.ch1 == ADC_MAX).any())
 
     # -------------------------------------------------------------------------
     def adc_sanity_check(self, adc_pairs):
@@ -5134,6 +6690,10 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self.logger.log(f"Loop mode: {loop_mode}")
         self.logger.log(f"Output directory: {self.hdd_output_dir}")
 
+        # In loop mode, the irradiance and temperature estimates (if
+        # any) start from the previous run's estimates
+        self.warm_start_estimate = loop_mode
+
         # Get the name of the CSV files
         self.get_csv_filenames(self.hdd_output_dir, date_time_str)
 
@@ -5163,7 +6723,7 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
             return rc
 
         # Receive ADC data from Arduino and store in adc_pairs property
-        # (list of tuples)
+        # (AdcCurve)
         receive_data_from_arduino_rc = self.receive_data_from_arduino()
 
         # Turn off the second relay (only if it had been turned on though)
@@ -5188,6 +6748,13 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         if receive_data_from_arduino_rc != RC_SUCCESS or not process_adc:
             return receive_data_from_arduino_rc
 
+        # In pipelined mode, hand off the processing and plotting to a
+        # worker thread and return so the next swing can start
+        if self.pipelined:
+            self.submit_to_pipeline()
+            self.warm_start_estimate = False
+            return RC_SUCCESS
+
         # Process ADC values
         rc = self.process_adc_values()
         if rc != RC_SUCCESS:
@@ -5200,6 +6767,87 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
 
         return RC_SUCCESS
 
+    # -------------------------------------------------------------------------
+    def submit_to_pipeline(self):
+        """Method to submit the processing and plotting of the current run
+           to the pipeline's worker threads. The work is done on a copy
+           of this object (see pipeline_copy()), so this object is free
+           to swing the next curve. The results are written to the same
+           run directory as they would be if not pipelined. If too many
+           runs are already waiting, this waits for one of them to
+           finish first.
+        """
+        if self._pipeline_executor is None:
+            self._pipeline_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.pipeline_workers,
+                thread_name_prefix="IVS2_pipeline")
+        pending = [future for future in self._pipeline_futures
+                   if not future.done()]
+        if len(pending) >= 2 * self.pipeline_workers:
+            first_completed = concurrent.futures.FIRST_COMPLETED
+            concurrent.futures.wait(pending, return_when=first_completed)
+        ivs2_copy = self.pipeline_copy()
+        future = self._pipeline_executor.submit(
+            ivs2_copy.process_adc_values_and_plot_results)
+        self._pipeline_futures.append(future)
+
+    # -------------------------------------------------------------------------
+    def pipeline_copy(self):
+        """Method to return a copy of this object for processing and
+           plotting the current run in the pipeline. It is a shallow
+           copy, except for the objects that are modified in place by
+           the processing and plotting.
+        """
+        ivs2_copy = copy.copy(self)
+        ivs2_copy.pv_model = copy.deepcopy(self.pv_model)
+        ivs2_copy.ivp = None
+        ivs2_copy.pipelined = False
+        return ivs2_copy
+
+    # -------------------------------------------------------------------------
+    def process_adc_values_and_plot_results(self):
+        """Method to process the ADC values and plot the results, as
+           swing_curve() does when not pipelined. A tuple is returned,
+           with the first value being the return code and the second
+           value being this object (from which the results of the run
+           may be obtained).
+        """
+        rc = self.process_adc_values()
+        if rc == RC_SUCCESS:
+            rc = self.plot_results()
+        return (rc, self)
+
+    # -------------------------------------------------------------------------
+    def get_pipeline_results(self, wait=False):
+        """Method to return the results of the pipelined runs that have
+           finished, in the order that they were swung. Each result is a
+           tuple returned by process_adc_values_and_plot_results(). If
+           wait is True, this waits for all runs to finish.
+        """
+        results = []
+        while self._pipeline_futures:
+            if not wait and not self._pipeline_futures[0].done():
+                break
+            results.append(self._pipeline_futures.popleft().result())
+        # Keep the latest irradiance/temperature estimate to warm start
+        # the next one
+        for (_, ivs2_copy) in results:
+            if ivs2_copy.prev_est_cell_temp_c is not None:
+                self.prev_est_cell_temp_c = ivs2_copy.prev_est_cell_temp_c
+        return results
+
+    # -------------------------------------------------------------------------
+    def shutdown_pipeline(self):
+        """Method to wait for all pipelined runs to finish and stop the
+           worker threads. The results of any runs that had not already
+           been retrieved are returned.
+        """
+        results = self.get_pipeline_results(wait=True)
+        if self._pipeline_executor is not None:
+            self._pipeline_executor.shutdown()
+            self._pipeline_executor = None
+        return results
+
     # -------------------------------------------------------------------------
     def get_dts_with_sleep(self):
         """Method to get the date/time string from the current time, but
@@ -5309,23 +6957,27 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
            corrections, and convert the values to volts, amps, watts,
            and ohms; and write those values to a CSV file
         """
+        # The processing is performed on an array-backed copy of the ADC
+        # pairs
+        adc_curve = AdcCurve(self.adc_pairs)
+
         # Check that at least two points exist
-        if len(self.adc_pairs) < 2:
+        if len(adc_curve) < 2:
             err_str = "ERROR: Fewer than two points recorded (A)"
             self.logger.print_and_log(err_str)
             return RC_NO_POINTS
 
         # Determine ADC offset values
-        self.get_adc_offsets(self.adc_pairs)
+        self.get_adc_offsets(adc_curve)
 
         # Sanity check ADC values
-        rc = self.adc_sanity_check(self.adc_pairs)
+        rc = self.adc_sanity_check(adc_curve)
         if rc != RC_SUCCESS:
             return rc
 
         # Apply battery bias, if enabled
         if self.battery_bias:
-            self.pre_bias_voc_volts = self.adc_pairs[-1][0] * self.v_mult
+            self.pre_bias_voc_volts = adc_curve[-1][0] * self.v_mult
             if self.reduce_noise:
                 # We will perform noise reduction on the biased result,
                 # but just as it is necessary to perform n.r. on the
@@ -5336,24 +6988,20 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
                 # which are beyond the n.r. algorithm's ability to
                 # correct.  This n.r. can be coarser than the final
                 # n.r., however.
-                adc_pairs = noise_reduction(self.adc_pairs,
-                                            starting_rot_thresh=5.0,
-                                            max_iterations=40,
-                                            thresh_divisor=4.0,
-                                            ppm_thresh=4000)
-            else:
-                adc_pairs = self.adc_pairs
-            self.adc_pairs_corrected = self.apply_battery_bias(adc_pairs)
-            if len(self.adc_pairs_corrected) < 2:
+                adc_curve = self.noise_reduction(adc_curve,
+                                                 starting_rot_thresh=5.0,
+                                                 max_iterations=40,
+                                                 thresh_divisor=4.0,
+                                                 ppm_thresh=4000)
+            adc_curve = self.apply_battery_bias(adc_curve)
+            if len(adc_curve) < 2:
                 err_str = "ERROR: Fewer than two points recorded (B)"
                 self.logger.print_and_log(err_str)
+                self.adc_pairs_corrected = adc_curve
                 return RC_NO_POINTS
-        else:
-            self.adc_pairs_corrected = self.adc_pairs
 
         # Apply Vref voltage/current calibration
-        adc_pairs = self.adc_pairs_corrected
-        self.adc_pairs_corrected = self.calibrate_adc_pairs(adc_pairs)
+        self.adc_pairs_corrected = self.calibrate_adc_pairs(adc_curve)
 
         # Correct the ADC values to reduce noise, etc.
         if self.correct_adc:
@@ -5389,6 +7037,9 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self.ivp.font_scale = self.font_scale
         self.ivp.line_scale = self.line_scale
         self.ivp.point_scale = self.point_scale
+        self.ivp.reuse_figure = self.reuse_figure
+        self.ivp.save_gif = self.save_gif
+        self.ivp.render_in_memory = self.render_in_memory
         if self._voltage_saturated:
             self.ivp.v_sat = self.v_sat
         if v_sat_override is not None:
@@ -5406,8 +7057,10 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
             except AssertionError as e:
                 self.assertion_msg = e
                 rc = RC_PV_MODEL_FAILURE
-        self.ivp.run()
+        with PYPLOT_LOCK:
+            self.ivp.run()
         self.current_img = self.ivp.current_img
+        self.current_img_data = self.ivp.current_img_data
         self.plot_max_x = self.ivp.max_x
         self.plot_max_y = self.ivp.max_y
         return rc
@@ -5475,6 +7128,17 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
 
         pv = self.pv_model
 
+        # If enabled, use the parameter cache that is shared by all of
+        # the models in the process, and keep it in the app data folder
+        # so it persists across sessions. Otherwise, the model is always
+        # cold started, so its results depend only on its inputs.
+        if self.use_parms_cache:
+            pv.parms_cache = PV_MODEL_PARMS_CACHE
+            pv.parms_cache.filename = os.path.join(
+                self.app_data_dir, PV_MODEL_PARMS_CACHE_FILENAME)
+        else:
+            pv.parms_cache = None
+
         # Populate PV model properties with datasheet values from file,
         # unless they have already been populated by an external entity
         # (e.g. the GUI's PV Model Preferences tab)
@@ -5483,9 +7147,19 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
 
         # Use model to estimate irradiance and/or cell temperature,
         # or use measured values
+        warm_start_estimate = self.warm_start_estimate
+        self.warm_start_estimate = False
         if estimate_irrad and estimate_temp:
-            # Estimate both irradiance and cell temperature
-            pv.estimate_irrad_and_temp(measured_voc, measured_isc, 0.1)
+            # Estimate both irradiance and cell temperature, starting
+            # from the previous run's estimate in loop mode
+            initial_temp_c = (self.prev_est_cell_temp_c
+                              if warm_start_estimate else None)
+            pv.estimate_irrad_and_temp(measured_voc, measured_isc, 0.1,
+                                       initial_temp_c=initial_temp_c)
+            self.prev_est_cell_temp_c = pv.cell_temp_c
+            self.logger.log(f"Irradiance/temperature estimate: "
+                            f"{pv.est_iterations} iterations, "
+                            f"{pv.est_ms} ms")
         elif estimate_irrad:
             # Estimate irradiance only
             pv.cell_temp_c = measured_cell_temp
@@ -5648,8 +7322,10 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self.ivp.font_scale = self.font_scale
         self.ivp.line_scale = self.line_scale
         self.ivp.point_scale = 0.0
-        self.ivp.run()
+        with PYPLOT_LOCK:
+            self.ivp.run()
         self.current_img = self.ivp.current_img
+        self.current_img_data = self.ivp.current_img_data
         self.plot_max_x = self.ivp.max_x
         self.plot_max_y = self.ivp.max_y
 
@@ -5743,6 +7419,7 @@ class IV_Swinger2(IV_Swinger.IV_Swinger):
         self.estimate_temp = ESTIMATE_TEMP_DEFAULT
         self.use_avg_sensor_temp = USE_AVG_SENSOR_TEMP_DEFAULT
         self.cell_temp_adjust = CELL_TEMP_ADJUST_DEFAULT
+        self.use_parms_cache = USE_PARMS_CACHE_DEFAULT
 
 
 ############
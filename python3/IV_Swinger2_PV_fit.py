@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+"""IV Swinger 2 PV model batch fitting module"""
+#
+###############################################################################
+#
+# IV_Swinger2_PV_fit.py: IV Swinger 2 PV model batch fitting module
+#
+# Copyright (C) 2026  Chris Satterlee
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+#
+# IV Swinger and IV Swinger 2 are open source hardware and software
+# projects
+#
+# Permission to use the hardware designs is granted under the terms of
+# the TAPR Open Hardware License Version 1.0 (May 25, 2007) -
+# http://www.tapr.org/OHL
+#
+# Permission to use the software is granted under the terms of the GNU
+# GPL v3 as noted above.
+#
+# Current versions of the licensing files, documentation, hardware
+# design files, and software can be found at:
+#
+#    https://github.com/csatt/IV_Swinger
+#
+###############################################################################
+#
+# This file contains the Python code that fits the single-diode PV
+# model parameters (IL, I0, A, Rs and Rsh) to measured IV curves in
+# bulk, for tracking the degradation of a PV module or cell over many
+# runs. It finds all of the data point CSV files in a folder (e.g. a
+# results folder) and its subfolders and fits each curve in a pool of
+# worker processes.
+#
+# For each curve, the irradiance and cell temperature are estimated
+# from the measured Voc and Isc, and the PV model is run at those
+# conditions using the datasheet values from the PV spec file. The
+# resulting parameters are the starting point for a least-squares fit
+# to all of the measured points (see the fit_measured_points() method
+# of the PV_model class in IV_Swinger_PV_model.py).
+#
+# The log file and the default PV spec file are those of the app data
+# directory (the standard place unless the --app-data-dir option is
+# used), not of the data folder.
+#
+# The PV is specified with the --pv-name option. If it isn't, the PV
+# name saved in each run's IV_Swinger2.cfg file is used.
+#
+# The results are written to a summary CSV file with one row per
+# curve, and are also printed as a table. An Rsh value of "inf" means
+# that the shunt resistance is too high to be determined from the
+# measured points (see fit_parms_to_points() in IV_Swinger_PV_model.py).
+#
+# This module may be used standalone, or it may be imported.
+#
+import argparse
+import configparser
+import csv
+import os
+from pathlib import Path
+import IV_Swinger2
+import IV_Swinger_plotter
+from IV_Swinger_PV_model import PV_model
+
+#################
+#   Constants   #
+#################
+SUMMARY_FILENAME = "pv_fit_summary.csv"
+# Folders whose CSV files are not PV curves (battery calibration runs
+# and overlays)
+SKIPPED_FOLDER_NAMES = (IV_Swinger2.BATTERY_FOLDER_NAME, "overlays")
+SUMMARY_FIELDS = ["Run", "PV name", "Status", "IL (A)", "I0 (A)", "A",
+                  "Rs (ohms)", "Rsh (ohms)", "RMS residual (A)",
+                  "Irradiance (W/m^2)", "Cell temp (C)"]
+FIT_OK = "OK"
+FIT_NOT_CONVERGED = "NOT_CONVERGED"
+FIT_MODEL_FAILURE = "MODEL_FAILURE"
+FIT_NO_PV_NAME = "NO_PV_NAME"
+FIT_NO_DATA = "NO_DATA"
+FIT_FAILURE = "FAILURE"
+
+
+########################
+#   Global functions   #
+########################
+def get_data_point_csv_files(data_dir, file_prefix="iv_swinger2_"):
+    """Global function to return a sorted list of the data point CSV files
+       in the specified folder and its subfolders. The battery
+       calibration and overlay folders are skipped.
+    """
+    csv_files = []
+    for dir_path, dirnames, filenames in os.walk(data_dir):
+        dirnames[:] = [dirname for dirname in dirnames
+                       if dirname not in SKIPPED_FOLDER_NAMES]
+        for filename in filenames:
+            stem, ext = os.path.splitext(filename)
+            if (ext == ".csv" and stem.startswith(file_prefix) and
+                    IV_Swinger2.is_date_time_str(stem[len(file_prefix):])):
+                csv_files.append(os.path.join(dir_path, filename))
+
+    return sorted(csv_files, key=os.path.basename)
+
+
+def get_saved_pv_name(cfg_file):
+    """Global function to get the PV name configuration from the specified
+       .cfg file. None is returned if the file doesn't exist or doesn't
+       have a PV name.
+    """
+    if not Path(cfg_file).exists():
+        return None
+    my_cfg = configparser.ConfigParser()
+    my_cfg.read(cfg_file, encoding="utf-8")
+    try:
+        pv_name = my_cfg.get("PV Model", "pv name")
+    except (configparser.NoSectionError, configparser.NoOptionError):
+        pv_name = None
+    return pv_name if pv_name != "None" else None
+
+
+def get_curve_name_and_status(summary):
+    """Global function to return the run name and fit status for the
+       progress message, given the summary values of the curve
+    """
+    return (summary[0], summary[2])
+
+
+def format_summary_value(value):
+    """Global function to format a value for the summary CSV file and
+       table
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return str(value)
+
+
+#################
+#   Classes     #
+#################
+
+
+# Curve fitter class
+#
+class CurveFitter(IV_Swinger2.PoolWorker):
+    """Fits the curves in one worker process of the batch fitter. It keeps
+       one PV model object per PV name, so the PV spec file is only read
+       once. The PV model objects have no parameter cache, so each curve
+       is fitted from the same datasheet-based starting point, no
+       matter which curves the worker fitted before it. This keeps the
+       fitted parameters reproducible for any number of jobs.
+    """
+
+    # Description of the processing, for error messages
+    action_str = "Fitting"
+
+    # Initializer
+    def __init__(self, app_data_dir, pv_spec_csv_file, pv_name=None):
+        super().__init__(app_data_dir)
+        self.pv_spec_csv_file = pv_spec_csv_file
+        self.pv_name = pv_name
+        self.curve_pv_name = None
+        self.pv_models = {}
+
+    # -------------------------------------------------------------------------
+    def get_pv_model(self, pv_name):
+        """Method to return the PV model object for the specified PV name,
+           creating it if necessary
+        """
+        if pv_name not in self.pv_models:
+            pv = PV_model()
+            pv.get_spec_vals(pv_name, self.pv_spec_csv_file)
+            self.pv_models[pv_name] = pv
+        return self.pv_models[pv_name]
+
+    # -------------------------------------------------------------------------
+    def process_item(self, item):
+        """Method to fit the curve in one data point CSV file. Returns the
+           list of its summary values (see SUMMARY_FIELDS).
+        """
+        run_name = IV_Swinger2.extract_date_time_str(item)
+        self.curve_pv_name = self.pv_name
+        if self.curve_pv_name is None:
+            cfg_file = os.path.join(os.path.dirname(item),
+                                    f"{IV_Swinger2.APP_NAME}.cfg")
+            self.curve_pv_name = get_saved_pv_name(cfg_file)
+        pv_name = self.curve_pv_name
+        if pv_name is None:
+            return [run_name, pv_name, FIT_NO_PV_NAME]
+        data_points = IV_Swinger_plotter.CsvParser(item,
+                                                   self.logger).data_points
+        if len(data_points) < 5:
+            return [run_name, pv_name, FIT_NO_DATA]
+        volts = [point[IV_Swinger2.VOLTS_INDEX] for point in data_points]
+        amps = [point[IV_Swinger2.AMPS_INDEX] for point in data_points]
+        pv = self.get_pv_model(pv_name)
+        try:
+            fit_ok = pv.fit_measured_points(volts, amps)
+        except AssertionError:
+            return [run_name, pv_name, FIT_MODEL_FAILURE]
+
+        status = FIT_OK if fit_ok else FIT_NOT_CONVERGED
+        return ([run_name, pv_name, status] +
+                [float(parm) for parm in pv.fit_parms] +
+                [pv.fit_rms_err, pv.irradiance, pv.cell_temp_c])
+
+    # -------------------------------------------------------------------------
+    def failure_result(self, item):
+        """Method to report a curve whose fitting raised an exception as a
+           FAILURE
+        """
+        return [IV_Swinger2.extract_date_time_str(item), self.curve_pv_name,
+                FIT_FAILURE]
+
+
+# Batch fitter class
+#
+class BatchFitter():
+    """Fits all of the curves in a list of data point CSV files using a
+       pool of worker processes and writes the summary
+    """
+
+    # Initializer
+    def __init__(self, app_data_dir, pv_spec_csv_file, pv_name=None,
+                 num_jobs=None):
+        self.app_data_dir = app_data_dir
+        self.pv_spec_csv_file = pv_spec_csv_file
+        self.pv_name = pv_name
+        self.num_jobs = num_jobs
+        if self.num_jobs is None:
+            self.num_jobs = os.cpu_count() or 1
+        self.ivs2 = IV_Swinger2.IV_Swinger2(self.app_data_dir)
+        self.logger = self.ivs2.logger
+
+    # -------------------------------------------------------------------------
+    def run(self, csv_files):
+        """Method to fit the curves in the specified data point CSV files,
+           reporting the progress as each one is completed. Returns the
+           list of the summary values for each curve, in the same order
+           as the CSV files.
+        """
+        summaries = [None] * len(csv_files)
+        for curve_num, summary in IV_Swinger2.run_in_worker_pool(
+                CurveFitter, (self.app_data_dir, self.pv_spec_csv_file,
+                              self.pv_name),
+                csv_files, self.num_jobs, self.logger,
+                get_curve_name_and_status):
+            summaries[curve_num] = summary
+
+        return summaries
+
+    # -------------------------------------------------------------------------
+    def write_summary(self, summaries, summary_filename):
+        """Method to write the summary CSV file, with one row per curve
+        """
+        with open(summary_filename, "w", encoding="utf-8",
+                  newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(SUMMARY_FIELDS)
+            for summary in summaries:
+                values = [format_summary_value(value) for value in summary]
+                values += [""] * (len(SUMMARY_FIELDS) - len(values))
+                writer.writerow(values)
+        self.logger.print_and_log(f"Fit summary: {summary_filename}")
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def print_summary_table(summaries):
+        """Method to print the summary as a table with aligned columns"""
+        rows = [SUMMARY_FIELDS]
+        for summary in summaries:
+            values = [format_summary_value(value) for value in summary]
+            rows.append(values + [""] * (len(SUMMARY_FIELDS) - len(values)))
+        widths = [max(len(row[col]) for row in rows)
+                  for col in range(len(SUMMARY_FIELDS))]
+        for row in rows:
+            print("  ".join(value.ljust(width)
+                            for value, width in zip(row, widths)).rstrip())
+
+
+############
+#   Main   #
+############
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description=("Fit the PV model parameters to the IV Swinger 2 "
+                     "curves in a folder"))
+    parser.add_argument("data_dir", nargs="?",
+                        help=("Folder containing the data point CSV files, "
+                              "e.g. a results folder (default: standard "
+                              "place)"))
+    parser.add_argument("--pv-name",
+                        help=("Name of the PV in the PV spec file (default: "
+                              "the PV name saved with each run)"))
+    IV_Swinger2.add_app_data_dir_arg(parser)
+    parser.add_argument("--pv-spec-file",
+                        help=("PV spec CSV file (default: the one in the "
+                              "standard place)"))
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help=("Number of curves to fit in parallel "
+                              "(default: number of CPUs)"))
+    parser.add_argument("-o", "--output",
+                        help=(f"Summary CSV file (default: {SUMMARY_FILENAME} "
+                              f"in the data folder)"))
+    args = parser.parse_args()
+
+    app_data_dir = IV_Swinger2.get_abs_app_data_dir(args.app_data_dir)
+    data_dir = args.data_dir
+    if data_dir is None:
+        data_dir = app_data_dir
+    data_dir = os.path.abspath(data_dir)
+    pv_spec_csv_file = args.pv_spec_file
+    if pv_spec_csv_file is None:
+        pv_spec_csv_file = os.path.join(app_data_dir, "pv_spec.csv")
+    pv_spec_csv_file = os.path.abspath(pv_spec_csv_file)
+    summary_filename = args.output
+    if summary_filename is None:
+        summary_filename = os.path.join(data_dir, SUMMARY_FILENAME)
+
+    fitter = BatchFitter(app_data_dir, pv_spec_csv_file, pv_name=args.pv_name,
+                         num_jobs=args.jobs)
+    csv_files = get_data_point_csv_files(data_dir,
+                                         fitter.ivs2.file_prefix)
+    if not csv_files:
+        fitter.logger.print_and_log("ERROR: No data point CSV files found")
+        return
+    summaries = fitter.run(csv_files)
+    fitter.write_summary(summaries, summary_filename)
+    fitter.print_summary_table(summaries)
+    num_ok = sum(1 for summary in summaries if summary[2] == FIT_OK)
+    msg_str = f"  {num_ok} of {len(summaries)} curves fitted successfully"
+    fitter.logger.print_and_log(msg_str)
+    fitter.logger.terminate_log()
+
+
+# Boilerplate main() call
+if __name__ == "__main__":
+    main()
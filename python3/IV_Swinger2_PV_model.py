@@ -52,6 +52,11 @@ import IV_Swinger
 #################
 PV_MODEL_CURVE_NUM_POINTS = 100
 NOC_IRRAD = IV_Swinger_PV_model.NOC_IRRAD
+PARMS_CACHE_FILENAME = "pv_model_parms_cache.json"
+
+# Parameter cache shared by all of the model objects in the process
+# (used only if enabled by the IV_Swinger2 use_parms_cache property)
+PARMS_CACHE = IV_Swinger_PV_model.ParmsCache()
 
 
 #################
@@ -126,10 +131,9 @@ def main():
         ivp.generate_gif = False
         ivp.run()
 
-        # View the PDF and clean up
+        # View the PDF
         basename, _ = os.path.splitext(os.path.basename(pv.csv_filename))
         IV_Swinger2.sys_view_file(f"{basename}.pdf")
-        Path(f"plt_{basename}").unlink()
 
     # Create the PV spec CSV file in the current directory
     pv_spec_file = os.path.join(f"{Path.cwd()}",
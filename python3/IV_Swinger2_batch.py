@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+"""IV Swinger 2 batch reprocessing module"""
+#
+###############################################################################
+#
+# IV_Swinger2_batch.py: IV Swinger 2 batch reprocessing module
+#
+# Copyright (C) 2026  Chris Satterlee
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+#
+# IV Swinger and IV Swinger 2 are open source hardware and software
+# projects
+#
+# Permission to use the hardware designs is granted under the terms of
+# the TAPR Open Hardware License Version 1.0 (May 25, 2007) -
+# http://www.tapr.org/OHL
+#
+# Permission to use the software is granted under the terms of the GNU
+# GPL v3 as noted above.
+#
+# Current versions of the licensing files, documentation, hardware
+# design files, and software can be found at:
+#
+#    https://github.com/csatt/IV_Swinger
+#
+###############################################################################
+#
+# This file contains the Python code that regenerates the results of
+# previously swung IV curves without a GUI. It does the same thing as
+# the Results Wizard's "Update" button, i.e. it re-runs the ADC value
+# processing from the run's adc_pairs_<date_time_str>.csv file and
+# regenerates the data point CSV, GIF and PDF files, but it does it for
+# all of the runs in a results folder (optionally filtered by date) and
+# it processes several runs at once in a pool of worker processes.
+#
+# Unlike the Results Wizard, the whole configuration saved in each
+# run's IV_Swinger2.cfg file is used, including the Plotting
+# section. The app's own configuration is neither used nor modified.
+# Runs that have no saved configuration are processed with the default
+# configuration. By default, the axis ranges saved with the run are
+# used, but the --unlock-axes option scales them automatically
+# instead. The updated axis ranges are saved in the run's .cfg file.
+#
+# The results folder is only used to find the runs. The log file, the
+# PV spec file (for the reference curves) and the PV model parameter
+# cache are those of the app data directory, which is the standard
+# place unless the --app-data-dir option is used.
+#
+# Each run that is processed is recorded in a journal file in the
+# results folder, along with its status. If the program is interrupted
+# and run again, the runs that were processed successfully are skipped
+# (unless the --restart option is used).
+#
+# This module may be used standalone, or it may be imported.
+#
+import argparse
+import os
+from pathlib import Path
+import IV_Swinger2
+
+#################
+#   Constants   #
+#################
+JOURNAL_FILENAME = "batch_reprocess_journal.csv"
+
+
+########################
+#   Global functions   #
+########################
+def get_run_dirs(results_dir, from_date=None, to_date=None):
+    """Global function to return a sorted list of the run directories in the
+       results folder that have an ADC CSV file. If from_date and/or
+       to_date are specified (in yymmdd format), only the runs from
+       those dates (inclusive) are included.
+    """
+    run_dirs = []
+    for subdir in sorted(os.listdir(results_dir)):
+        if not IV_Swinger2.is_date_time_str(subdir):
+            continue
+        run_date = subdir[:6]
+        if from_date is not None and run_date < from_date:
+            continue
+        if to_date is not None and run_date > to_date:
+            continue
+        run_dir = os.path.join(results_dir, subdir)
+        if Path(run_dir, f"adc_pairs_{subdir}.csv").exists():
+            run_dirs.append(run_dir)
+
+    return run_dirs
+
+
+def read_journal(journal_filename):
+    """Global function to read the journal file and return a dict of the
+       status of each run directory that has been processed. If a run
+       directory appears more than once, its last status is returned.
+    """
+    statuses = {}
+    if not Path(journal_filename).exists():
+        return statuses
+    with open(journal_filename, encoding="utf-8") as f:
+        for line in f.read().splitlines():
+            fields = line.split(",")
+            if len(fields) == 2:
+                statuses[fields[0]] = fields[1]
+
+    return statuses
+
+
+def get_run_name_and_status(result):
+    """Global function to return the run name and status for the progress
+       message, given the result of reprocessing the run
+    """
+    (run_dir, rc_name) = result
+    return (os.path.basename(run_dir), rc_name)
+
+
+#################
+#   Classes     #
+#################
+
+
+# Batch configuration class
+#
+class BatchConfiguration(IV_Swinger2.Configuration):
+    """Configuration class used for reprocessing runs. It only reads and
+       writes the .cfg files in the run directories, so the app's
+       configuration files are never touched (which also makes it safe
+       to use in several processes at once).
+    """
+
+    # -------------------------------------------------------------------------
+    def save_starting_cfg_file(self):
+        """Method to override the base class method, which saves a copy
+           of the app's configuration file
+        """
+
+
+# Run reprocessor class
+#
+class RunReprocessor(IV_Swinger2.PoolWorker):
+    """Reprocesses the runs in one worker process of the batch
+       reprocessor
+    """
+
+    # Description of the processing, for error messages
+    action_str = "Reprocessing"
+
+    # Initializer
+    def __init__(self, app_data_dir=None, unlock_axes=False):
+        super().__init__(app_data_dir)
+        self.unlock_axes = unlock_axes
+
+    # -------------------------------------------------------------------------
+    def process_item(self, item):
+        """Method to reprocess one run. Returns a tuple with the run
+           directory and the return code name.
+        """
+        rc = self.reprocess_run_dir(item)
+        return (item, IV_Swinger2.RC_NAMES[rc])
+
+    # -------------------------------------------------------------------------
+    def failure_result(self, item):
+        """Method to report a run whose reprocessing raised an exception as
+           an RC_FAILURE
+        """
+        return (item, IV_Swinger2.RC_NAMES[IV_Swinger2.RC_FAILURE])
+
+    # -------------------------------------------------------------------------
+    def reprocess_run_dir(self, run_dir):
+        """Method to do the work of reprocessing one run with a new
+           IV_Swinger2 object, configured from the run's .cfg file
+        """
+        date_time_str = os.path.basename(run_dir)
+        ivs2 = IV_Swinger2.IV_Swinger2(self.app_data_dir, self.logger)
+        ivs2.logger.log(f"Reprocessing {run_dir}")
+
+        # Restore the saved config
+        config = BatchConfiguration(ivs2=ivs2)
+        cfg_file = os.path.join(run_dir, f"{IV_Swinger2.APP_NAME}.cfg")
+        if Path(cfg_file).exists():
+            config.cfg_filename = cfg_file
+            config.get_old_result(cfg_file)
+        else:
+            cfg_file = None
+        if self.unlock_axes:
+            ivs2.plot_lock_axis_ranges = False
+            ivs2.plot_max_x = None
+            ivs2.plot_max_y = None
+
+        # Read the ADC pairs
+        ivs2.hdd_output_dir = run_dir
+        ivs2.get_csv_filenames(run_dir, date_time_str)
+        ivs2.adc_pairs = ivs2.read_adc_pairs_from_csv_file(
+            ivs2.hdd_adc_pairs_csv_filename)
+
+        # Process the ADC values and regenerate the results
+        rc = ivs2.process_adc_values()
+        if rc == IV_Swinger2.RC_SUCCESS:
+            rc = ivs2.plot_results()
+        if (rc in (IV_Swinger2.RC_SUCCESS, IV_Swinger2.RC_PV_MODEL_FAILURE)
+                and cfg_file is not None):
+            config.add_axes_and_title()
+            config.save()
+        ivs2.clean_up_files(run_dir, loop_mode=False)
+
+        return rc
+
+
+# Batch reprocessor class
+#
+class BatchReprocessor():
+    """Reprocesses all of the selected runs in a results folder using a pool
+       of worker processes
+    """
+
+    # Initializer
+    def __init__(self, results_dir, num_jobs=None, unlock_axes=False,
+                 restart=False, app_data_dir=None):
+        # pylint: disable=too-many-arguments
+        self.results_dir = results_dir
+        self.app_data_dir = app_data_dir
+        self.num_jobs = num_jobs
+        if self.num_jobs is None:
+            self.num_jobs = os.cpu_count() or 1
+        self.unlock_axes = unlock_axes
+        self.restart = restart
+        self.journal_filename = os.path.join(self.results_dir,
+                                             JOURNAL_FILENAME)
+        self.logger = IV_Swinger2.IV_Swinger2(self.app_data_dir).logger
+
+    # -------------------------------------------------------------------------
+    def get_pending_run_dirs(self, run_dirs):
+        """Method to return the run directories that have not already been
+           processed successfully according to the journal. If the restart
+           option was specified, the journal is removed and all of the run
+           directories are returned.
+        """
+        if self.restart:
+            if Path(self.journal_filename).exists():
+                Path(self.journal_filename).unlink()
+            return run_dirs
+        statuses = read_journal(self.journal_filename)
+        success = IV_Swinger2.RC_NAMES[IV_Swinger2.RC_SUCCESS]
+        return [run_dir for run_dir in run_dirs
+                if statuses.get(os.path.basename(run_dir)) != success]
+
+    # -------------------------------------------------------------------------
+    def run(self, run_dirs):
+        """Method to reprocess the specified runs, reporting the progress as
+           each one is completed and recording it in the journal. Returns
+           the number of runs that were reprocessed successfully.
+        """
+        pending_run_dirs = self.get_pending_run_dirs(run_dirs)
+        num_skipped = len(run_dirs) - len(pending_run_dirs)
+        if num_skipped:
+            msg_str = (f"Skipping {num_skipped} runs that were already "
+                       f"reprocessed (see {self.journal_filename})")
+            self.logger.print_and_log(msg_str)
+        num_ok = 0
+        for _, (run_dir, rc_name) in IV_Swinger2.run_in_worker_pool(
+                RunReprocessor, (self.app_data_dir, self.unlock_axes),
+                pending_run_dirs, self.num_jobs, self.logger,
+                get_run_name_and_status):
+            self.update_journal(run_dir, rc_name)
+            if rc_name == IV_Swinger2.RC_NAMES[IV_Swinger2.RC_SUCCESS]:
+                num_ok += 1
+
+        return num_ok
+
+    # -------------------------------------------------------------------------
+    def update_journal(self, run_dir, rc_name):
+        """Method to append the status of a run to the journal"""
+        with open(self.journal_filename, "a", encoding="utf-8") as f:
+            f.write(f"{os.path.basename(run_dir)},{rc_name}\n")
+
+
+############
+#   Main   #
+############
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description=("Reprocess the IV Swinger 2 runs in a results folder "
+                     "from their ADC CSV files"))
+    parser.add_argument("results_dir", nargs="?",
+                        help="Results folder (default: standard place)")
+    IV_Swinger2.add_app_data_dir_arg(parser)
+    parser.add_argument("--from", dest="from_date", metavar="YYMMDD",
+                        help="Only reprocess runs from this date or later")
+    parser.add_argument("--to", dest="to_date", metavar="YYMMDD",
+                        help="Only reprocess runs from this date or earlier")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help=("Number of runs to reprocess in parallel "
+                              "(default: number of CPUs)"))
+    parser.add_argument("--unlock-axes", action="store_true",
+                        help=("Scale the axes automatically rather than "
+                              "using the saved axis ranges"))
+    parser.add_argument("--restart", action="store_true",
+                        help=("Reprocess all selected runs, even those that "
+                              "the journal shows were already reprocessed"))
+    args = parser.parse_args()
+
+    app_data_dir = IV_Swinger2.get_abs_app_data_dir(args.app_data_dir)
+    results_dir = args.results_dir
+    if results_dir is None:
+        results_dir = app_data_dir
+    results_dir = os.path.abspath(results_dir)
+    reprocessor = BatchReprocessor(results_dir, num_jobs=args.jobs,
+                                   unlock_axes=args.unlock_axes,
+                                   restart=args.restart,
+                                   app_data_dir=app_data_dir)
+    run_dirs = get_run_dirs(results_dir, args.from_date, args.to_date)
+    if not run_dirs:
+        reprocessor.logger.print_and_log("ERROR: No runs found")
+        return
+    num_ok = reprocessor.run(run_dirs)
+    msg_str = f"  {num_ok} runs reprocessed successfully"
+    reprocessor.logger.print_and_log(msg_str)
+    reprocessor.logger.terminate_log()
+
+
+# Boilerplate main() call
+if __name__ == "__main__":
+    main()
@@ -97,6 +97,7 @@ except ImportError:
 import shutil
 import sys
 import tempfile
+import time
 from tkinter import ttk
 import tkinter as tk
 import tkinter.filedialog as tkfiledialog
@@ -221,6 +222,8 @@ DGS = '\N{DEGREE SIGN}'
 SQD = '\xb2'
 BASE_DEFAULT_RCMD_PORT = 5100
 DEFAULT_RCMD_POLL_MS = 100
+ARDUINO_MSG_POLL_MS = 50
+PIPELINE_POLL_MS = 100
 
 # Default plotting config
 FANCY_LABELS_DEFAULT = "Fancy"
@@ -548,6 +551,7 @@ class GraphicalUserInterface(ttk.Frame):
         self.results_wiz = None
         self.stop_button = None
         self.swing_loop_id = None
+        self.pipeline_poll_id = None
         self.v_range_entry = None
         self.rcmd_port_label = None
         self.version_label = None
@@ -864,6 +868,7 @@ permission to create files in
         self.ivs2.logger.print_and_log(f"Unexpected error: "
                                        f"{sys.exc_info()[0]}")
         self.ivs2.logger.print_and_log(traceback.format_exc())
+        self.ivs2.logger.flush()
         exception_msg = f"""
 An internal error has occurred.  Please send
 the log file to csatt1@gmail.com.
@@ -1695,7 +1700,7 @@ ERROR: USB port is not connected to IV Swinger 2
                                 cfg_file, original_cfg_file)
 
     # -------------------------------------------------------------------------
-    def attempt_arduino_handshake(self, write_eeprom=False):
+    def attempt_arduino_handshake(self, write_eeprom=False, poll=False):
         """Method which is a "best-effort" attempt to reset the Arduino and
            perform the initial handshake when the GUI comes up. If this
            succeeds, there will be no delay when the go button is
@@ -1704,6 +1709,14 @@ ERROR: USB port is not connected to IV Swinger 2
            requirement, so it should fail silently. In that case, it
            retries itself once a second.  If and when the IVS2 hardware
            is connected, it will bring up the interface.
+
+           If poll is True and there is a serial reader thread, the wait
+           for the Arduino to come out of reset is done by polling the
+           reader from the mainloop (see poll_arduino_ready_msg()), so
+           the GUI is not blocked while the Arduino boots. In that case,
+           this method returns before the handshake is done. The
+           scheduled calls (at startup and the retries) use polling;
+           other callers expect the handshake to be done on return.
         """
         # Bail out now if Arduino ready flag is set
         if self.ivs2.arduino_ready:
@@ -1722,19 +1735,62 @@ ERROR: USB port is not connected to IV Swinger 2
             # Reset Arduino
             rc = self.ivs2.reset_arduino()
             if rc == RC_SUCCESS:
+                serial_reader = self.ivs2.serial_reader
+                if poll and serial_reader is not None:
+                    deadline = (time.time() +
+                                self.ivs2.msg_timer_timeout *
+                                self.ivs2.serial_timeout)
+                    self.poll_arduino_ready_msg(write_eeprom, serial_reader,
+                                                deadline)
+                    return
                 # Wait for Arduino ready message
-                rc = self.ivs2.wait_for_arduino_ready_and_ack(write_eeprom)
+                rc = self.complete_arduino_handshake(write_eeprom)
                 if rc == RC_SUCCESS:
-                    self.enable_go_button()
-                    self.go_button_status_label["text"] = "     Connected     "
-                    self.after(1000,
-                               self.clear_go_button_status_label)
-                    self.check_arduino_sketch_version()
-                    self.update_config_after_arduino_handshake()
                     return
 
         # If any of the above failed, try again in 1 second
-        self.after(1000, self.attempt_arduino_handshake)
+        self.after(1000, self.attempt_arduino_handshake, False, True)
+
+    # -------------------------------------------------------------------------
+    def poll_arduino_ready_msg(self, write_eeprom, serial_reader, deadline):
+        """Method that runs every ARDUINO_MSG_POLL_MS milliseconds after the
+           Arduino is reset, until the serial reader thread has received
+           the first message from the Arduino. The rest of the handshake
+           is then completed. If no message is received before the
+           deadline, another handshake attempt is scheduled. The
+           polling stops if the Arduino is reset again in the meantime
+           (i.e. the serial reader is replaced).
+        """
+        if (self.ivs2.arduino_ready or
+                self.ivs2.serial_reader is not serial_reader):
+            return
+        if serial_reader.msgs_waiting:
+            rc = self.complete_arduino_handshake(write_eeprom)
+            if rc != RC_SUCCESS:
+                self.after(1000, self.attempt_arduino_handshake, False, True)
+        elif time.time() < deadline:
+            self.after(ARDUINO_MSG_POLL_MS, self.poll_arduino_ready_msg,
+                       write_eeprom, serial_reader, deadline)
+        else:
+            err_str = "ERROR: Timeout waiting for message from Arduino"
+            self.ivs2.logger.log(err_str)
+            self.after(1000, self.attempt_arduino_handshake, False, True)
+
+    # -------------------------------------------------------------------------
+    def complete_arduino_handshake(self, write_eeprom=False):
+        """Method to wait for the Arduino ready message and complete the
+           handshake. If it succeeds, the go button is enabled.
+        """
+        rc = self.ivs2.wait_for_arduino_ready_and_ack(write_eeprom)
+        if rc == RC_SUCCESS:
+            self.enable_go_button()
+            self.go_button_status_label["text"] = "     Connected     "
+            self.after(1000,
+                       self.clear_go_button_status_label)
+            self.check_arduino_sketch_version()
+            self.update_config_after_arduino_handshake()
+
+        return rc
 
     # -------------------------------------------------------------------------
     def clear_go_button_status_label(self):
@@ -1910,7 +1966,8 @@ ERROR: USB port is not connected to IV Swinger 2
                 if rc in (RC_SUCCESS, RC_PV_MODEL_FAILURE):
                     if not self.suppress_cfg_file_copy:
                         self.config.add_axes_and_title()
-                    self.display_img(self.ivs2.current_img)
+                    self.display_img(self.ivs2.current_img,
+                                     self.ivs2.current_img_data)
                     if rc == RC_PV_MODEL_FAILURE:
                         self.show_pv_model_failure_dialog()
             elif rc == RC_NO_POINTS:
@@ -2203,6 +2260,11 @@ ERROR: USB port is not connected to IV Swinger 2
             self.ivs2.clean_up_after_failure(self.ivs2.hdd_output_dir)
             return rc
 
+        # Finish any pipelined runs from a previous loop first, so they
+        # aren't displayed after this run
+        if not loop_mode:
+            self.poll_pipeline(wait=True)
+
         # Clear current_run_displayed flag
         self.current_run_displayed = False
 
@@ -2249,23 +2311,38 @@ ERROR: USB port is not connected to IV Swinger 2
         # Allow copying the .cfg file to the run directory
         self.suppress_cfg_file_copy = False
 
-        # Call the IVS2 method to swing the curve
+        # Call the IVS2 method to swing the curve. If the graphs are
+        # not being saved, the GIF is only generated in memory.
         if loop_mode and (not self.loop_save_results or
                           not self.loop_save_graphs):
             self.ivs2.generate_pdf = False
+            self.ivs2.save_gif = False
+        # In loop mode, the processing and plotting of the run are
+        # pipelined, so the next swing doesn't have to wait for them.
+        # The results are displayed when they are finished (see
+        # poll_pipeline()).
         self.config.remove_axes_and_title()
+        self.ivs2.pipelined = loop_mode
         rc = self.ivs2.swing_curve(loop_mode=loop_mode)
+        self.ivs2.pipelined = False
+        pipelined = loop_mode and rc == RC_SUCCESS
         self.config.add_axes_and_title()
         self.config.update_vref()
         self.ivs2.generate_pdf = True
+        self.ivs2.save_gif = True
 
         plot_ref_failed = (self.ivs2.plot_ref and
                            (rc == RC_PV_MODEL_FAILURE or
                             (rc == RC_SUCCESS and
                              self.ivs2.pv_model.csv_filename is None)))
-        if rc == RC_SUCCESS or plot_ref_failed:
+        if pipelined:
+            # Start polling for the results (unless already polling)
+            if self.pipeline_poll_id is None:
+                self.poll_pipeline()
+        elif rc == RC_SUCCESS or plot_ref_failed:
             # Update the image pane with the new curve GIF
-            self.display_img(self.ivs2.current_img)
+            self.display_img(self.ivs2.current_img,
+                             self.ivs2.current_img_data)
             self.current_run_displayed = True
             if plot_ref_failed and not loop_mode:
                 # Display dialog if Plot Reference checked but a
@@ -2304,6 +2381,10 @@ ERROR: USB port is not connected to IV Swinger 2
             # Captured id is used to cancel when stop button is pressed
             self.swing_loop_id = thread_id
 
+        # Pipelined runs are saved and cleaned up when they are finished
+        if pipelined:
+            return RC_SUCCESS
+
         # Save the config to capture current max x,y values and Vref
         self.save_config()
 
@@ -2315,13 +2396,79 @@ ERROR: USB port is not connected to IV Swinger 2
         return RC_SUCCESS
 
     # -------------------------------------------------------------------------
-    def display_img(self, img_file):
+    def poll_pipeline(self, wait=False):
+        """Method that runs every PIPELINE_POLL_MS milliseconds while there
+           are pipelined runs whose results have not been retrieved. The
+           finished runs are completed in the order that they were
+           swung. If wait is True, it waits for all of the runs to
+           finish.
+        """
+        if self.pipeline_poll_id is not None:
+            self.after_cancel(self.pipeline_poll_id)
+            self.pipeline_poll_id = None
+        for (rc, run_ivs2) in self.ivs2.get_pipeline_results(wait=wait):
+            self.finish_pipelined_run(rc, run_ivs2)
+        if self.ivs2.pipeline_pending:
+            self.pipeline_poll_id = self.after(PIPELINE_POLL_MS,
+                                               self.poll_pipeline)
+
+    # -------------------------------------------------------------------------
+    def finish_pipelined_run(self, rc, run_ivs2):
+        """Method to do what swing_loop() does after the processing and
+           plotting of a run that is not pipelined. The run_ivs2 object
+           is the copy of the IVS2 object that processed the run.
+        """
+        plot_ref_failed = (run_ivs2.plot_ref and
+                           (rc == RC_PV_MODEL_FAILURE or
+                            (rc == RC_SUCCESS and
+                             run_ivs2.pv_model.csv_filename is None)))
+        if rc == RC_SUCCESS or plot_ref_failed:
+            # Carry the values that the run updated over to the IVS2
+            # object for the next runs
+            self.ivs2.plot_max_x = run_ivs2.plot_max_x
+            self.ivs2.plot_max_y = run_ivs2.plot_max_y
+            self.ivs2.prev_est_cell_temp_c = run_ivs2.prev_est_cell_temp_c
+            # Update the image pane with the new curve GIF
+            self.display_img(run_ivs2.current_img, run_ivs2.current_img_data)
+            self.current_run_displayed = True
+            # Save the config to capture current max x,y values and
+            # Vref (copying it to the run directory if it is kept)
+            copy_dir = None
+            if self.loop_save_results:
+                copy_dir = run_ivs2.hdd_output_dir
+            self.config.save(copy_dir=copy_dir)
+            # Clean up files, depending on options
+            run_ivs2.clean_up_files(run_ivs2.hdd_output_dir, True,
+                                    self.loop_save_results,
+                                    self.loop_save_graphs)
+        elif (not self.loop_stop_on_err and
+              rc in (RC_ZERO_ISC, RC_ZERO_VOC, RC_ISC_TIMEOUT)):
+            # Non-fatal error, so just display the error message on the
+            # screen and clean up
+            self.display_screen_err_msg(rc, run_ivs2.hdd_output_dir)
+            run_ivs2.clean_up_after_failure(run_ivs2.hdd_output_dir)
+        else:
+            # Otherwise stop looping (if it hasn't been stopped already)
+            # and display the reason in a dialog
+            if self.looping:
+                self.stop_actions(event=None)
+            self.show_error_dialog(rc)
+            run_ivs2.clean_up_after_failure(run_ivs2.hdd_output_dir)
+
+    # -------------------------------------------------------------------------
+    def display_img(self, img_file, img_data=None):
         """Method to display an image (from a file) in the image pane. This
            method does not do any scaling, so the image is displayed at
-           its native size.
+           its native size. If the image contents are provided in the
+           img_data parameter, they are used instead of reading the
+           file. In that case, the file may not exist (img_file may be
+           None).
         """
         self.img_file = img_file
-        new_img = tk.PhotoImage(file=img_file)
+        if img_data is not None:
+            new_img = tk.PhotoImage(data=img_data)
+        else:
+            new_img = tk.PhotoImage(file=img_file)
         self.img_pane.configure(image=new_img)
         self.img_pane.configure(text="")
         self.img_pane.image = new_img
@@ -2331,14 +2478,17 @@ ERROR: USB port is not connected to IV Swinger 2
         self.update_idletasks()
 
     # -------------------------------------------------------------------------
-    def display_screen_err_msg(self, rc):
+    def display_screen_err_msg(self, rc, run_dir=None):
         """Method to display an error message in the image pane. This is used
            for non-fatal errors that are detected while looping when
            the stop-on-error option is not enabled. It is also used for
-           all errors when the swing is initiated by remote command.
+           all errors when the swing is initiated by remote command. The
+           run_dir parameter defaults to the current run's directory.
         """
         # pylint: disable=too-many-branches
-        dts = IV_Swinger2.extract_date_time_str(self.ivs2.hdd_output_dir)
+        if run_dir is None:
+            run_dir = self.ivs2.hdd_output_dir
+        dts = IV_Swinger2.extract_date_time_str(run_dir)
         xlated = IV_Swinger2.xlate_date_time_str(dts)
         (xlated_date, xlated_time) = xlated
         screen_msg = f"{xlated_date}@{xlated_time}"
@@ -2526,7 +2676,18 @@ ERROR: USB port is not connected to IV Swinger 2
                     return
             for gui in instance_guis:
                 gui.close_gui()
-        # Clean up before closing
+        # Clean up before closing, after waiting for any pipelined runs
+        # to finish
+        if self.pipeline_poll_id is not None:
+            self.after_cancel(self.pipeline_poll_id)
+            self.pipeline_poll_id = None
+        for (rc, run_ivs2) in self.ivs2.shutdown_pipeline():
+            if rc in (RC_SUCCESS, RC_PV_MODEL_FAILURE):
+                run_ivs2.clean_up_files(run_ivs2.hdd_output_dir, True,
+                                        self.loop_save_results,
+                                        self.loop_save_graphs)
+            else:
+                run_ivs2.clean_up_after_failure(run_ivs2.hdd_output_dir)
         if self.overlay_dir is not None:
             self.results_wiz.rm_overlay_if_unfinished()
             self.ivs2.clean_up_files(self.overlay_dir)
@@ -2586,7 +2747,7 @@ ERROR: USB port is not connected to IV Swinger 2
            app is started. This method blocks until the GUI is closed.
         """
         if not self.ivs2.usb_port == "DISCONNECTED":
-            self.after(100, self.attempt_arduino_handshake)
+            self.after(100, self.attempt_arduino_handshake, False, True)
         self.start_on_top()
         self.root.protocol("WM_DELETE_WINDOW", self.close_gui)
         if self.instance is None:
@@ -2766,7 +2927,13 @@ class ResultsWizard(tk.Toplevel):
         self.master = master
         self.title("Results Wizard")
         self.results_dir = self.master.ivs2.app_data_dir
+        index_filename = os.path.join(self.master.ivs2.app_data_dir,
+                                      IV_Swinger2.RESULTS_INDEX_FILENAME)
+        self.results_index = IV_Swinger2.ResultsIndex(
+            index_filename, file_prefix=self.master.ivs2.file_prefix,
+            logger=self.master.ivs2.logger)
         self.run_dir = None
+        self.runs_by_date = None
         self.chron_dir = None
         self.copy_dest = None
         self.dates = None
@@ -2938,6 +3105,7 @@ class ResultsWizard(tk.Toplevel):
         self.treescroll = ttk.Scrollbar(self.treebox, command=self.tree.yview)
         self.tree.configure(yscroll=self.treescroll.set)
         self.tree.bind("<<TreeviewSelect>>", self.select)
+        self.tree.bind("<<TreeviewOpen>>", self.open_date)
         self.configure_tree_size()
         self.tree.insert("", "end", text="WORKING...")
         self.master.root.after(100, self.populate_tree)
@@ -2955,35 +3123,28 @@ class ResultsWizard(tk.Toplevel):
            of those can be opened (expanded) to see the runs from that
            day.  There is also a top level item for the overlays, and it
            has all of the overlays under it.
+
+           The runs are obtained from the results index, so only the
+           run directories that are new or have changed since the last
+           time are read. The run items under each date are not added
+           until the date is opened (or its runs are needed).
         """
         # Remove any prior contents
         self.delete_all()
         self.dates = []
+        self.runs_by_date = {}
 
-        # Get a list of all of the subdirectories (and files) in the
-        # results directory - newest first
-        subdirs = sorted(os.listdir(self.results_dir), reverse=True)
-
-        # Step through each one
-        for subdir in subdirs:
-            # Skip files and empty directories
-            full_path = os.path.join(self.results_dir, subdir)
-            if not os.path.isdir(full_path):
-                continue
-            try:
-                if not os.listdir(full_path):
-                    continue
-            except PermissionError:
-                continue
-
-            # First handle overlays
-            if subdir == "overlays":
-                self.populate_overlays(subdir)
+        # First handle overlays (skip if empty)
+        overlays_dir = os.path.join(self.results_dir, "overlays")
+        try:
+            if os.path.isdir(overlays_dir) and os.listdir(overlays_dir):
+                self.populate_overlays("overlays")
+        except PermissionError:
+            pass
 
-            # Then filter out anything that isn't a directory in the
-            # canonical date/time string format - these are the runs
-            if IV_Swinger2.is_date_time_str(subdir):
-                self.populate_runs(subdir)
+        # Then the runs (newest first)
+        for run in self.results_index.get_runs(self.results_dir):
+            self.populate_runs(run)
 
         # If there are no overlays or run directories, insert a dummy item
         if not self.tree.exists("overlays") and not self.dates:
@@ -3042,28 +3203,32 @@ class ResultsWizard(tk.Toplevel):
                 self.tree.insert(subdir, "end", iid, text=text)
 
     # -------------------------------------------------------------------------
-    def populate_runs(self, subdir):
-        """Method to populate the runs part of the Treeview.
+    def populate_runs(self, run):
+        """Method to populate the runs part of the Treeview, given a results
+           index entry for the run. The date item is added to the tree,
+           but the run's time item is not added until the date is
+           filled.
         """
         # Translate to human readable date and time
+        subdir = run.dts
         xlated = IV_Swinger2.xlate_date_time_str(subdir)
         (xlated_date, xlated_time) = xlated
         date = subdir.split("_")[0]
 
         # Add a date item (parent to time items) if it doesn't already
-        # exist
+        # exist. It gets a placeholder child so that it can be opened.
         if not self.tree.exists(date):
             self.tree.insert("", "end", date, text=xlated_date)
+            self.tree.insert(date, "end", f"placeholder_{date}",
+                             text="WORKING...")
             # Add it to the list of all dates for the expand_all
             # and collapse_all methods
             self.dates.append(date)
+            self.runs_by_date[date] = []
 
         # Get the title from the saved config
-        title = None
-        run_dir = self.get_run_dir(subdir)
-        cfg_file = os.path.join(run_dir, f"{APP_NAME}.cfg")
-        if Path(cfg_file).exists():
-            title = IV_Swinger2.get_saved_title(cfg_file)
+        if run.has_cfg:
+            title = run.title
         else:
             title = "   * no saved cfg *"
         if title == "None" or title is None:
@@ -3072,9 +3237,30 @@ class ResultsWizard(tk.Toplevel):
             title_str = f"   {title}"
             self.master.overlay_names[subdir] = title
 
-        # Add child time item (iid is full date_time_str)
+        # Save child time item (iid is full date_time_str)
         text = xlated_time + title_str
-        self.tree.insert(date, "end", subdir, text=text)
+        self.runs_by_date[date].append((subdir, text))
+
+    # -------------------------------------------------------------------------
+    def fill_date(self, date):
+        """Method to add the time items for all of the runs of a date to the
+           Treeview, replacing the date's placeholder child. Nothing is
+           done if the date has already been filled.
+        """
+        placeholder = f"placeholder_{date}"
+        if not self.tree.exists(placeholder):
+            return
+        self.tree.delete(placeholder)
+        for (subdir, text) in self.runs_by_date[date]:
+            self.tree.insert(date, "end", subdir, text=text)
+
+    # -------------------------------------------------------------------------
+    def open_date(self, event=None):
+        """Method to handle an open event from the Treeview"""
+        # pylint: disable=unused-argument
+        item = self.tree.focus()
+        if item in self.runs_by_date:
+            self.fill_date(item)
 
     # -------------------------------------------------------------------------
     def delete_all(self):
@@ -3115,6 +3301,7 @@ class ResultsWizard(tk.Toplevel):
         self.master.overlay_mode = False
         self.master.overlay_dir = None
         self.master.results_wiz = None
+        self.results_index.close()
         self.destroy()
 
     # -------------------------------------------------------------------------
@@ -3457,6 +3644,7 @@ class ResultsWizard(tk.Toplevel):
             # Get the list of runs to import from the current tree
             import_runs = []
             for date in self.dates:
+                self.fill_date(date)
                 for run in self.tree.get_children(date):
                     run_path = os.path.join(self.results_dir, run)
                     import_runs.append(run_path)
@@ -3502,6 +3690,7 @@ class ResultsWizard(tk.Toplevel):
         log_user_action(self.master.ivs2.logger, msg)
 
         for date in self.dates:
+            self.fill_date(date)
             self.tree.item(date, open=True)
 
     # -------------------------------------------------------------------------
@@ -3653,6 +3842,7 @@ class ResultsWizard(tk.Toplevel):
                    IV_Swinger2.is_date_time_str(selections[-1]))):
                 # Whole day (but not in the middle of a range of
                 # individual runs)
+                self.fill_date(selection)
                 for child in self.tree.get_children(selection):
                     # Add all the day's runs to the list
                     selected_runs.append(os.path.join(self.results_dir, child))
@@ -4602,7 +4792,8 @@ class ResultsWizard(tk.Toplevel):
         if self.master.axes_locked.get() == "Lock":
             self.ivp.max_x = self.master.ivs2.plot_max_x
             self.ivp.max_y = self.master.ivs2.plot_max_y
-        self.ivp.run()
+        with IV_Swinger2.PYPLOT_LOCK:
+            self.ivp.run()
         self.overlay_img = self.ivp.current_img
 
     # -------------------------------------------------------------------------
@@ -4977,6 +5168,7 @@ Copyright (C) 2017-2023  Chris Satterlee
         """
         msg = """(MenuBar, File) selected "View Log File" entry"""
         log_user_action(self.master.ivs2.logger, msg)
+        self.master.ivs2.logger.flush()
         (log_dir,
          log_file) = os.path.split(self.master.ivs2.logger.log_file_name)
         options = {}
@@ -7462,7 +7654,8 @@ calibration, NO to cancel."""
             self.master.save_config()
             if rc == RC_SUCCESS:
                 # Display curve
-                self.master.display_img(self.master.ivs2.current_img)
+                self.master.display_img(self.master.ivs2.current_img,
+                                        self.master.ivs2.current_img_data)
                 if not self.curve_looks_ok:
                     # Ask user if curve looks OK
                     title_str = "Good battery curve?"
@@ -9293,7 +9486,8 @@ it and then edit the parameter values.
         self.master.ivs2.gen_pv_test_curve()
 
         # Display the image
-        self.master.display_img(self.master.ivs2.current_img)
+        self.master.display_img(self.master.ivs2.current_img,
+                                self.master.ivs2.current_img_data)
 
         # Save the config with the PV test curve mods
         self.save_config_for_pv_test()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+"""IV Swinger 2 multi-rig module"""
+#
+###############################################################################
+#
+# IV_Swinger2_multi.py: IV Swinger 2 multi-rig module
+#
+# Copyright (C) 2026  Chris Satterlee
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+#
+# IV Swinger and IV Swinger 2 are open source hardware and software
+# projects
+#
+# Permission to use the hardware designs is granted under the terms of
+# the TAPR Open Hardware License Version 1.0 (May 25, 2007) -
+# http://www.tapr.org/OHL
+#
+# Permission to use the software is granted under the terms of the GNU
+# GPL v3 as noted above.
+#
+# Current versions of the licensing files, documentation, hardware
+# design files, and software can be found at:
+#
+#    https://github.com/csatt/IV_Swinger
+#
+###############################################################################
+#
+# This file contains the Python code that drives several IV Swinger 2
+# "rigs" (one Arduino, and one PV module, per USB port) at the same time
+# without a GUI. It is intended for test stands where a number of PV
+# modules are measured side by side and it is important that all of
+# them are measured under the same conditions (irradiance in
+# particular).
+#
+# Each rig has its own IV_Swinger2 object, with its own app data
+# directory (and therefore its own configuration) under the "rigs"
+# folder of the main app data directory. The curves of all of the rigs
+# are swung concurrently, one thread per rig. Optionally (and by
+# default), the threads wait for each other immediately before
+# swinging, so the curves are swung within a few milliseconds of each
+# other. The results of each batch of swings are collected in a single
+# timestamped batch directory:
+#
+#     <app data dir>/batches/batch_<date_time_str>/
+#         batch_summary.csv
+#         <rig name>/<date_time_str>/...  (normal run directory)
+#
+# A failure on one rig (including an unexpected exception) is logged
+# and recorded in the batch summary, but it does not affect the other
+# rigs.
+#
+# The ADC data is received and processed for all of the rigs
+# concurrently, but the plotting of the results is done one rig at a
+# time, since pyplot is not thread-safe (see IV_Swinger2.PYPLOT_LOCK).
+#
+# This module may be used standalone, or it may be imported.
+#
+import argparse
+import concurrent.futures
+import csv
+import os
+from pathlib import Path
+import re
+import threading
+import traceback
+import IV_Swinger
+import IV_Swinger2
+
+#################
+#   Constants   #
+#################
+RIGS_FOLDER_NAME = "rigs"
+BATCHES_FOLDER_NAME = "batches"
+BATCH_SUMMARY_FILENAME = "batch_summary.csv"
+BATCH_SUMMARY_FIELDS = ["Rig", "USB port", "Status", "Run directory",
+                        "Isc (A)", "Voc (V)", "MPP (V)", "MPP (A)",
+                        "MPP (W)"]
+SYNC_START_TIMEOUT = 30.0  # seconds
+
+
+########################
+#   Global functions   #
+########################
+def get_rig_name(usb_port):
+    """Global function to derive a rig name (that is safe to use as a
+       directory name) from the name of its USB port
+    """
+    return re.sub(r"\W+", "_", usb_port).strip("_")
+
+
+#################
+#   Classes     #
+#################
+
+
+# Rig class
+#
+class Rig():
+    """Holds the IV_Swinger2 object and configuration for one rig, along with
+       the results of its most recent swing
+    """
+    # pylint: disable=too-few-public-methods
+
+    # Initializer
+    def __init__(self, usb_port, app_data_dir, logger, usb_ports_in_use):
+        self.usb_port = usb_port
+        self.name = get_rig_name(usb_port)
+        self.ivs2 = IV_Swinger2.IV_Swinger2(app_data_dir, logger,
+                                            usb_ports_in_use)
+        self.ivs2.usb_port = usb_port
+        self.config = IV_Swinger2.Configuration(ivs2=self.ivs2)
+        self.rc = IV_Swinger2.RC_SUCCESS
+        self.run_dir = None
+
+    # ---------------------------------
+    @property
+    def summary_values(self):
+        """List of the values for this rig's row of the batch summary"""
+        values = [self.name, self.usb_port, IV_Swinger2.RC_NAMES[self.rc],
+                  self.run_dir if self.run_dir is not None else ""]
+        data_points = self.ivs2.data_points
+        if self.rc == IV_Swinger2.RC_SUCCESS and data_points:
+            values += [f"{data_points[0][IV_Swinger.AMPS_INDEX]:.4f}",
+                       f"{data_points[-1][IV_Swinger.VOLTS_INDEX]:.4f}",
+                       f"{self.ivs2.mpp_volts:.4f}",
+                       f"{self.ivs2.mpp_amps:.4f}",
+                       f"{self.ivs2.mpp_watts:.4f}"]
+        else:
+            values += [""] * 5
+        return values
+
+
+# Multi-rig orchestrator class
+#
+class MultiRigOrchestrator():
+    """Discovers the Arduinos connected to this computer and swings IV
+       curves on all of them concurrently
+    """
+
+    # Initializer
+    def __init__(self, app_data_dir=None, usb_ports=None, sync_start=True):
+        # The app data directory must be an absolute path because the
+        # batch and run directories are derived from it, and they must
+        # not depend on the current directory
+        self.app_data_dir = IV_Swinger2.get_abs_app_data_dir(app_data_dir)
+        self.sync_start = sync_start
+        self.rigs = []
+        self.batch_dir = None
+        # The IV_Swinger2 object used to find the ports also creates
+        # the log file that is shared by all of the rigs
+        self.ivs2 = IV_Swinger2.IV_Swinger2(self.app_data_dir)
+        self.logger = self.ivs2.logger
+        self.ivs2.find_serial_ports()
+        self.usb_ports = usb_ports
+        if self.usb_ports is None:
+            self.usb_ports = self.ivs2.find_arduino_ports()
+
+    # -------------------------------------------------------------------------
+    def open_rigs(self):
+        """Method to create a Rig object for each USB port and to establish
+           communication with its Arduino. The rigs are opened
+           concurrently. Rigs that fail to open are logged and dropped.
+           Returns the number of rigs that were opened successfully.
+        """
+        for usb_port in self.usb_ports:
+            rig_app_data_dir = os.path.join(self.app_data_dir,
+                                            RIGS_FOLDER_NAME,
+                                            get_rig_name(usb_port))
+            Path(rig_app_data_dir).mkdir(parents=True, exist_ok=True)
+            rig = Rig(usb_port, rig_app_data_dir, self.logger,
+                      self.usb_ports)
+            rig.ivs2.serial_ports = self.ivs2.serial_ports
+            self.rigs.append(rig)
+        self.run_on_all_rigs(self.open_rig)
+        for rig in self.rigs:
+            if rig.rc != IV_Swinger2.RC_SUCCESS:
+                err_str = (f"ERROR: Rig {rig.name} could not be opened "
+                           f"({IV_Swinger2.RC_NAMES[rig.rc]})")
+                self.logger.print_and_log(err_str)
+                rig.ivs2.close_usb()
+        self.rigs = [rig for rig in self.rigs
+                     if rig.rc == IV_Swinger2.RC_SUCCESS]
+
+        return len(self.rigs)
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def open_rig(rig):
+        """Method to read the rig's configuration, reset its Arduino and wait
+           for it to be ready
+        """
+        rig.config.get()
+        rig.ivs2.usb_port = rig.usb_port  # Port is not from config
+        rc = rig.ivs2.reset_arduino()
+        if rc == IV_Swinger2.RC_SUCCESS:
+            rc = rig.ivs2.wait_for_arduino_ready_and_ack()
+        rig.rc = rc
+
+    # -------------------------------------------------------------------------
+    def run_on_all_rigs(self, rig_func, *args):
+        """Method to call rig_func(rig, *args) for every rig, each in its own
+           thread, and wait for all of them to finish. An exception in
+           one rig's thread is logged and recorded as an RC_FAILURE for
+           that rig only.
+        """
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, len(self.rigs))) as executor:
+            futures = {executor.submit(rig_func, rig, *args): rig
+                       for rig in self.rigs}
+            for future in concurrent.futures.as_completed(futures):
+                rig = futures[future]
+                try:
+                    future.result()
+                except Exception:  # pylint: disable=broad-exception-caught
+                    rig.rc = IV_Swinger2.RC_FAILURE
+                    err_str = (f"ERROR: Rig {rig.name} failed with "
+                               f"exception:\n{traceback.format_exc()}")
+                    self.logger.print_and_log(err_str)
+
+    # -------------------------------------------------------------------------
+    def swing_batch(self):
+        """Method to swing one IV curve on each of the open rigs and collect
+           the results in a new batch directory. Returns the list of
+           rigs whose curves were swung successfully.
+        """
+        date_time_str = IV_Swinger.DateTimeStr.get_date_time_str()
+        self.batch_dir = os.path.join(self.app_data_dir, BATCHES_FOLDER_NAME,
+                                      f"batch_{date_time_str}")
+        Path(self.batch_dir).mkdir(parents=True)
+        self.logger.log(f"Batch directory: {self.batch_dir}")
+        start_barrier = None
+        if self.sync_start:
+            start_barrier = threading.Barrier(len(self.rigs),
+                                              timeout=SYNC_START_TIMEOUT)
+        self.run_on_all_rigs(self.swing_rig, start_barrier)
+        for rig in self.rigs:
+            rig.run_dir = rig.ivs2.hdd_output_dir
+            if rig.run_dir is None or not Path(rig.run_dir).exists():
+                rig.run_dir = None
+            elif rig.rc != IV_Swinger2.RC_SUCCESS:
+                rig.ivs2.clean_up_after_failure(rig.run_dir)
+                if not Path(rig.run_dir).exists():
+                    rig.run_dir = None
+        self.write_batch_summary()
+
+        return [rig for rig in self.rigs if rig.rc == IV_Swinger2.RC_SUCCESS]
+
+    # -------------------------------------------------------------------------
+    def swing_rig(self, rig, start_barrier):
+        """Method to swing one rig's IV curve. If start_barrier is not None,
+           this waits for all of the other rigs to be ready to swing
+           too.
+        """
+        rig.rc = IV_Swinger2.RC_FAILURE
+        rig.ivs2.hdd_output_dir = None
+        if start_barrier is not None:
+            try:
+                start_barrier.wait()
+            except threading.BrokenBarrierError:
+                warn_str = (f"WARNING: Rig {rig.name} timed out waiting for "
+                            f"synchronized start")
+                self.logger.print_and_log(warn_str)
+
+        # The subdir is an absolute path, so the run directory is in
+        # the batch directory rather than in the rig's app data
+        # directory
+        subdir = os.path.join(self.batch_dir, rig.name)
+        rig.rc = rig.ivs2.swing_curve(subdir=subdir, process_adc=False)
+        if rig.rc != IV_Swinger2.RC_SUCCESS:
+            return
+
+        # Process ADC values and plot results
+        rig.rc, _ = rig.ivs2.process_adc_values_and_plot_results()
+        if rig.rc != IV_Swinger2.RC_SUCCESS:
+            return
+
+        # Save a copy of the config in the run directory
+        rig.config.populate()
+        rig.config.add_axes_and_title()
+        rig.config.save(rig.ivs2.hdd_output_dir)
+        rig.ivs2.clean_up_files(rig.ivs2.hdd_output_dir)
+
+    # -------------------------------------------------------------------------
+    def write_batch_summary(self):
+        """Method to write the batch summary CSV file, with one row per
+           rig
+        """
+        summary_filename = os.path.join(self.batch_dir,
+                                        BATCH_SUMMARY_FILENAME)
+        with open(summary_filename, "w", encoding="utf-8",
+                  newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(BATCH_SUMMARY_FIELDS)
+            for rig in self.rigs:
+                writer.writerow(rig.summary_values)
+        self.logger.print_and_log(f"Batch summary: {summary_filename}")
+
+    # -------------------------------------------------------------------------
+    def close_rigs(self):
+        """Method to close the USB ports of all of the rigs"""
+        for rig in self.rigs:
+            rig.ivs2.close_usb()
+
+
+############
+#   Main   #
+############
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Swing IV curves on several IV Swinger 2 rigs at once")
+    parser.add_argument("--ports", nargs="+", metavar="PORT",
+                        help=("USB ports of the rigs (default: all ports "
+                              "that appear to be connected to an Arduino)"))
+    IV_Swinger2.add_app_data_dir_arg(parser)
+    parser.add_argument("--batches", type=int, default=1,
+                        help="Number of batches to swing (default: 1)")
+    parser.add_argument("--no-sync", action="store_true",
+                        help="Don't synchronize the start of the swings")
+    args = parser.parse_args()
+
+    orchestrator = MultiRigOrchestrator(app_data_dir=args.app_data_dir,
+                                        usb_ports=args.ports,
+                                        sync_start=not args.no_sync)
+    if not orchestrator.usb_ports:
+        orchestrator.logger.print_and_log("ERROR: No Arduino ports found")
+        return
+    if not orchestrator.open_rigs():
+        orchestrator.logger.print_and_log("ERROR: No rigs could be opened")
+        return
+    for _ in range(args.batches):
+        ok_rigs = orchestrator.swing_batch()
+        msg_str = (f"  {len(ok_rigs)} of {len(orchestrator.rigs)} rigs OK. "
+                   f"Results in: {orchestrator.batch_dir}")
+        orchestrator.logger.print_and_log(msg_str)
+    orchestrator.close_rigs()
+    orchestrator.logger.terminate_log()
+
+
+# Boilerplate main() call
+if __name__ == "__main__":
+    main()
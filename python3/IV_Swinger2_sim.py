@@ -2749,6 +2749,7 @@ class SimulatorDialog(tk.Toplevel):
             err_msg = ("Oops. Something went wrong\n"
                        "See log file for details.")
             tkmsg.showerror(message=err_msg)
+            self.ivs2_sim.logger.flush()
             IV_Swinger2.sys_view_file(self.ivs2_sim.logger.log_file_name)
             return
 
@@ -3165,6 +3166,7 @@ class SimulatorDialog(tk.Toplevel):
             err_msg = ("Oops. Something went wrong\n"
                        "See log file for details.")
             tkmsg.showerror(message=err_msg)
+            self.ivs2_sim.logger.flush()
             IV_Swinger2.sys_view_file(self.ivs2_sim.logger.log_file_name)
             if self.results_tab is not None:
                 self.results_tab.destroy()
@@ -180,12 +180,21 @@
 # Voc and Isc are provided and the temperature and/or irradiance are
 # derived.
 #
+import argparse
+import collections
+import concurrent.futures
+import copy
 import datetime as dt
 import csv
+import functools
+import itertools
+import json
+import os
 from pathlib import Path
+import threading
 import warnings
 import numpy as np
-from scipy.optimize import root
+from scipy.optimize import least_squares, root
 from scipy import __version__ as scipy_version
 
 #################
@@ -196,6 +205,16 @@ DEFAULT_I0_GUESSES = [1e-8, 1e-9, 1e-10, 3e-8]
 DEFAULT_RS_GUESSES = [0.1, 0.2, 0.0, 0.6, 0.7, 0.9, 0.5]
 DEFAULT_RSH_GUESSES = [1e15, 100]
 DEFAULT_ERR_THRESH = 0.001
+PARMS_CACHE_MAX_ENTRIES = 256
+PARMS_CACHE_TEMP_RESOLUTION = 0.01  # degrees C
+NEWTON_MAX_ITERATIONS = 50
+NEWTON_XTOL = 1e-12
+SECANT_MAX_STEP_RATIO = 4.0
+FIT_MIN_A = 1e-6
+FIT_MIN_I0 = 1e-15  # amps
+FIT_MAX_I0 = 1e-3  # amps
+FIT_MIN_RSH = 1e-2  # ohms
+FIT_MAX_RSH = 1e6  # ohms
 
 # Other constants
 STC_IRRAD = 1000.0
@@ -235,6 +254,98 @@ def test_i_given_v_and_parms(amps, volts, il_i0_a_rs_rsh):
     return il - i0 * np.expm1(exp_term) - (volts + amps*rs)/rsh - amps
 
 
+def solve_i_given_v_and_parms(volts, il_i0_a_rs_rsh, amps_guess,
+                              max_iterations=NEWTON_MAX_ITERATIONS):
+    """Function to find the currents that satisfy the single-diode equation
+       for an array of voltages, given the five parameter values: IL,
+       I0, A, Rs and Rsh. This solves the same equation as
+       test_i_given_v_and_parms (including its limit on the exponent),
+       but for all of the voltages at once, using Newton's method with
+       the analytic derivative. All of the iterations start at the
+       amps_guess value.
+
+       A tuple is returned containing the array of currents and a
+       boolean array indicating which of them converged. The caller
+       should use the SciPy root solver for the points that did not
+       converge.
+    """
+    # pylint: disable=too-many-locals
+    il, i0, a, rs, rsh = il_i0_a_rs_rsh
+    volts = np.asarray(volts, dtype=float)
+    amps = np.full(volts.shape, float(amps_guess))
+    converged = np.zeros(volts.shape, dtype=bool)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for _ in range(max_iterations):
+            active = ~converged
+            if not active.any():
+                break
+            v_plus_irs = volts[active] + amps[active] * rs
+            exp_term = v_plus_irs / a
+            limited = exp_term >= 100
+            exp_term = np.where(limited, 100, exp_term)
+            func = (il - i0 * np.expm1(exp_term) - v_plus_irs / rsh -
+                    amps[active])
+            deriv = (np.where(limited, 0.0, -i0 * rs / a * np.exp(exp_term)) -
+                     rs / rsh - 1.0)
+            step = func / deriv
+            amps[active] -= step
+            tol = NEWTON_XTOL * np.maximum(1.0, np.abs(amps[active]))
+            converged[active] = np.abs(step) <= tol
+    converged &= np.isfinite(amps)
+    return amps, converged
+
+
+def test_measured_points(il_log_i0_a_rs_log_rsh, volts, amps):
+    """Function to test the five parameter values (IL, I0, A, Rs and Rsh)
+       against arrays of measured voltage and current values. The
+       single-diode equation is evaluated for every point (with the same
+       limit on the exponent as test_i_given_v_and_parms) and the array
+       of the differences is returned. This function is intended to be
+       passed to the SciPy least_squares solver by the
+       fit_parms_to_points function. Since I0 and Rsh may span many
+       orders of magnitude, the solver works with their natural logs.
+    """
+    il, log_i0, a, rs, log_rsh = il_log_i0_a_rs_log_rsh
+    v_plus_irs = volts + amps * rs
+    exp_term = np.minimum(v_plus_irs / a, 100)
+    return (il - np.exp(log_i0) * np.expm1(exp_term) -
+            v_plus_irs / np.exp(log_rsh) - amps)
+
+
+def fit_parms_to_points(volts, amps, il_i0_a_rs_rsh):
+    """Function to use the SciPy least_squares solver to find the values of
+       the IL, I0, A, Rs and Rsh parameters that best fit the measured
+       points (arrays of voltage and current values), starting from the
+       specified parameter values. A tuple is returned containing an
+       array of the fitted parameters, the RMS value of the single-diode
+       equation differences (in amps) and a flag that is True if the
+       solver converged.
+
+       I0 and Rsh are bounded to physically plausible ranges
+       (FIT_MIN_I0 to FIT_MAX_I0 and FIT_MIN_RSH to FIT_MAX_RSH).
+       Otherwise, the fitted Rsh of a curve whose Isc end is flat has
+       no upper limit. If the fitted Rsh is at the upper bound, it is
+       too high to be determined from the points, and it is returned
+       as infinity.
+    """
+    il, i0, a, rs, rsh = il_i0_a_rs_rsh
+    volts = np.asarray(volts, dtype=float)
+    amps = np.asarray(amps, dtype=float)
+    bounds = ([0.0, np.log(FIT_MIN_I0), FIT_MIN_A, 0.0,
+               np.log(FIT_MIN_RSH)],
+              [np.inf, np.log(FIT_MAX_I0), np.inf, np.inf,
+               np.log(FIT_MAX_RSH)])
+    x0 = np.clip([il, np.log(i0), a, rs, np.log(rsh)], *bounds)
+    with np.errstate(over="ignore"):
+        sol = least_squares(test_measured_points, x0, bounds=bounds,
+                            args=(volts, amps), x_scale="jac")
+    il, log_i0, a, rs, log_rsh = sol.x
+    rsh = np.inf if sol.active_mask[4] == 1 else np.exp(log_rsh)
+    parms = np.array([il, np.exp(log_i0), a, rs, rsh])
+    rms_err = float(np.sqrt(np.mean(sol.fun**2)))
+    return (parms, rms_err, sol.success)
+
+
 def test_voc(voc, il_i0_a_rsh):
     """Function to test a Voc value to determine how close it is to
        satisfying the single-diode equation, given the four parameter
@@ -492,7 +603,7 @@ def test_first_four_parms(il_i0_a_rs, rsh_voc_isc_vmp_imp_ignore_eq4):
 
 
 def find_parms(voc_isc_vmp_imp, il_guess, i0_guesses, a_guess, rs_guesses,
-               rsh_guesses, err_thresh):
+               rsh_guesses, err_thresh, executor=None):
     """Function to use the SciPy root solver to find the values of the IL,
        I0, A, Rs and Rsh parameters.
 
@@ -530,77 +641,153 @@ def find_parms(voc_isc_vmp_imp, il_guess, i0_guesses, a_guess, rs_guesses,
        ignore_eq4 to True, which causes the root solver to be "fooled"
        into thinking that equation #4 is always satified. This results
        in an imperfect modeling, but usually better than nothing.
+
+       If an executor (e.g. a concurrent.futures.ProcessPoolExecutor)
+       is provided, the root solver calls for the different
+       combinations of guesses are run in parallel using that
+       executor. The result is identical to that of the serial search
+       (see find_parms_in_parallel).
     """
     # pylint: disable=too-many-arguments
+    solve = functools.partial(solve_with_guesses, voc_isc_vmp_imp,
+                              il_guess, a_guess)
+    guess_combos = get_guess_combos(i0_guesses, rs_guesses, rsh_guesses)
+    if executor is not None:
+        return find_parms_in_parallel(solve, guess_combos, err_thresh,
+                                      executor)
+    solutions = (solve(guess_combo) for guess_combo in guess_combos)
+    return get_best_solution(solutions, err_thresh)
+
+
+def get_guess_combos(i0_guesses, rs_guesses, rsh_guesses):
+    """Function to return the list of the combinations of guesses that
+       find_parms tries, in the order that it tries them. Each
+       combination is an (ignore_eq4, use_eq5, rsh_guess, i0_guess,
+       rs_guess) tuple.
+    """
+    return list(itertools.product([False, True], [True, False],
+                                  rsh_guesses, i0_guesses, rs_guesses))
+
+
+def solve_with_guesses(voc_isc_vmp_imp, il_guess, a_guess, guess_combo):
+    """Function to run the SciPy root solver for one combination of guesses
+       (see get_guess_combos). A tuple is returned containing the
+       parameters (IL, I0, A, Rs and Rsh), the equation results and the
+       worst (largest) absolute value of the equation results.
+    """
     # pylint: disable=too-many-locals
-    # pylint: disable=too-many-nested-blocks
     voc, isc, vmp, imp = voc_isc_vmp_imp
+    ignore_eq4, use_eq5, rsh_guess, i0_guess, rs_guess = guess_combo
+    with warnings.catch_warnings():
+        # Suppress printing annoying messages for cases that aren't
+        # working out
+        filter_str = "The iteration is not making good progress"
+        warnings.filterwarnings("ignore", filter_str, RuntimeWarning)
+        filter_str = "The number of calls to function has reached maxfev"
+        warnings.filterwarnings("ignore", filter_str, RuntimeWarning)
+        if use_eq5:
+            # Run SciPy root solver, using test_parms function with
+            # guesses for all five parameters and specified values for
+            # Voc, isc, vmp and imp
+            guesses = [il_guess, i0_guess, a_guess, rs_guess, rsh_guess]
+            sol = root(test_parms, guesses,
+                       args=[voc, isc, vmp, imp, ignore_eq4])
+        else:
+            # Run SciPy root solver, using test_first_four_parms
+            # function with guesses for first four parameters and
+            # specified values for rsh, Voc, isc, vmp and imp
+            guesses = [il_guess, i0_guess, a_guess, rs_guess]
+            sol = root(test_first_four_parms, guesses,
+                       args=[rsh_guess, voc, isc, vmp, imp, ignore_eq4])
+    solutions = sol.x
+    results = sol.fun
+
+    # Find worst error in results
+    worst_abs_err = 0
+    for res in results:
+        worst_abs_err = (abs(res)
+                         if abs(res) > worst_abs_err
+                         else worst_abs_err)
+
+    parms = solutions if use_eq5 else np.append(solutions, rsh_guess)
+    return (parms, results, worst_abs_err)
+
+
+def get_best_solution(solutions, err_thresh):
+    """Function to choose the best of the solutions (from
+       solve_with_guesses) for the combinations of guesses, which are
+       provided in the order that they are tried. The first solution
+       that is less than err_thresh is chosen, and none of the
+       solutions after it is consumed. If there is no such solution,
+       the first one with the smallest worst error is chosen. The
+       parameters and results of the chosen solution are returned in a
+       list.
+    """
     best_max_abs_err = 999999999
-    for ignore_eq4 in [False, True]:
-        for use_eq5 in [True, False]:
-            for rsh_guess in rsh_guesses:
-                for i0_guess in i0_guesses:
-                    for rs_guess in rs_guesses:
-                        with warnings.catch_warnings():
-                            # Suppress printing annoying messages for cases
-                            # that aren't working out
-                            filter_str = "The iteration is not making "
-                            filter_str += "good progress"
-                            warnings.filterwarnings("ignore", filter_str,
-                                                    RuntimeWarning)
-                            filter_str = "The number of calls to function has "
-                            filter_str += "reached maxfev"
-                            warnings.filterwarnings("ignore", filter_str,
-                                                    RuntimeWarning)
-                            if use_eq5:
-                                # Run SciPy root solver, using
-                                # test_parms function with guesses for
-                                # all five parameters and specified
-                                # values for Voc, isc, vmp and imp
-                                guesses = [il_guess, i0_guess, a_guess,
-                                           rs_guess, rsh_guess]
-                                sol = root(test_parms, guesses,
-                                           args=[voc, isc, vmp, imp,
-                                                 ignore_eq4])
-                            else:
-                                # Run SciPy root solver, using
-                                # test_first_four_parms function with
-                                # guesses for first four parameters and
-                                # specified values for rsh, Voc, isc,
-                                # vmp and imp
-                                guesses = [il_guess, i0_guess, a_guess,
-                                           rs_guess]
-                                sol = root(test_first_four_parms, guesses,
-                                           args=[rsh_guess, voc, isc, vmp, imp,
-                                                 ignore_eq4])
-                        solutions = sol.x
-                        results = sol.fun
-
-                        # Find worst error in results
-                        worst_abs_err = 0
-                        for res in results:
-                            worst_abs_err = (abs(res)
-                                             if abs(res) > worst_abs_err
-                                             else worst_abs_err)
-
-                        # If that's the best so far, update best_parms
-                        # and best_results
-                        if worst_abs_err < best_max_abs_err:
-                            best_parms = (solutions if use_eq5
-                                          else np.append(solutions, rsh_guess))
-                            best_max_abs_err = worst_abs_err
-                            best_results = results
-
-                        # If it's less than err_thresh, we are
-                        # done. Return the parameters and results
-                        if worst_abs_err < err_thresh:
-                            return [best_parms, best_results]
+    for parms, results, worst_abs_err in solutions:
+        # If that's the best so far, update best_parms and
+        # best_results
+        if worst_abs_err < best_max_abs_err:
+            best_parms = parms
+            best_max_abs_err = worst_abs_err
+            best_results = results
+
+        # If it's less than err_thresh, we are done. Return the
+        # parameters and results
+        if worst_abs_err < err_thresh:
+            break
 
     # If no results met the err_thresh criterion, return the best
     # results seen
     return [best_parms, best_results]
 
 
+def find_parms_in_parallel(solve, guess_combos, err_thresh, executor):
+    """Function to run the root solver for all of the combinations of
+       guesses in parallel using the specified executor, and return the
+       same parameters and results that the serial search would. The
+       solve function is solve_with_guesses with its first three
+       arguments already supplied (using functools.partial).
+
+       The serial search stops at the first combination (in order) whose
+       solution is less than err_thresh. So as soon as any combination
+       is known to be good enough, the combinations after it can't
+       affect the outcome and the ones that haven't started yet are
+       cancelled. The search is finished when every combination before
+       the first good enough one has completed. The best solution is
+       then chosen from the completed solutions in the same order as
+       the serial search, so ties are broken the same way.
+
+       Cancelling a future only prevents it from starting. The
+       combinations after the first good enough one that are already
+       running are not waited for, but they keep their workers busy
+       until they complete. With an executor that is shared with
+       other work, that work may be delayed by up to one root solver
+       call per worker.
+    """
+    futures = [executor.submit(solve, guess_combo)
+               for guess_combo in guess_combos]
+    index_of = {future: ii for ii, future in enumerate(futures)}
+    first_good_index = len(futures)
+    pending = set(futures)
+    while pending:
+        done, pending = concurrent.futures.wait(
+            pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            ii = index_of[future]
+            if ii < first_good_index and future.result()[2] < err_thresh:
+                first_good_index = ii
+        # Stop waiting for (and cancel if possible) the combinations
+        # after the first good enough one
+        for future in list(pending):
+            if index_of[future] > first_good_index:
+                future.cancel()
+                pending.discard(future)
+    solutions = (future.result()
+                 for future in futures[:first_good_index + 1])
+    return get_best_solution(solutions, err_thresh)
+
+
 def pv_spec_from_dict(pv_spec_dict):
     """Global function to extract the values from a pv_spec_dict and return
        them in the canonical order. All values are strings, so need to
@@ -782,6 +969,168 @@ def create_pv_spec_file(pv_spec_csv_file):
 #   Classes     #
 #################
 
+class ParmsCache():
+    """Least-recently-used cache of the single-diode model parameters
+       that find_parms has found for a PV module/cell at a given cell
+       temperature (Step 1 of PV_model.run()). The irradiance is not
+       part of the key because Step 1 is independent of it (Step 2 just
+       scales IL).
+
+       Each entry is keyed by a "spec key" string, which captures
+       everything other than the temperature that the find_parms inputs
+       depend on, and by the cell temperature quantized to
+       temp_resolution degrees C. A cached solution may therefore be
+       reused for a temperature that differs from the one it was solved
+       at by up to half of temp_resolution.
+
+       If the filename property is set, the entries are loaded from
+       that (JSON) file, and the save() method rewrites it if entries
+       have been added since the last save, so the cache persists
+       across sessions. PV_model saves the cache once per run() or
+       estimate_irrad_and_temp() call, not once per entry.
+
+       One cache may be shared by multiple PV_model objects, including
+       ones in other threads. A deep copy of a PV_model object shares
+       its cache rather than copying it.
+    """
+    def __init__(self, max_entries=PARMS_CACHE_MAX_ENTRIES,
+                 temp_resolution=PARMS_CACHE_TEMP_RESOLUTION):
+        self.max_entries = max_entries
+        self.temp_resolution = temp_resolution
+        self.entries = collections.OrderedDict()
+        self.modified = False
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        # Property variables
+        self._filename = None
+
+    def __deepcopy__(self, memo):
+        return self
+
+    # Properties
+    # ---------------------------------
+    @property
+    def filename(self):
+        """Name of the JSON file where the cache is stored (None if it is
+           not stored). Setting the property merges the entries in the
+           file (if it exists) into the cache.
+        """
+        return self._filename
+
+    @filename.setter
+    def filename(self, value):
+        if value != self._filename:
+            self._filename = value
+            self.load()
+
+    # Methods
+    # -------------------------------------------------------------------------
+    def temp_key(self, temp_c):
+        """Method to return the quantized temperature used in the key for
+           the specified cell temperature
+        """
+        return int(round(temp_c / self.temp_resolution))
+
+    # -------------------------------------------------------------------------
+    def get(self, spec_key, temp_c):
+        """Method to return the [parms, results] list for the specified spec
+           key and cell temperature, or None if it is not cached
+        """
+        key = (spec_key, self.temp_key(temp_c))
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            _, parms, results = self.entries[key]
+        return [parms, results]
+
+    # -------------------------------------------------------------------------
+    def get_nearest(self, spec_key, temp_c):
+        """Method to return a (temp_c, parms) tuple for the cached entry with
+           the specified spec key whose cell temperature is closest to
+           the specified cell temperature, or None if there is no entry
+           for the spec key
+        """
+        with self.lock:
+            neighbors = [(entry_temp_c, parms) for ((entry_spec_key, _),
+                                                    (entry_temp_c, parms, _))
+                         in self.entries.items()
+                         if entry_spec_key == spec_key]
+        if not neighbors:
+            return None
+        return min(neighbors, key=lambda n: abs(n[0] - temp_c))
+
+    # -------------------------------------------------------------------------
+    def put(self, spec_key, temp_c, parms, results):
+        """Method to add the parameters and results solved at the specified
+           cell temperature to the cache, discarding the least recently
+           used entry if the cache is full. The cache file is not
+           written (see save()).
+        """
+        key = (spec_key, self.temp_key(temp_c))
+        with self.lock:
+            self.entries[key] = (temp_c, [float(parm) for parm in parms],
+                                 [float(res) for res in results])
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.modified = True
+
+    # -------------------------------------------------------------------------
+    def load(self):
+        """Method to merge the entries from the cache file into the cache.
+           They are treated as less recently used than the entries that
+           are already in the cache, and keep their order from the
+           file. A missing or unreadable file is ignored.
+        """
+        if self.filename is None or not Path(self.filename).exists():
+            return
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                file_entries = json.load(f)
+            with self.lock:
+                # The file is least recently used first, and each entry
+                # is moved to the least recently used end
+                for (spec_key, temp_key, temp_c,
+                     parms, results) in reversed(file_entries):
+                    key = (spec_key, temp_key)
+                    if key not in self.entries:
+                        self.entries[key] = (temp_c, parms, results)
+                        self.entries.move_to_end(key, last=False)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        except (OSError, ValueError, TypeError):
+            pass
+
+    # -------------------------------------------------------------------------
+    def save(self):
+        """Method to write the cache entries to the cache file (least
+           recently used first), if any have been added since the last
+           save. The file is written to a temporary file that then
+           replaces the old one, so a reader never sees a partially
+           written file. The save lock is held across the write and the
+           replace, so two threads never write the same temporary file.
+        """
+        if self.filename is None:
+            return
+        with self.save_lock:
+            with self.lock:
+                if not self.modified:
+                    return
+                file_entries = [[spec_key, temp_key, temp_c, parms, results]
+                                for ((spec_key, temp_key),
+                                     (temp_c, parms, results))
+                                in self.entries.items()]
+                self.modified = False
+            tmp_filename = f"{self.filename}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_filename, "w", encoding="utf-8") as f:
+                    json.dump(file_entries, f)
+                os.replace(tmp_filename, self.filename)
+            except OSError:
+                pass
+
+
 class PV_model():
     """Class that models a PV cell or module, given its datasheet
        specifications. Methods are provided to generate the PV's
@@ -795,6 +1144,11 @@ class PV_model():
         self.debug = False
         self.vi_points = []
         self.run_ms = 0
+        self.est_iterations = 0
+        self.est_ms = 0
+        self.defer_parms_cache_save = False
+        self.fit_parms = None
+        self.fit_rms_err = None
         # Property variables
         self._pv_name = None
         self._voc_stc = None
@@ -810,6 +1164,8 @@ class PV_model():
         self._rs_guesses = DEFAULT_RS_GUESSES
         self._rsh_guesses = DEFAULT_RSH_GUESSES
         self._err_thresh = DEFAULT_ERR_THRESH
+        self._executor = None
+        self._parms_cache = None
         self._irradiance = STC_IRRAD
         self._cell_temp_c = STC_T_C
         self._il = None
@@ -825,6 +1181,17 @@ class PV_model():
         self._eq4_result = None
         self._eq5_result = None
 
+    def __deepcopy__(self, memo):
+        # The executor is owned by the caller and can't be copied, so
+        # the copy shares it
+        pv_copy = self.__class__.__new__(self.__class__)
+        memo[id(self)] = pv_copy
+        for name, value in self.__dict__.items():
+            if name != "_executor":
+                value = copy.deepcopy(value, memo)
+            pv_copy.__dict__[name] = value
+        return pv_copy
+
     # Properties
     # ---------------------------------
     @property
@@ -988,6 +1355,41 @@ class PV_model():
     def err_thresh(self, value):
         self._err_thresh = value
 
+    # ---------------------------------
+    @property
+    def executor(self):
+        """Executor (e.g. a concurrent.futures.ProcessPoolExecutor) used to
+           run the SciPy root solver with the different combinations of
+           guesses in parallel. If None (the default), they are run
+           serially. The results are the same either way. The executor
+           is owned by the caller, so it can be shared by multiple
+           models and runs (and deep copies of a model share it too).
+           Note that guesses that are already running when the search
+           finishes are not stopped; they run to completion in the
+           executor's workers (see find_parms_in_parallel). Only the
+           example main() of this module (-j option) sets it; IV Swinger
+           2 models one reference curve at a time, and its batch tools
+           run whole curves in parallel instead.
+        """
+        return self._executor
+
+    @executor.setter
+    def executor(self, value):
+        self._executor = value
+
+    # ---------------------------------
+    @property
+    def parms_cache(self):
+        """ParmsCache object used to memoize the single-diode
+           model parameters found in Step 1 of the run() method. If
+           None (the default), they are found from scratch every time.
+        """
+        return self._parms_cache
+
+    @parms_cache.setter
+    def parms_cache(self, value):
+        self._parms_cache = value
+
     # ---------------------------------
     @property
     def irradiance(self):
@@ -1166,6 +1568,20 @@ class PV_model():
         kt_over_q = BOLTZMANN_K * self.cell_temp_k / ELECTRON_CHG_Q
         return IDEALITY_FACTOR_GUESS * num_cells * kt_over_q
 
+    # ---------------------------------
+    @property
+    def parms_cache_spec_key(self):
+        """String identifying the spec values, guesses and error threshold
+           that the Step 1 parameters depend on (other than the cell
+           temperature). Used as part of the parms_cache key.
+        """
+        return repr((self.voc_stc, self.isc_stc, self.vmp_stc, self.imp_stc,
+                     self.num_cells, self.voc_temp_coeff_pct_per_deg,
+                     self.isc_temp_coeff_pct_per_deg,
+                     self.mpp_temp_coeff_pct_per_deg,
+                     tuple(self.i0_guesses), tuple(self.rs_guesses),
+                     tuple(self.rsh_guesses), self.err_thresh))
+
     # ---------------------------------
     @property
     def cell_temp_k(self):
@@ -1370,13 +1786,7 @@ class PV_model():
         # specified temperature, but still at STC irradiance.
         voc_isc_vmp_imp = [self.voc_at_temp, self.isc_at_temp,
                            self.vmp_at_temp, self.imp_at_temp]
-        il_guess = self.isc_at_temp
-        parms, results = find_parms(voc_isc_vmp_imp, il_guess,
-                                    self.i0_guesses,
-                                    self.a_guess,
-                                    self.rs_guesses,
-                                    self.rsh_guesses,
-                                    self.err_thresh)
+        parms, results = self.find_step1_parms(voc_isc_vmp_imp)
         il, i0, a, rs, rsh = parms
         eq1_res, eq2_res, eq3_res, eq4_res = results[0:4]
         eq5_res = test_eq5(rsh, [i0, a, rs, self.isc_at_temp])
@@ -1427,6 +1837,11 @@ class PV_model():
         # Update the Vmp and Imp properties
         self.update_mpp()
 
+        # Save the parameter cache (unless the caller saves it once
+        # after several runs)
+        if self.parms_cache is not None and not self.defer_parms_cache_save:
+            self.parms_cache.save()
+
         # Record the run time
         elapsed_time = dt.datetime.now() - start_time
         self.run_ms = int(round(elapsed_time.total_seconds() * 1000))
@@ -1435,6 +1850,53 @@ class PV_model():
         # ignored
         return eq4_ignored
 
+    # -------------------------------------------------------------------------
+    def find_step1_parms(self, voc_isc_vmp_imp):
+        """Method to find the single-diode model parameters for Step 1 of
+           the run() method using the find_parms() function. The
+           parameters and the equation results are returned in a list.
+
+           If the parms_cache property is set, the cached values are
+           returned if there are any for the current spec and
+           temperature. Otherwise, find_parms() is "warm started" by
+           putting the I0, Rs and Rsh values of the cached solution with
+           the nearest temperature at the front of the guess lists (and
+           using its A, scaled to the current temperature, as the A
+           guess). Solutions that meet the error threshold are added to
+           the cache.
+        """
+        # pylint: disable=too-many-locals
+        il_guess = self.isc_at_temp
+        a_guess = self.a_guess
+        i0_guesses = self.i0_guesses
+        rs_guesses = self.rs_guesses
+        rsh_guesses = self.rsh_guesses
+        if self.parms_cache is not None:
+            spec_key = self.parms_cache_spec_key
+            cached = self.parms_cache.get(spec_key, self.cell_temp_c)
+            if cached is not None:
+                return cached
+            nearest = self.parms_cache.get_nearest(spec_key,
+                                                   self.cell_temp_c)
+            if nearest is not None:
+                nearest_temp_c, (_, i0, a, rs, rsh) = nearest
+                a_guess = a * self.cell_temp_k / (nearest_temp_c +
+                                                  TEMP_K_0_DEG_C)
+                i0_guesses = list(dict.fromkeys([i0] + i0_guesses))
+                rs_guesses = list(dict.fromkeys([rs] + rs_guesses))
+                rsh_guesses = list(dict.fromkeys([rsh] + rsh_guesses))
+        parms, results = find_parms(voc_isc_vmp_imp, il_guess,
+                                    i0_guesses,
+                                    a_guess,
+                                    rs_guesses,
+                                    rsh_guesses,
+                                    self.err_thresh,
+                                    executor=self.executor)
+        if (self.parms_cache is not None and
+                max(abs(res) for res in results) <= self.err_thresh):
+            self.parms_cache.put(spec_key, self.cell_temp_c, parms, results)
+        return [parms, results]
+
     # -------------------------------------------------------------------------
     def update_mpp(self):
         """Method to update the Vmp and Imp of the IV curve for the PV
@@ -1458,6 +1920,10 @@ class PV_model():
         """Method to generate a list of V,I points for the modeled curve. This
            generator can be run only after a successful execution of the
            run() method. Each point is yielded as a (v,i) tuple.
+
+           The currents for all of the voltages are found at once using
+           the solve_i_given_v_and_parms() function. The SciPy root
+           solver is only used for any points that it fails to solve.
         """
         mpp_added = False
         if self.voc is None:
@@ -1468,33 +1934,74 @@ class PV_model():
         # Number of loops is two less than num_points because MPP and
         # Voc are added
         num_loops = num_points - 2
-        for ii in range(num_loops):
-            # Voltage increments are proportional to the square root of
-            # the point number. This results in large voltage increments
-            # at the Isc end of the curve and very small voltage increments
-            # at the Voc end. This gives better resolution around the
-            # MPP and also on the steep tail end of the curve where
-            # small voltage increments map to large current increments.
-            volts = voc * (ii**0.5) / float((num_loops)**0.5)
-            # Since that probably won't include the actual MPP, we
-            # insert it before inserting the first point with a voltage
-            # higher than Vmp.
+        # Voltage increments are proportional to the square root of the
+        # point number. This results in large voltage increments at the
+        # Isc end of the curve and very small voltage increments at the
+        # Voc end. This gives better resolution around the MPP and also
+        # on the steep tail end of the curve where small voltage
+        # increments map to large current increments.
+        all_volts = [voc * (ii**0.5) / float((num_loops)**0.5)
+                     for ii in range(num_loops)]
+        # Solve for the currents at all of these voltages at once
+        parms = [self.il, self.i0, self.a, self.rs, self.rsh]
+        all_amps, converged = solve_i_given_v_and_parms(all_volts, parms,
+                                                        self.il)
+        for volts, amps, amps_ok in zip(all_volts, all_amps.tolist(),
+                                        converged.tolist()):
+            # Since the voltages probably won't include the actual MPP,
+            # we insert it before inserting the first point with a
+            # voltage higher than Vmp.
             if volts > self.vmp and not mpp_added:
                 yield self.vmp, self.imp
                 mpp_added = True
-            # Run root solver to determine the current for this voltage
-            x0 = [self.il]
-            parms = [self.il, self.i0, self.a, self.rs, self.rsh]
-            sol = root(test_i_given_v_and_parms, x0, args=(volts, parms))
-            if sol.success:
+            if not amps_ok:
+                # Fall back to the root solver to determine the current
+                # for this voltage
+                sol = root(test_i_given_v_and_parms, [self.il],
+                           args=(volts, parms))
+                if not sol.success:
+                    warnings.warn(f"FAIL: v = {volts}", UserWarning)
+                    continue
                 amps = sol.x[0]
-                if amps > 0.0:
-                    yield volts, amps
-            else:
-                warnings.warn(f"FAIL: v = {volts}", UserWarning)
+            if amps > 0.0:
+                yield volts, amps
         # Add the Voc
         yield voc, 0.0
 
+    # -------------------------------------------------------------------------
+    def fit_measured_points(self, volts, amps, temp_err_thresh=0.1):
+        """Method to fit the single-diode model parameters directly to a
+           measured IV curve, given lists (or arrays) of the voltage and
+           current values of its points, in order from the Isc point to
+           the Voc point.
+
+           First, the irradiance and cell temperature are estimated from
+           the measured Voc and Isc with the estimate_irrad_and_temp()
+           method, and the model is run at those conditions to get the
+           parameters based on the datasheet values. Those are the
+           starting point for a least-squares fit to all of the measured
+           points (see fit_parms_to_points()).
+
+           The fitted parameters (IL, I0, A, Rs and Rsh) are stored in
+           the fit_parms attribute and the RMS error of the fit (in
+           amps) in the fit_rms_err attribute. The il, i0, a, rs and rsh
+           properties keep the datasheet-based values. True is returned
+           if the fit converged.
+
+           If the datasheet-based modeling fails to find a solution, an
+           AssertionError exception is raised (see run()).
+        """
+        self.fit_parms = None
+        self.fit_rms_err = None
+        self.estimate_irrad_and_temp(volts[-1], amps[0], temp_err_thresh)
+        self.run()
+        (self.fit_parms,
+         self.fit_rms_err,
+         fit_ok) = fit_parms_to_points(volts, amps, [self.il, self.i0,
+                                                     self.a, self.rs,
+                                                     self.rsh])
+        return fit_ok
+
     # -------------------------------------------------------------------------
     def add_vi_points(self, num_points):
         """Method to add the specfied number of V,I points for the
@@ -1557,43 +2064,93 @@ class PV_model():
 
     # -------------------------------------------------------------------------
     def estimate_irrad_and_temp(self, measured_voc, measured_isc,
-                                temp_err_thresh):
+                                temp_err_thresh, initial_temp_c=None):
         """Method to estimate both irradiance and cell temperature, given
            measured values for Voc and Isc. This uses an iterative
            algorithm. The first step for each iteration is to estimate
            the irradiance using the estimate_irrad() method.  This is
            based on the estimated temperature and the measured
-           Isc. Initially, the estimated temperature is 45 degrees C,
-           which is a typical NOCT. The temperature estimate is then
-           updated by running the estimate_temp() method. The error
-           between the previous end current estimated temperature is
-           then calculated. The iterations continue while the error in
-           the estimated temperature is greater than the specified
+           Isc. Initially, the estimated temperature is initial_temp_c,
+           or 45 degrees C (a typical NOCT) if that is None. A caller
+           that estimates a series of similar curves (e.g. in loop mode)
+           can pass the previous curve's estimate to "warm start" the
+           iterations. The temperature estimate is then updated by
+           running the estimate_temp() method. The error between the
+           previous and current estimated temperature is then
+           calculated. The iterations continue while the error in the
+           estimated temperature is greater than the specified
            threshold.
+
+           After the first iteration, the new temperature estimate is
+           extrapolated from the errors of the last two iterations (the
+           secant method), which converges much faster than just using
+           the estimate_temp() result. The model parameters found in
+           each iteration are used as the guesses for the next one (see
+           find_step1_parms()); if the parms_cache property is not set,
+           a temporary cache is used for this. If it is set, the cache
+           is saved once, at the end, rather than by each run().
+
+           The number of iterations and the elapsed time are recorded in
+           the est_iterations and est_ms attributes.
         """
-        self.cell_temp_c = 45.0  # Initial temperature estimate
-        temp_err = 999999
-        while abs(temp_err) > temp_err_thresh:
-            # Estimate irradiance based on temperature and measured Isc
-            self.estimate_irrad(measured_isc)
-            # Estimate temperature based on irradiance and measured Voc
-            temp_guess = self.cell_temp_c
-            self.estimate_temp(measured_voc, measured_isc)
-            temp_err = self.cell_temp_c - temp_guess
+        start_time = dt.datetime.now()
+        parms_cache = self.parms_cache
+        if parms_cache is None:
+            self.parms_cache = ParmsCache()
+        self.cell_temp_c = (45.0 if initial_temp_c is None  # Typical NOCT
+                            else initial_temp_c)
+        self.est_iterations = 0
+        prev_temp_guess = None
+        prev_temp_err = None
+        self.defer_parms_cache_save = True
+        try:
+            while True:
+                self.est_iterations += 1
+                # Estimate irradiance based on temperature and measured
+                # Isc
+                self.estimate_irrad(measured_isc)
+                # Estimate temperature based on irradiance and measured
+                # Voc
+                temp_guess = self.cell_temp_c
+                self.estimate_temp(measured_voc, measured_isc)
+                temp_err = self.cell_temp_c - temp_guess
+                # Secant update (unless it would take a step more than
+                # SECANT_MAX_STEP_RATIO times the size of the plain
+                # update, which can only happen if the errors are
+                # noisy)
+                if prev_temp_err is not None and temp_err != prev_temp_err:
+                    secant_step = (-temp_err * (temp_guess - prev_temp_guess) /
+                                   (temp_err - prev_temp_err))
+                    if abs(secant_step) <= (SECANT_MAX_STEP_RATIO *
+                                            abs(temp_err)):
+                        self.cell_temp_c = temp_guess + secant_step
+                if abs(temp_err) <= temp_err_thresh:
+                    break
+                prev_temp_guess = temp_guess
+                prev_temp_err = temp_err
+        finally:
+            self.defer_parms_cache_save = False
+            self.parms_cache = parms_cache
+            if parms_cache is not None:
+                parms_cache.save()
 
         # One last refinement of the estimated irradiance, using the
         # final estimated temperature
         self.estimate_irrad(measured_isc)
 
+        # Record the elapsed time
+        elapsed_time = dt.datetime.now() - start_time
+        self.est_ms = int(round(elapsed_time.total_seconds() * 1000))
+
 
 ############
 #   Main   #
 ############
-def main():
-    """Main function"""
+def get_example_pv():
+    """Global function to return a PV_model object for the example PV
+       module (SunPower X21-345) at its datasheet NOC values
+    """
     pv = PV_model()
-
-    # Example: SunPower X21-345 at NOCI and NOCT
     pv.pv_name = "SunPower X21-345"
     pv.voc_stc = 68.2
     pv.isc_stc = 6.39
@@ -1605,6 +2162,16 @@ def main():
     pv.mpp_temp_coeff_pct_per_deg = -0.29  # % per degree C
     pv.irradiance = NOC_IRRAD
     pv.cell_temp_c = 41.5  # NOCT from datasheet
+    return pv
+
+
+def run_example(executor=None):
+    """Global function to run the model for an example PV module, using
+       the specified executor (if any) for the parameter search
+    """
+    # Example: SunPower X21-345 at NOCI and NOCT
+    pv = get_example_pv()
+    pv.executor = executor
     pv.debug = False
 
     # Run model. Voc, Isc, Vmp, Imp and Pmp should be close to datasheet
@@ -1623,6 +2190,23 @@ def main():
     print(f"est_irrad = {pv.irradiance}  est_temp = {pv.cell_temp_c}")
 
 
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Run the PV model for an example PV module")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help=("Number of processes to use for the parameter "
+                              "search (default: 1, i.e. search serially)"))
+    args = parser.parse_args()
+
+    if args.jobs > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=args.jobs) as executor:
+            run_example(executor)
+    else:
+        run_example()
+
+
 # Boilerplate main() call
 if __name__ == '__main__':
     main()
@@ -69,7 +69,8 @@
 #                              [-pps POINT_SCALE] [-ls LINE_SCALE] [-n NAME]
 #                              [-on OVERLAY_NAME] [-g] [-pn] [-li] [-lv] [-lm]
 #                              [-mw] [-fl] [-l] [--use_gnuplot] [--interactive]
-#                              [--recalc_isc]
+#                              [--recalc_isc] [--analytic_mpp] [-j JOBS]
+#                              [-od OUTPUT_DIR]
 #                              CSV file or dir [CSV file or dir ...]
 #
 #  positional arguments:
@@ -131,12 +132,23 @@
 #    --interactive         View output in interactive mode
 #    --recalc_isc          Recalculate Isc using the overridden
 #                          extrapolate_isc method
+#    --analytic_mpp        Calculate the exact MPP on the plotted
+#                          interpolated curve (including the lines
+#                          between the interpolated points) analytically
+#                          rather than by searching the interpolated
+#                          points
+#    -j JOBS, --jobs JOBS  Number of CSV files to process in parallel
+#                          (default = 1)
+#    -od OUTPUT_DIR, --output_dir OUTPUT_DIR
+#                          Directory for the output files (default =
+#                          current directory)
 #
 # The input is one or more CSV files in the format generated by the IV
 # Swinger. If a directory is specified it must contain CSV files only,
 # and they must all be in the expected format. The resulting PDF (or GIF
-# or PNG) files are written to the directory in which the program is
-# run.
+# or PNG) files are written to the directory specified with the
+# --output_dir option or, by default, to the directory in which the
+# program is run.
 #
 # The IV_Swinger module is imported by this module. Since the IV_Swinger
 # module imports the Adafruit_ADS1x15, Adafruit_CharLCD,
@@ -145,6 +157,8 @@
 # platform).
 #
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import os
 from pathlib import Path
 
@@ -191,6 +205,29 @@ def set_ivs_properties(args, ivs_extended):
     ivs_extended.fancy_labels = args.fancy_labels
 
 
+def get_csv_file_results_in_worker(args, ivs_extended_class,
+                                   use_spline_interpolation, csv_filename):
+    """Global function to run CsvFileProcessor.get_csv_file_results() in a
+       worker process. A new extended IV Swinger object of the provided
+       class is created, and a CsvFileProcessor with no CSV files of its
+       own is used to process the CSV file. Its messages are saved by a
+       WorkerLogger and returned along with the results, so the parent
+       process can print and/or log them with its own logger. If the
+       processing fails, the messages are printed by the worker before
+       the exception is passed on to the parent process.
+    """
+    ivs_extended = ivs_extended_class()
+    ivs_extended.use_spline_interpolation = use_spline_interpolation
+    worker_logger = WorkerLogger()
+    csv_proc = CsvFileProcessor(args, [], ivs_extended, worker_logger)
+    try:
+        results = csv_proc.get_csv_file_results(csv_filename)
+    except Exception:
+        WorkerLogger.replay_msgs(None, worker_logger.msgs)
+        raise
+    return (results, worker_logger.msgs)
+
+
 def check_names_and_ref(ivs_extended, csv_files):
     """Global function to check that if curve names were specified, the
        correct number were specified, and if plot_ref option is
@@ -237,6 +274,36 @@ class PrintAndOrLog():
             logger.print_and_log(msg_str)
 
 
+# The WorkerLogger class
+class WorkerLogger():
+    """Class to save the messages of a worker process, which can't use the
+       parent's logger. The msgs attribute is a list of (print_flag,
+       msg_str) tuples that the replay_msgs() method prints and/or logs
+       in the parent process.
+    """
+    def __init__(self):
+        self.msgs = []
+
+    def log(self, msg_str):
+        """Method to save a message that is to be logged only"""
+        self.msgs.append((False, msg_str))
+
+    def print_and_log(self, msg_str):
+        """Method to save a message that is to be printed and logged"""
+        self.msgs.append((True, msg_str))
+
+    @staticmethod
+    def replay_msgs(logger, msgs):
+        """Method to print and/or log the saved messages of a worker with
+           the specified logger (see PrintAndOrLog)
+        """
+        for (print_flag, msg_str) in msgs:
+            if print_flag:
+                PrintAndOrLog.print_and_log_msg(logger, msg_str)
+            else:
+                PrintAndOrLog.print_or_log_msg(logger, msg_str)
+
+
 class CommandLineProcessor():
     """Class to parse the command line args. The args property returns
        the populated args namespace from argparse. The csv_files property
@@ -327,6 +394,19 @@ class CommandLineProcessor():
             parser.add_argument("--recalc_isc", action="store_true",
                                 help=("Recalculate Isc using the overridden "
                                       "extrapolate_isc method"))
+            parser.add_argument("--analytic_mpp", action="store_true",
+                                help=("Calculate the exact MPP on the "
+                                      "plotted interpolated curve "
+                                      "(including the lines between the "
+                                      "interpolated points) analytically "
+                                      "rather than by searching the "
+                                      "interpolated points"))
+            parser.add_argument("-j", "--jobs", type=int, default=1,
+                                help=("Number of CSV files to process in "
+                                      "parallel (default = 1)"))
+            parser.add_argument("-od", "--output_dir", type=str, default="",
+                                help=("Directory for the output files "
+                                      "(default = current directory)"))
             parser.add_argument("csv_files_or_dirs", metavar="CSV file or dir",
                                 type=str, nargs="+")
 
@@ -463,19 +543,23 @@ class IV_Swinger_extended(IV_Swinger.IV_Swinger):
         self.use_gnuplot = False
         if args.use_gnuplot:
             self.use_gnuplot = True
+        self.plt_data_sets = csv_proc.plt_data_sets
         if args.gif:
             plt_img_file_suffix = ".gif"
         elif args.png:
             plt_img_file_suffix = ".png"
         else:
             plt_img_file_suffix = ".pdf"
-        gp_command_filename = "gp_command"
+        gp_command_filename = os.path.join(args.output_dir, "gp_command")
+        gen_str = "Rendered" if self.render_to_memory else "Generated"
         if args.overlay:
-            self.plt_img_filename = args.overlay_name + plt_img_file_suffix
+            self.plt_img_filename = os.path.join(
+                args.output_dir, args.overlay_name + plt_img_file_suffix)
         if args.plot_ref:
             fn_wo_suffix = os.path.splitext(os.path.basename
                                             (csv_proc.csv_files[1]))[0]
-            self.plt_img_filename = fn_wo_suffix + plt_img_file_suffix
+            self.plt_img_filename = os.path.join(
+                args.output_dir, fn_wo_suffix + plt_img_file_suffix)
         if args.overlay or args.plot_ref:
             # Plot with pyplot or gnuplot
             self.plot_with_plotter(gp_command_filename,
@@ -485,8 +569,7 @@ class IV_Swinger_extended(IV_Swinger.IV_Swinger):
                                    csv_proc.plt_voc_volts,
                                    csv_proc.plt_mpp_amps,
                                    csv_proc.plt_mpp_volts)
-            msg_str = f"Generated: {self.plt_img_filename}"
-            PrintAndOrLog.print_or_log_msg(self.logger, msg_str)
+            self.log_generated_files(gen_str)
 
         else:
             for ii, csv_filename in enumerate(csv_proc.csv_files):
@@ -498,7 +581,8 @@ class IV_Swinger_extended(IV_Swinger.IV_Swinger):
                 # Plot with pyplot
                 fn_wo_suffix = os.path.splitext(os.path.basename
                                                 (csv_filename))[0]
-                self.plt_img_filename = fn_wo_suffix + plt_img_file_suffix
+                self.plt_img_filename = os.path.join(
+                    args.output_dir, fn_wo_suffix + plt_img_file_suffix)
                 self.plot_with_plotter(gp_command_filename,
                                        [plt_data_point_filename],
                                        self.plt_img_filename,
@@ -506,8 +590,18 @@ class IV_Swinger_extended(IV_Swinger.IV_Swinger):
                                        [voc_volts],
                                        [mpp_amps],
                                        [mpp_volts])
-                msg_str = f"Generated: {self.plt_img_filename}"
-                PrintAndOrLog.print_or_log_msg(self.logger, msg_str)
+                self.log_generated_files(gen_str)
+
+    def log_generated_files(self, gen_str):
+        """Method to print and/or log the names of the files generated for
+           the current plot
+        """
+        msg_str = f"{gen_str}: {self.plt_img_filename}"
+        PrintAndOrLog.print_or_log_msg(self.logger, msg_str)
+        (fn_wo_suffix, _) = os.path.splitext(self.plt_img_filename)
+        for (suffix, _) in self.extra_img_outputs:
+            msg_str = f"Generated: {fn_wo_suffix}{suffix}"
+            PrintAndOrLog.print_or_log_msg(self.logger, msg_str)
 
 
 class CsvFileProcessor():
@@ -516,10 +610,14 @@ class CsvFileProcessor():
        user at object creation. The proc_all_csv_files method is called at
        initialization; it uses the interpolator to generate the plotter
        data point files and compute or extract the Isc, Voc, and MPP
-       values. It populates the results into the following attributes,
+       values. With pyplot, the plotter data sets (and therefore the
+       interpolated curves, unless they are needed to find the MPP) are
+       not generated until the plt_data_sets property is first
+       accessed. It populates the results into the following attributes,
        which are available externally via properties:
 
            self._plt_data_point_files
+           self._plt_data_sets
            self._plt_isc_amps
            self._plt_voc_volts
            self._plt_mpp_amps
@@ -532,6 +630,8 @@ class CsvFileProcessor():
         self.ivs_extended = ivs_extended
         self.logger = logger
         self._plt_data_point_files = []
+        self._plt_data_sets = {}
+        self._pending_plt_data_sets = {}
         self._plt_isc_amps = []
         self._plt_voc_volts = []
         self._plt_mpp_amps = []
@@ -541,20 +641,26 @@ class CsvFileProcessor():
 
     def proc_one_csv_file(self, csv_filename):
         """Method to process a single CSV file"""
-        # pylint: disable=too-many-locals
-
         msg_str = f"Processing: {csv_filename}"
         PrintAndOrLog.print_or_log_msg(self.logger, msg_str)
 
+        self.add_csv_file_results(self.get_csv_file_results(csv_filename))
+
+    def get_csv_file_results(self, csv_filename):
+        """Method to do the work of processing a single CSV file (see
+           proc_one_csv_file()) without adding the results to the plt_*
+           lists. The results are returned in a tuple that is passed to
+           add_csv_file_results(). This method runs in a worker process
+           when multiple jobs are used.
+        """
+        # pylint: disable=too-many-locals
+
         # Create a CSV parser object and get the data points
         csv_parser = CsvParser(csv_filename, self.logger)
         data_points = csv_parser.data_points
 
-        # Pass the data points to the extended IV Swinger object
-        ivse = self.ivs_extended
-        ivse.data_points = data_points
-
         # Optionally recalculate Isc
+        ivse = self.ivs_extended
         if self.args.recalc_isc:
             # Find the measured point number with the highest power
             max_watt_point_number = (
@@ -578,14 +684,18 @@ class CsvFileProcessor():
         # Extract the Voc value
         voc_volts = data_points[-1][IV_Swinger.VOLTS_INDEX]
 
-        # Create an Interpolator object and call the appropriate
-        # interpolation methods
+        # Create an Interpolator object and call the appropriate MPP
+        # method. The analytic methods don't generate the interpolated
+        # curve.
         interpolator = IV_Swinger.Interpolator(data_points)
-        if ivse.use_spline_interpolation:
-            interp_points = interpolator.spline_interpolated_curve
+        if self.args.analytic_mpp:
+            if ivse.use_spline_interpolation:
+                interpolated_mpp = interpolator.spline_analytic_mpp
+            else:
+                interpolated_mpp = interpolator.linear_analytic_mpp
+        elif ivse.use_spline_interpolation:
             interpolated_mpp = interpolator.spline_interpolated_mpp
         else:
-            interp_points = interpolator.linear_interpolated_curve
             interpolated_mpp = interpolator.linear_interpolated_mpp
 
         # Extract the MPP values
@@ -593,17 +703,41 @@ class CsvFileProcessor():
         mpp_volts = interpolated_mpp[IV_Swinger.VOLTS_INDEX]
 
         # Write the original and interpolated data points to the plotter
-        # data file
+        # data file. Pyplot doesn't need the file, so in that case they
+        # are just kept in memory, in the same form, and not until they
+        # are needed (see the plt_data_sets property).
         fn_wo_suffix = os.path.splitext(os.path.basename(csv_filename))[0]
-        plt_data_point_filename = f"plt_{fn_wo_suffix}"
+        plt_data_point_filename = os.path.join(self.args.output_dir,
+                                               f"plt_{fn_wo_suffix}")
         if os.path.isfile(plt_data_point_filename):
             Path(plt_data_point_filename).unlink()
-        IV_Swinger.write_plt_data_points_to_file(plt_data_point_filename,
-                                                 data_points,
-                                                 new_data_set=False)
-        IV_Swinger.write_plt_data_points_to_file(plt_data_point_filename,
-                                                 interp_points,
-                                                 new_data_set=True)
+        if self.args.use_gnuplot:
+            IV_Swinger.write_plt_data_points_to_file(plt_data_point_filename,
+                                                     data_points,
+                                                     new_data_set=False)
+            IV_Swinger.write_plt_data_points_to_file(
+                plt_data_point_filename,
+                self.get_interp_points(interpolator,
+                                       ivse.use_spline_interpolation),
+                new_data_set=True)
+
+        return (plt_data_point_filename, data_points, interpolator,
+                isc_amps, voc_volts, mpp_amps, mpp_volts)
+
+    def add_csv_file_results(self, results):
+        """Method to add the results of get_csv_file_results() to the
+           plt_* lists
+        """
+        (plt_data_point_filename, data_points, interpolator,
+         isc_amps, voc_volts, mpp_amps, mpp_volts) = results
+
+        # Pass the data points to the extended IV Swinger object
+        ivse = self.ivs_extended
+        ivse.data_points = data_points
+
+        if not self.args.use_gnuplot:
+            self._pending_plt_data_sets[plt_data_point_filename] = (
+                interpolator, ivse.use_spline_interpolation)
 
         self.plt_data_point_files.append(plt_data_point_filename)
         self.plt_isc_amps.append(isc_amps)
@@ -611,16 +745,67 @@ class CsvFileProcessor():
         self.plt_mpp_amps.append(mpp_amps)
         self.plt_mpp_volts.append(mpp_volts)
 
+    @staticmethod
+    def get_interp_points(interpolator, spline):
+        """Method to get the spline or linear interpolated curve
+           (including the original data points) from the provided
+           interpolator, as an array of (I, V, R, P) rows
+        """
+        if spline:
+            return interpolator.spline_interpolated_curve_array
+        return interpolator.linear_interpolated_curve_array
+
     def proc_all_csv_files(self):
-        """Method to process all the CSV files"""
-        for csv_filename in self.csv_files:
-            self.proc_one_csv_file(csv_filename)
+        """Method to process all the CSV files. If the jobs arg is greater
+           than one, the files are processed in a pool of that many
+           worker processes. The results are added in the order of the
+           CSV files either way, so the overlay order is not affected.
+        """
+        num_jobs = min(getattr(self.args, "jobs", 1), len(self.csv_files))
+        if num_jobs <= 1:
+            for csv_filename in self.csv_files:
+                self.proc_one_csv_file(csv_filename)
+            return
+
+        # The extended IV Swinger object can't be passed to the worker
+        # processes, so each worker creates one of the same class with
+        # the same interpolation type
+        ivse = self.ivs_extended
+        worker_func = functools.partial(get_csv_file_results_in_worker,
+                                        self.args, type(ivse),
+                                        ivse.use_spline_interpolation)
+        with ProcessPoolExecutor(max_workers=num_jobs) as executor:
+            futures = []
+            for csv_filename in self.csv_files:
+                msg_str = f"Processing: {csv_filename}"
+                PrintAndOrLog.print_or_log_msg(self.logger, msg_str)
+                futures.append(executor.submit(worker_func, csv_filename))
+            for future in futures:
+                (results, msgs) = future.result()
+                WorkerLogger.replay_msgs(self.logger, msgs)
+                self.add_csv_file_results(results)
 
     @property
     def plt_data_point_files(self):
         """Property to get the data point file names"""
         return self._plt_data_point_files
 
+    @property
+    def plt_data_sets(self):
+        """Property to get the dict of in-memory plotter data sets (pyplot
+           only), keyed by data point file name. The data sets that
+           haven't been generated yet are generated first.
+        """
+        for (plt_data_point_filename,
+             (interpolator, spline)) in self._pending_plt_data_sets.items():
+            self._plt_data_sets[plt_data_point_filename] = (
+                IV_Swinger.get_plt_data_point_lists(
+                    interpolator.given_points) +
+                IV_Swinger.get_plt_data_point_lists(
+                    self.get_interp_points(interpolator, spline)))
+        self._pending_plt_data_sets = {}
+        return self._plt_data_sets
+
     @property
     def plt_isc_amps(self):
         """Property to get the list of Isc amps"""
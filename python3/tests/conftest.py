@@ -0,0 +1,6 @@
+"""pytest configuration for the IV Swinger 2 Python 3 tests"""
+import os
+import sys
+
+# The modules under test are in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,84 @@
+"""Tests for the IV_Swinger module"""
+import numpy
+import IV_Swinger
+
+
+def make_points(volts, amps):
+    """Return the list of (I, V, R, P) tuples for the specified voltages
+       and currents
+    """
+    return [(amps_val, volts_val,
+             volts_val / amps_val if amps_val else IV_Swinger.INFINITE_VAL,
+             volts_val * amps_val)
+            for volts_val, amps_val in zip(volts, amps)]
+
+
+def plotted_curve_max_watts(curve):
+    """Return the highest power on the lines between the points of an
+       interpolated curve array, found by sampling each line densely
+    """
+    volts = curve[:, IV_Swinger.VOLTS_INDEX]
+    amps = curve[:, IV_Swinger.AMPS_INDEX]
+    u = numpy.linspace(0.0, 1.0, 10001)[:, None]
+    line_volts = volts[:-1] + u * (volts[1:] - volts[:-1])
+    line_amps = amps[:-1] + u * (amps[1:] - amps[:-1])
+    return (line_volts * line_amps).max()
+
+
+def test_spline_analytic_mpp_is_on_plotted_curve():
+    """The analytic spline MPP is the MPP of the plotted curve, excluding
+       its straight first and last segments. It is never below the MPP
+       found by searching the interpolated points.
+    """
+    volts = [0.0, 10.0, 20.0, 28.0, 33.0, 36.0, 38.0, 40.0]
+    amps = [9.0, 8.9, 8.7, 8.0, 6.5, 4.0, 2.0, 0.0]
+    interpolator = IV_Swinger.Interpolator(make_points(volts, amps))
+    analytic_watts = interpolator.spline_analytic_mpp[IV_Swinger.WATTS_INDEX]
+    curve = interpolator.spline_interpolated_curve_array
+    assert analytic_watts >= interpolator.spline_interpolated_mpp[
+        IV_Swinger.WATTS_INDEX]
+    assert numpy.isclose(analytic_watts,
+                         plotted_curve_max_watts(curve[1:-1]), rtol=1e-6)
+
+    # A degenerate curve whose straight last segment has more power
+    # than any point on the spline
+    volts = [0.0, 0.1, 0.2, 0.3, 1.0]
+    amps = [1.0, 0.98, 0.95, 0.9, 0.0]
+    interpolator = IV_Swinger.Interpolator(make_points(volts, amps))
+    analytic_watts = interpolator.spline_analytic_mpp[IV_Swinger.WATTS_INDEX]
+    curve = interpolator.spline_interpolated_curve_array
+    assert numpy.isclose(analytic_watts,
+                         plotted_curve_max_watts(curve[1:-1]), rtol=1e-6)
+    assert analytic_watts < plotted_curve_max_watts(curve)
+
+
+def test_linear_analytic_mpp():
+    """The analytic linear MPP is at the top of the power parabola of
+       the line between the two given points
+    """
+    interpolator = IV_Swinger.Interpolator(make_points([0.0, 1.0, 4.0],
+                                                       [4.0, 3.0, 0.0]))
+    mpp = interpolator.linear_analytic_mpp
+    assert numpy.isclose(mpp[IV_Swinger.VOLTS_INDEX], 2.0)
+    assert numpy.isclose(mpp[IV_Swinger.AMPS_INDEX], 2.0)
+    assert numpy.isclose(mpp[IV_Swinger.WATTS_INDEX], 4.0)
+
+
+def test_print_to_rgba_buffer():
+    """The RGBA image size matches the pixel data, and the figure's
+       canvas and DPI are unchanged
+    """
+    ivs = IV_Swinger.IV_Swinger()
+    ivs.plot_dpi = 150
+    fig = IV_Swinger.plt.figure(figsize=(7.777, 5.123), dpi=100)
+    try:
+        canvas = fig.canvas
+        IV_Swinger.plt.plot([0.0, 1.0], [1.0, 0.0])
+        ivs.print_to_rgba_buffer()
+        (width, height) = ivs.rgba_img_size
+        assert (width, height) == (1166, 768)
+        assert len(ivs.rgba_img_data) == width * height * 4
+        assert fig.canvas is canvas
+        assert fig.dpi == 100
+    finally:
+        IV_Swinger.plt.close(fig)
@@ -0,0 +1,141 @@
+"""Tests for the IV_Swinger2 module"""
+import base64
+import os
+import shutil
+import time
+import IV_Swinger2
+
+
+def encode_binary_adc_pairs(adc_pairs, block_format=1):
+    """Return the base64-encoded block that the Arduino sketch sends for
+       the specified ADC pairs in binary transfer mode, with the CRC
+       calculated the same (bitwise) way as in the sketch
+    """
+    block = bytearray([len(adc_pairs) & 0xff, len(adc_pairs) >> 8,
+                       block_format])
+    for ch0, ch1 in adc_pairs:
+        block += bytes([ch0 & 0xff, ((ch0 >> 8) & 0x0f) | ((ch1 & 0x0f) << 4),
+                        (ch1 >> 4) & 0xff])
+    crc = 0xffff
+    for byte in block:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+            crc &= 0xffff
+    block += bytes([crc & 0xff, crc >> 8, 0])
+    return base64.b64encode(bytes(block)).decode()
+
+
+def test_unpack_binary_adc_pairs():
+    """A block encoded like the Arduino sketch does it is decoded to the
+       original ADC pairs, and malformed or corrupted blocks are
+       rejected
+    """
+    adc_pairs = [(0, 4095), (1, 4000), (2048, 2047), (4095, 0), (291, 1110)]
+    binary_str = encode_binary_adc_pairs(adc_pairs)
+    adc_curve = IV_Swinger2.unpack_binary_adc_pairs(f"{binary_str}\r\n")
+    assert adc_curve.to_list() == adc_pairs
+
+    # Corrupted pair data (CRC mismatch)
+    block = bytearray(base64.b64decode(binary_str))
+    block[5] ^= 0x10
+    assert IV_Swinger2.unpack_binary_adc_pairs(
+        base64.b64encode(bytes(block)).decode()) is None
+
+    # Unknown block format, truncated block and invalid base64
+    assert IV_Swinger2.unpack_binary_adc_pairs(
+        encode_binary_adc_pairs(adc_pairs, block_format=2)) is None
+    assert IV_Swinger2.unpack_binary_adc_pairs(binary_str[:-4]) is None
+    assert IV_Swinger2.unpack_binary_adc_pairs(binary_str[:-1] + "!") is None
+
+
+def write_title_cfg(run_dir, title, mtime_ns):
+    """Write a .cfg file with the specified title to a run directory and
+       set its modification time
+    """
+    cfg_file = os.path.join(run_dir, f"{IV_Swinger2.APP_NAME}.cfg")
+    with open(cfg_file, "w", encoding="utf-8") as f:
+        f.write(f"[Plotting]\ntitle = {title}\n")
+    os.utime(cfg_file, ns=(mtime_ns, mtime_ns))
+
+
+def test_results_index(tmp_path, monkeypatch):
+    """The results index reuses the entries of unchanged run directories
+       (also in a new session), rebuilds the entry of a run directory
+       whose files have changed, and drops removed run directories
+    """
+    results_dir = tmp_path / "results"
+    run_dirs = {}
+    for dts in ("210101_10_00_00", "210102_10_00_00"):
+        run_dirs[dts] = str(results_dir / dts)
+        os.makedirs(run_dirs[dts])
+        # The .cfg file modification times are later than the directory
+        # modification times
+        cfg_mtime_ns = time.time_ns() + 10**10
+        write_title_cfg(run_dirs[dts], f"Run {dts}", cfg_mtime_ns)
+    os.makedirs(results_dir / "210103_10_00_00")  # Empty: not listed
+    index_filename = str(tmp_path / "results_index.db")
+
+    built_dts = []
+    build_entry = IV_Swinger2.ResultsIndex.build_entry
+
+    def counting_build_entry(self, run_dir, dts):
+        built_dts.append(dts)
+        return build_entry(self, run_dir, dts)
+
+    monkeypatch.setattr(IV_Swinger2.ResultsIndex, "build_entry",
+                        counting_build_entry)
+
+    results_index = IV_Swinger2.ResultsIndex(index_filename)
+    runs = results_index.get_runs(str(results_dir))
+    assert [(run.dts, run.title, run.has_cfg) for run in runs] == [
+        ("210102_10_00_00", "Run 210102_10_00_00", True),
+        ("210101_10_00_00", "Run 210101_10_00_00", True)]
+    assert sorted(built_dts) == ["210101_10_00_00", "210102_10_00_00"]
+    results_index.close()
+
+    # A new session uses the saved entries
+    built_dts.clear()
+    results_index = IV_Swinger2.ResultsIndex(index_filename)
+    assert results_index.get_runs(str(results_dir)) == runs
+    assert not built_dts
+
+    # Rewriting the .cfg file changes its mtime (but not the directory's)
+    write_title_cfg(run_dirs["210101_10_00_00"], "New title",
+                    cfg_mtime_ns + 10**9)
+    runs = results_index.get_runs(str(results_dir))
+    assert built_dts == ["210101_10_00_00"]
+    assert runs[1].title == "New title"
+
+    # A removed run directory is dropped from the index
+    shutil.rmtree(run_dirs["210102_10_00_00"])
+    runs = results_index.get_runs(str(results_dir))
+    assert [run.dts for run in runs] == ["210101_10_00_00"]
+    num_rows = results_index.conn.execute(
+        "SELECT COUNT(*) FROM runs WHERE dts = ?",
+        ("210102_10_00_00",)).fetchone()[0]
+    assert num_rows == 0
+    results_index.close()
+
+
+def test_data_point_log_level_config(tmp_path):
+    """The data point log level is saved in the config and applied from
+       it, and an invalid value in the config is replaced by the
+       current level
+    """
+    ivs2 = IV_Swinger2.IV_Swinger2(str(tmp_path))
+    config = IV_Swinger2.Configuration(ivs2=ivs2)
+    ivs2.data_point_log_level = IV_Swinger2.DATA_POINT_LOG_NONE
+    config.populate()
+    assert config.cfg.getint("General", "data point log level") == (
+        IV_Swinger2.DATA_POINT_LOG_NONE)
+
+    ivs2.data_point_log_level = IV_Swinger2.DATA_POINT_LOG_ALL
+    config.apply_general()
+    assert ivs2.data_point_log_level == IV_Swinger2.DATA_POINT_LOG_NONE
+
+    config.cfg.set("General", "data point log level", "7")
+    config.apply_general()
+    assert ivs2.data_point_log_level == IV_Swinger2.DATA_POINT_LOG_NONE
+    assert config.cfg.get("General", "data point log level") == (
+        str(IV_Swinger2.DATA_POINT_LOG_NONE))
@@ -0,0 +1,63 @@
+"""Tests for the IV_Swinger2_multi module"""
+import csv
+import os
+import IV_Swinger2
+import IV_Swinger2_multi
+
+
+def test_relative_app_data_dir(tmp_path, monkeypatch):
+    """A relative app data directory is made absolute, so the batch and
+       run directories don't depend on the current directory
+    """
+    monkeypatch.chdir(tmp_path)
+    app_data_dir = str(tmp_path / "app_data")
+    usb_port = "/dev/ttyUSB0"
+    orchestrator = IV_Swinger2_multi.MultiRigOrchestrator(
+        app_data_dir="app_data", usb_ports=[usb_port], sync_start=False)
+    assert orchestrator.app_data_dir == app_data_dir
+
+    # Swing a rig whose swing_curve() only sets the run directory (the
+    # hdd_output_dir setter requires an absolute path)
+    rig = IV_Swinger2_multi.Rig(usb_port, orchestrator.app_data_dir,
+                                orchestrator.logger,
+                                orchestrator.usb_ports)
+    subdirs = []
+
+    def swing_curve(subdir=None, process_adc=True):
+        # pylint: disable=unused-argument
+        subdirs.append(subdir)
+        rig.ivs2.hdd_output_dir = os.path.join(subdir, "run")
+        return IV_Swinger2.RC_FAILURE
+
+    monkeypatch.setattr(rig.ivs2, "swing_curve", swing_curve)
+    orchestrator.rigs = [rig]
+    orchestrator.swing_batch()
+    assert rig.rc == IV_Swinger2.RC_FAILURE
+    assert orchestrator.batch_dir.startswith(app_data_dir)
+    assert subdirs == [os.path.join(orchestrator.batch_dir, rig.name)]
+
+    # A change of the current directory has no effect
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+    orchestrator.swing_rig(rig, None)
+    assert subdirs[-1] == subdirs[0]
+
+
+def test_batch_summary_quoting(tmp_path):
+    """A run directory with a comma in its name is quoted in the batch
+       summary CSV file
+    """
+    orchestrator = IV_Swinger2_multi.MultiRigOrchestrator(
+        app_data_dir=str(tmp_path), usb_ports=[], sync_start=False)
+    rig = IV_Swinger2_multi.Rig("/dev/ttyUSB0", orchestrator.app_data_dir,
+                                orchestrator.logger, orchestrator.usb_ports)
+    rig.rc = IV_Swinger2.RC_FAILURE
+    rig.run_dir = str(tmp_path / "rig,1" / "run")
+    orchestrator.rigs = [rig]
+    orchestrator.batch_dir = str(tmp_path)
+    orchestrator.write_batch_summary()
+    summary_filename = tmp_path / IV_Swinger2_multi.BATCH_SUMMARY_FILENAME
+    with open(summary_filename, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == IV_Swinger2_multi.BATCH_SUMMARY_FIELDS
+    assert rows[1] == rig.summary_values
+    assert rows[1][3] == rig.run_dir
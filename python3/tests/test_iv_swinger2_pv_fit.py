@@ -0,0 +1,100 @@
+"""Tests for the IV_Swinger2_PV_fit module"""
+import math
+import os
+import IV_Swinger2
+import IV_Swinger2_PV_fit
+import IV_Swinger_PV_model
+
+EXAMPLE_PV_SPEC = ["SunPower X21-345", 68.2, 6.39, 57.3, 6.02, 96,
+                   -167.4, "mV", 2.9, "mA", -0.29, "%", 41.5]
+
+
+def write_data_point_csv_file(run_dir, date_time_str, points):
+    """Write a data point CSV file with the specified (V, I) points to a
+       run directory and return its name
+    """
+    os.makedirs(run_dir, exist_ok=True)
+    csv_file = os.path.join(run_dir, f"iv_swinger2_{date_time_str}.csv")
+    with open(csv_file, "w", encoding="utf-8") as f:
+        f.write("Volts, Amps, Watts, Ohms\n")
+        for volts, amps in points:
+            ohms = volts / amps if amps else IV_Swinger2.INFINITE_VAL
+            f.write(f"{volts:.6f},{amps:.6f},{volts * amps:.6f},{ohms:.6f}\n")
+    return csv_file
+
+
+def test_fit_parms_to_points_recovers_parms():
+    """Fitting the points of a modeled curve, starting from perturbed
+       parameters, recovers the model's parameters
+    """
+    pv = IV_Swinger_PV_model.get_example_pv()
+    pv.run()
+    parms = [pv.il, pv.i0, pv.a, pv.rs, pv.rsh]
+    points = list(pv.gen_vi_points(100))
+    volts = [point[0] for point in points]
+    amps = [point[1] for point in points]
+    start_parms = [parms[0] * 1.02, parms[1] * 3.0, parms[2] * 1.05,
+                   parms[3] * 1.3, parms[4] * 0.7]
+    fit_parms, rms_err, fit_ok = IV_Swinger_PV_model.fit_parms_to_points(
+        volts, amps, start_parms)
+    assert fit_ok
+    assert rms_err < 1e-6
+    for fit_parm, parm in zip(fit_parms, parms):
+        assert math.isclose(fit_parm, parm, rel_tol=1e-4)
+
+
+def test_get_data_point_csv_files(tmp_path):
+    """The data point CSV files are found in all subfolders except the
+       battery calibration and overlay folders, and other CSV files are
+       ignored
+    """
+    points = [(0.0, 1.0), (1.0, 0.0)]
+    run_csv_files = [
+        write_data_point_csv_file(str(tmp_path / dts), dts, points)
+        for dts in ("210101_10_00_00", "210102_10_00_00")]
+    for folder in (IV_Swinger2.BATTERY_FOLDER_NAME, "overlays"):
+        write_data_point_csv_file(
+            str(tmp_path / folder / "210103_10_00_00"), "210103_10_00_00",
+            points)
+    with open(tmp_path / "210101_10_00_00" / "adc_pairs_210101_10_00_00.csv",
+              "w", encoding="utf-8") as f:
+        f.write("CH0, CH1\n")
+
+    assert IV_Swinger2_PV_fit.get_data_point_csv_files(
+        str(tmp_path)) == run_csv_files
+
+
+def test_batch_fitter(tmp_path):
+    """The batch fitter fits a modeled curve in a worker process and
+       reports the curves that cannot be fitted, in the order of the
+       CSV files
+    """
+    pv = IV_Swinger_PV_model.get_example_pv()
+    pv.run()
+    pv_spec_csv_file = str(tmp_path / "pv_spec.csv")
+    IV_Swinger_PV_model.add_pv_spec(pv_spec_csv_file, EXAMPLE_PV_SPEC)
+    data_dir = tmp_path / "data"
+    csv_files = [
+        write_data_point_csv_file(str(data_dir / "210101_10_00_00"),
+                                  "210101_10_00_00",
+                                  pv.gen_vi_points(100)),
+        write_data_point_csv_file(str(data_dir / "210102_10_00_00"),
+                                  "210102_10_00_00", [(0.0, 1.0)])]
+
+    fitter = IV_Swinger2_PV_fit.BatchFitter(
+        str(tmp_path / "app_data"), pv_spec_csv_file,
+        pv_name=EXAMPLE_PV_SPEC[0], num_jobs=2)
+    summaries = fitter.run(csv_files)
+    assert [summary[:3] for summary in summaries] == [
+        ["210101_10_00_00", EXAMPLE_PV_SPEC[0], IV_Swinger2_PV_fit.FIT_OK],
+        ["210102_10_00_00", EXAMPLE_PV_SPEC[0],
+         IV_Swinger2_PV_fit.FIT_NO_DATA]]
+    assert math.isclose(summaries[0][3], pv.il, rel_tol=1e-3)
+
+    # A PV that is not in the PV spec file is a FAILURE
+    fitter = IV_Swinger2_PV_fit.BatchFitter(
+        str(tmp_path / "app_data"), pv_spec_csv_file, pv_name="Unknown PV",
+        num_jobs=1)
+    summaries = fitter.run(csv_files[:1])
+    assert summaries == [["210101_10_00_00", "Unknown PV",
+                          IV_Swinger2_PV_fit.FIT_FAILURE]]
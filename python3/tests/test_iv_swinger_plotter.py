@@ -0,0 +1,81 @@
+"""Tests for the IV_Swinger_plotter module"""
+import argparse
+import pytest
+import IV_Swinger_plotter
+
+
+class RecordingLogger():
+    """Logger that records the messages that are logged"""
+    def __init__(self):
+        self.msgs = []
+
+    def log(self, msg_str):
+        """Record a logged message"""
+        self.msgs.append(msg_str)
+
+    def print_and_log(self, msg_str):
+        """Record a printed and logged message"""
+        self.msgs.append(msg_str)
+
+
+def write_csv_file(csv_filename, first_line="Volts, Amps, Watts, Ohms"):
+    """Write a data point CSV file for a simple curve"""
+    with open(csv_filename, "w", encoding="utf-8") as f:
+        f.write(f"{first_line}\n")
+        for volts, amps in ((0.0, 4.0), (1.0, 3.9), (2.0, 3.5), (3.0, 2.0),
+                            (4.0, 0.0)):
+            ohms = volts / amps if amps else 1e12
+            f.write(f"{volts},{amps},{volts * amps},{ohms}\n")
+
+
+def make_args(tmp_path, jobs):
+    """Return the command line args used by the CSV file processor"""
+    return argparse.Namespace(recalc_isc=False, analytic_mpp=False,
+                              use_gnuplot=False, output_dir=str(tmp_path),
+                              jobs=jobs)
+
+
+def test_parallel_csv_file_processing(tmp_path):
+    """With multiple jobs, the results are the same and in the same order
+       as with one job, and each file's "Processing" message is logged
+       before the results are added
+    """
+    csv_files = [str(tmp_path / f"curve{ii}.csv") for ii in range(3)]
+    for csv_filename in csv_files:
+        write_csv_file(csv_filename)
+    logger = RecordingLogger()
+    csv_proc = IV_Swinger_plotter.CsvFileProcessor(
+        make_args(tmp_path, 1), csv_files,
+        IV_Swinger_plotter.IV_Swinger_extended())
+    parallel_csv_proc = IV_Swinger_plotter.CsvFileProcessor(
+        make_args(tmp_path, 2), csv_files,
+        IV_Swinger_plotter.IV_Swinger_extended(), logger)
+    assert logger.msgs == [f"Processing: {csv_filename}"
+                           for csv_filename in csv_files]
+    assert (parallel_csv_proc.plt_data_point_files ==
+            csv_proc.plt_data_point_files)
+    assert parallel_csv_proc.plt_mpp_volts == csv_proc.plt_mpp_volts
+    assert parallel_csv_proc.plt_mpp_amps == csv_proc.plt_mpp_amps
+
+
+def test_worker_messages(tmp_path, capsys):
+    """A worker returns its messages with the results, and prints them if
+       the processing fails
+    """
+    csv_filename = str(tmp_path / "curve.csv")
+    write_csv_file(csv_filename)
+    args = make_args(tmp_path, 2)
+    (_, msgs) = IV_Swinger_plotter.get_csv_file_results_in_worker(
+        args, IV_Swinger_plotter.IV_Swinger_extended, True, csv_filename)
+    assert not msgs
+
+    write_csv_file(csv_filename, first_line="Amps, Volts")
+    with pytest.raises(IndexError):
+        IV_Swinger_plotter.get_csv_file_results_in_worker(
+            args, IV_Swinger_plotter.IV_Swinger_extended, True, csv_filename)
+    assert "ERROR: first line of CSV" in capsys.readouterr().out
+
+    logger = RecordingLogger()
+    IV_Swinger_plotter.WorkerLogger.replay_msgs(
+        logger, [(False, "Logged"), (True, "Printed and logged")])
+    assert logger.msgs == ["Logged", "Printed and logged"]
@@ -0,0 +1,171 @@
+"""Tests for the IV_Swinger_PV_model module"""
+import concurrent.futures
+import json
+import math
+import threading
+import scipy.optimize
+import IV_Swinger_PV_model
+
+
+def test_executor_gives_same_results():
+    """The parameter search with an executor finds exactly the same
+       parameters as the serial search
+    """
+    serial_pv = IV_Swinger_PV_model.get_example_pv()
+    serial_pv.run()
+    serial_pv.estimate_irrad_and_temp(64.9, 5.16, 0.1)
+
+    parallel_pv = IV_Swinger_PV_model.get_example_pv()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        parallel_pv.executor = executor
+        parallel_pv.run()
+        parallel_pv.estimate_irrad_and_temp(64.9, 5.16, 0.1)
+
+    assert parallel_pv.parms_string == serial_pv.parms_string
+    assert parallel_pv.irradiance == serial_pv.irradiance
+    assert parallel_pv.cell_temp_c == serial_pv.cell_temp_c
+
+
+def test_batched_newton_solver():
+    """The batched Newton solver finds the same currents as the SciPy
+       root solver for the points of a modeled curve
+    """
+    pv = IV_Swinger_PV_model.get_example_pv()
+    pv.run()
+    parms = [pv.il, pv.i0, pv.a, pv.rs, pv.rsh]
+    volts = [pv.voc * ii / 50.0 for ii in range(50)]
+    amps, converged = IV_Swinger_PV_model.solve_i_given_v_and_parms(
+        volts, parms, pv.il)
+    assert converged.all()
+    for volts_val, amps_val in zip(volts, amps.tolist()):
+        sol = scipy.optimize.root(IV_Swinger_PV_model.test_i_given_v_and_parms,
+                                  [pv.il], args=(volts_val, parms))
+        assert math.isclose(amps_val, sol.x[0], rel_tol=1e-6, abs_tol=1e-9)
+
+    # Points that don't converge are reported as such
+    _, converged = IV_Swinger_PV_model.solve_i_given_v_and_parms(
+        volts, parms, pv.il, max_iterations=1)
+    assert not converged.all()
+
+
+def test_estimate_irrad_and_temp(monkeypatch):
+    """The irradiance and temperature estimated from a modeled curve's
+       Voc and Isc are close to the modeled conditions, with or without
+       the secant update, and a warm start needs fewer iterations
+    """
+    pv = IV_Swinger_PV_model.get_example_pv()
+    pv.irradiance = 700.0
+    pv.cell_temp_c = 30.0
+    pv.run()
+    (voc, isc) = (pv.voc, pv.isc)
+
+    estimates = {}
+    for secant_max_step_ratio in (0.0, 4.0):
+        monkeypatch.setattr(IV_Swinger_PV_model, "SECANT_MAX_STEP_RATIO",
+                            secant_max_step_ratio)
+        est_pv = IV_Swinger_PV_model.get_example_pv()
+        est_pv.estimate_irrad_and_temp(voc, isc, 0.01)
+        assert math.isclose(est_pv.irradiance, 700.0, abs_tol=1.0)
+        assert math.isclose(est_pv.cell_temp_c, 30.0, abs_tol=0.5)
+        estimates[secant_max_step_ratio] = (est_pv.cell_temp_c,
+                                            est_pv.est_iterations)
+    assert math.isclose(estimates[0.0][0], estimates[4.0][0], abs_tol=0.05)
+
+    est_pv = IV_Swinger_PV_model.get_example_pv()
+    est_pv.estimate_irrad_and_temp(voc, isc, 0.01, initial_temp_c=30.0)
+    assert math.isclose(est_pv.cell_temp_c, 30.0, abs_tol=0.5)
+    assert est_pv.est_iterations < estimates[4.0][1]
+
+
+def test_parms_cache(tmp_path):
+    """The parameter cache quantizes the temperature, discards the least
+       recently used entry when it is full, and persists its entries
+    """
+    cache = IV_Swinger_PV_model.ParmsCache(max_entries=2,
+                                           temp_resolution=0.5)
+    cache.put("spec", 25.1, [1, 2, 3, 4, 5], [0.0] * 5)
+    assert cache.get("spec", 24.9) == [[1.0, 2.0, 3.0, 4.0, 5.0], [0.0] * 5]
+    assert cache.get("spec", 25.3) is None
+    assert cache.get("other spec", 25.1) is None
+
+    # Using the 25.1 degree entry makes the 30 degree entry the least
+    # recently used one
+    cache.put("spec", 30.0, [6, 7, 8, 9, 10], [0.0] * 5)
+    assert cache.get("spec", 25.1) is not None
+    cache.put("spec", 40.0, [11, 12, 13, 14, 15], [0.0] * 5)
+    assert cache.get("spec", 30.0) is None
+    assert cache.get("spec", 25.1) is not None
+    assert cache.get_nearest("spec", 36.0) == (40.0,
+                                               [11.0, 12.0, 13.0, 14.0, 15.0])
+    assert cache.get_nearest("other spec", 36.0) is None
+
+    # The entries are saved to the file and loaded by a new cache
+    cache.filename = str(tmp_path / "parms_cache.json")
+    cache.put("spec", 50.0, [16, 17, 18, 19, 20], [0.0] * 5)
+    cache.save()
+    loaded_cache = IV_Swinger_PV_model.ParmsCache(max_entries=2,
+                                                  temp_resolution=0.5)
+    loaded_cache.filename = cache.filename
+    assert loaded_cache.entries == cache.entries
+
+
+def test_parms_cache_concurrent_saves(tmp_path):
+    """A reader never sees a partially written cache file while several
+       threads add entries and save the cache
+    """
+    cache = IV_Swinger_PV_model.ParmsCache()
+    cache.filename = str(tmp_path / "parms_cache.json")
+    cache.put("spec", 0.0, [1, 2, 3, 4, 5], [0.0] * 5)
+    cache.save()
+    done = threading.Event()
+    read_errors = []
+
+    def writer(thread_num):
+        for ii in range(100):
+            cache.put(f"spec {thread_num}", float(ii), [1, 2, 3, 4, 5],
+                      [0.0] * 5)
+            cache.save()
+
+    def reader():
+        while not done.is_set():
+            try:
+                with open(cache.filename, encoding="utf-8") as f:
+                    json.load(f)
+            except ValueError as e:
+                read_errors.append(e)
+
+    reader_thread = threading.Thread(target=reader)
+    reader_thread.start()
+    writer_threads = [threading.Thread(target=writer, args=(thread_num,))
+                      for thread_num in range(3)]
+    for thread in writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    done.set()
+    reader_thread.join()
+    assert not read_errors
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_parms_cache_saved_once_per_estimate(tmp_path, monkeypatch):
+    """The cache file is written once per irradiance and temperature
+       estimate, not once per iteration
+    """
+    num_writes = []
+    save = IV_Swinger_PV_model.ParmsCache.save
+
+    def counting_save(self):
+        modified = self.modified
+        save(self)
+        if modified:
+            num_writes.append(1)
+
+    monkeypatch.setattr(IV_Swinger_PV_model.ParmsCache, "save", counting_save)
+    pv = IV_Swinger_PV_model.get_example_pv()
+    pv.parms_cache = IV_Swinger_PV_model.ParmsCache()
+    pv.parms_cache.filename = str(tmp_path / "parms_cache.json")
+    pv.estimate_irrad_and_temp(64.9, 5.16, 0.1)
+    assert pv.est_iterations > 1
+    assert len(num_writes) == 1
+    assert len(pv.parms_cache.entries) == pv.est_iterations